@@ -1,80 +1,27 @@
-import math
+import argparse
+import os
+
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from matplotlib.animation import FuncAnimation
 
-# Fiziksel sabitler
-G = 6.67430e-11  # m^3 kg^-1 s^-2
-M = 5.972e24  # Dünya kütlesi (kg)
-R_EARTH = 6.371e6  # Dünya yarıçapı (m)
+import physics
+from physics.constants import G, M, R_EARTH
 
 # Simülasyon parametreleri
 dt = 0.5  # zaman adımı (s) - stabilite için artırıldı
 FPS = 60
-interval_ms = int(1/FPS)
+interval_ms = int(1000 / FPS)
 
 # Cisim parametreleri
-mass = 100000.0  # kg
 position = np.array([0.0, 1e7, 0.0])  # metre
 velocity = np.array([5000.0, 2000.0, 200.0])  # m/s
 
+# Veri deposu
+max_steps = 10000
+trail_len = 1000
+max_range = 1.5e8
 
-def calculate_gravity_force(pos, m=mass):
-    """Yerçekimi kuvvetini hesapla"""
-    r = np.linalg.norm(pos)
-    if r == 0:
-        return np.zeros(3)
-    force_magnitude = G * M * m / (r ** 2)
-    force = -force_magnitude * (pos / r)
-    return force
-
-
-def rk4_step(pos, vel, dt):
-    """4. dereceden Runge-Kutta integrasyonu (daha stabil)"""
-
-    def acceleration(p):
-        force = calculate_gravity_force(p)
-        return force / mass
-
-    # k1
-    k1_v = acceleration(pos)
-    k1_p = vel
-
-    # k2
-    k2_v = acceleration(pos + 0.5 * dt * k1_p)
-    k2_p = vel + 0.5 * dt * k1_v
-
-    # k3
-    k3_v = acceleration(pos + 0.5 * dt * k2_p)
-    k3_p = vel + 0.5 * dt * k2_v
-
-    # k4
-    k4_v = acceleration(pos + dt * k3_p)
-    k4_p = vel + dt * k3_v
-
-    # Yeni değerler
-    vel_new = vel + (dt / 6.0) * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
-    pos_new = pos + (dt / 6.0) * (k1_p + 2 * k2_p + 2 * k3_p + k4_p)
-
-    return pos_new, vel_new
-
-
-def euler_step(pos, vel, dt):
-    """Basit Euler integrasyonu (hızlı ama daha az stabil)"""
-    force = calculate_gravity_force(pos)
-    acc = force / mass
-    vel_new = vel + acc * dt
-    pos_new = pos + vel_new * dt
-    return pos_new, vel_new
-
-
-def calculate_energy(pos, vel):
-    """Toplam mekanik enerji (kinetik + potansiyel)"""
-    r = np.linalg.norm(pos)
-    kinetic = 0.5 * mass * np.linalg.norm(vel) ** 2
-    potential = -G * M * mass / r
-    return kinetic + potential
+# Başsız (headless) çıktı biçimleri: uzantıya göre seçilir
+OUTPUT_FORMATS = (".gif", ".mp4", ".npy")
 
 
 def create_sphere(radius, resolution=32):
@@ -87,112 +34,209 @@ def create_sphere(radius, resolution=32):
     return x, y, z
 
 
-# Veri deposu
-max_steps = 10000
-trail = np.zeros((max_steps, 3))
-trail_len = 1000
-
-# Matplotlib ayarları
-fig = plt.figure(figsize=(32, 32))
-ax = fig.add_subplot(111, projection='3d')
-ax.set_xlabel('X (m)', fontsize=10)
-ax.set_ylabel('Y (m)', fontsize=10)
-ax.set_zlabel('Z (m)', fontsize=10)
-ax.set_title('Yerçekimi Simülasyonu (RK4 Yöntemi)', fontsize=12)
-
-# Dünya'yı çiz
-earth_x, earth_y, earth_z = create_sphere(R_EARTH)
-ax.plot_surface(earth_x, earth_y, earth_z, color='blue', alpha=0.6, shade=True)
-
-# Başlangıç sınırları
-max_range = 1.5e8
-ax.set_xlim(-max_range, max_range)
-ax.set_ylim(-max_range, max_range)
-ax.set_zlim(-max_range, max_range)
-
-# Çizgiler ve nokta
-line, = ax.plot([], [], [], color='red', lw=1.5, label='Yörünge')
-point, = ax.plot([], [], [], marker='o', color='yellow', markersize=8)
-
-# Enerji ve hız bilgisi için text
-info_text = ax.text2D(0.02, 0.95, '', transform=ax.transAxes, fontsize=9,
-                      verticalalignment='top', family='monospace')
-
-ax.legend(loc='upper right')
-
-# Global state
-state_pos = position.copy()
-state_vel = velocity.copy()
-step_count = 0
-initial_energy = calculate_energy(state_pos, state_vel)
-crashed = False
-
-
-def init():
-    line.set_data([], [])
-    line.set_3d_properties([])
-    point.set_data([], [])
-    point.set_3d_properties([])
-    info_text.set_text('')
-    return line, point, info_text
-
-
-def update(frame):
-    global state_pos, state_vel, trail, step_count, crashed
-
-    if crashed:
-        return line, point, info_text
-
-    # Çarpışma kontrolü
-    r = np.linalg.norm(state_pos)
-    if r < R_EARTH:
-        crashed = True
-        info_text.set_text(f'ÇARPIŞMA! Adım: {step_count}\nYükseklik: {(r - R_EARTH) / 1000:.1f} km')
-        return line, point, info_text
-
-    # RK4 adımı at (daha stabil, Euler için euler_step kullanın)
-    state_pos, state_vel = rk4_step(state_pos, state_vel, dt)
-
-    # Trail güncelle
-    trail = np.roll(trail, -1, axis=0)
-    trail[-1] = state_pos
-    step_count += 1
-
-    # Çizilecek trail
-    start = max(0, max_steps - min(step_count, trail_len))
-    seg = trail[start:max_steps]
-
-    if seg.size == 0:
-        xs, ys, zs = [], [], []
+def precompute(position0=position, velocity0=velocity, dt=dt, max_steps=max_steps, method="rk4",
+               steps_per_frame=1):
+    """
+    Yörüngeyi çizimden önce bir kez entegre eder; kare sayısı fiziği etkilemez.
+    Dönüş: pozisyonlar, kare başına adım indeksleri, bilgi metni dizileri ve durum sözlüğü.
+    """
+    x, y, z, vel, _, info = physics.simulate(position0, velocity0, dt=dt, max_steps=max_steps, method=method)
+    pos = np.column_stack([x, y, z])
+    r = np.linalg.norm(pos, axis=1)
+    energy = 0.5 * np.einsum("ij,ij->i", vel, vel) - G * M / r
+    frames = np.arange(0, len(pos), max(1, steps_per_frame))
+    if frames[-1] != len(pos) - 1:
+        frames = np.append(frames, len(pos) - 1)
+    return {
+        "pos": pos,
+        "frames": frames,
+        "altitude_km": (r - R_EARTH) / 1000,
+        "speed_km_s": np.linalg.norm(vel, axis=1) / 1000,
+        "energy_change_pct": np.abs((energy - energy[0]) / energy[0]) * 100,
+        "info": info,
+        "method": method.upper(),
+    }
+
+
+def build_figure(data, figsize=(8, 8), dpi=100, trail=trail_len, plot_range=max_range):
+    """Figürü kurar; (fig, güncelleme fonksiyonu, sanatçılar) döndürür. Kare i, data['frames'][i] adımıdır."""
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot(111, projection='3d')
+    ax.set_xlabel('X (m)', fontsize=10)
+    ax.set_ylabel('Y (m)', fontsize=10)
+    ax.set_zlabel('Z (m)', fontsize=10)
+    ax.set_title(f'Yerçekimi Simülasyonu ({data["method"]} Yöntemi)', fontsize=12)
+
+    # Dünya'yı çiz
+    earth_x, earth_y, earth_z = create_sphere(R_EARTH)
+    ax.plot_surface(earth_x, earth_y, earth_z, color='blue', alpha=0.6, shade=True)
+
+    ax.set_xlim(-plot_range, plot_range)
+    ax.set_ylim(-plot_range, plot_range)
+    ax.set_zlim(-plot_range, plot_range)
+
+    # Çizgiler ve nokta
+    line, = ax.plot([], [], [], color='red', lw=1.5, label='Yörünge')
+    point, = ax.plot([], [], [], marker='o', color='yellow', markersize=8)
+
+    # Enerji ve hız bilgisi için text
+    info_text = ax.text2D(0.02, 0.95, '', transform=ax.transAxes, fontsize=9,
+                          verticalalignment='top', family='monospace')
+    ax.legend(loc='upper right')
+    fig.tight_layout()
+
+    pos, frames = data["pos"], data["frames"]
+    crashed = data["info"]["crashed"]
+    artists = (line, point, info_text)
+
+    def update(frame):
+        step = int(frames[frame])
+        # Trail: önceden hesaplanmış dizinin son trail adımlık görünümü (kopya ya da np.roll yok)
+        seg = pos[max(0, step + 1 - trail):step + 1]
+        line.set_data(seg[:, 0], seg[:, 1])
+        line.set_3d_properties(seg[:, 2])
+        point.set_data(pos[step, :1], pos[step, 1:2])
+        point.set_3d_properties(pos[step, 2:])
+
+        altitude = data["altitude_km"][step]
+        if crashed and step == len(pos) - 1:
+            info_text.set_text(f'ÇARPIŞMA! Adım: {step}\nYükseklik: {altitude:.1f} km')
+        else:
+            info_text.set_text(f'Adım: {step}\n'
+                               f'Yükseklik: {altitude:.1f} km\n'
+                               f'Hız: {data["speed_km_s"][step]:.3f} km/s\n'
+                               f'Enerji Değişimi: {data["energy_change_pct"][step]:.2e}%')
+        return artists
+
+    return fig, update, artists
+
+
+def _frames_rgb(fig, update, artists, n_frames):
+    """
+    Kareleri blit ile üretir: eksenler ve Dünya yüzeyi bir kez çizilir, her karede
+    yalnızca yörünge, nokta ve metin arka planın üzerine yeniden çizilir.
+    Dönen (yükseklik, genişlik, 3) uint8 dizi bir sonraki karede üzerine yazılır.
+    """
+    for artist in artists:
+        artist.set_animated(True)
+    fig.canvas.draw()
+    background = fig.canvas.copy_from_bbox(fig.bbox)
+    for i in range(n_frames):
+        update(i)
+        fig.canvas.restore_region(background)
+        for artist in artists:
+            artist.axes.draw_artist(artist)
+        yield np.asarray(fig.canvas.buffer_rgba())[..., :3]
+
+
+def _ffmpeg(out, width, height, fps):
+    import shutil
+    import subprocess
+    from matplotlib import rcParams
+
+    ffmpeg = shutil.which(rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError("MP4 output needs ffmpeg on PATH; use a .gif or .npy output instead")
+    return subprocess.Popen(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+         "-r", str(fps), "-i", "-", "-vcodec", "libx264", "-pix_fmt", "yuv420p", out],
+        stdin=subprocess.PIPE,
+    )
+
+
+def _write_gif(out, frames, fps):
+    """
+    Kareleri geldikçe GIF'e yazar; bellekte yalnızca o anki kare tutulur. Image.save(append_images=...)
+    üreteç verilse de bütün kareleri listede biriktirir, bu yüzden Pillow'un kare kare GIF yazıcısı kullanılır.
+    Her kare kendi paletini (yerel renk tablosu) taşır.
+    """
+    from PIL import GifImagePlugin, Image
+
+    duration = round(1000 / fps)
+    with open(out, "wb") as fp:
+        for i, frame in enumerate(frames):
+            # FASTOCTREE varsayılan median-cut'tan ~5 kat hızlı; sahnede az renk olduğundan fark görünmez
+            image = Image.fromarray(frame).quantize(method=Image.Quantize.FASTOCTREE)
+            if i == 0:
+                header, _ = GifImagePlugin.getheader(image, info={"loop": 0})
+                fp.writelines(header)
+            fp.writelines(GifImagePlugin.getdata(image, duration=duration, include_color_table=i > 0))
+        fp.write(b";")
+
+
+def render(data, out, fps=FPS, **figure_kwargs):
+    """
+    Animasyonu ekransız (Agg) olarak dosyaya yazar: .gif (Pillow), .mp4 (ffmpeg) ya da
+    .npy (kareler, (n, yükseklik, genişlik, 3) uint8). Kareler FuncAnimation olmadan sırayla çizilir.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ext = os.path.splitext(out)[1].lower()
+    if ext not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output '{out}', expected one of {OUTPUT_FORMATS}")
+    fig, update, artists = build_figure(data, **figure_kwargs)
+    n_frames = len(data["frames"])
+    width, height = fig.canvas.get_width_height()
+    try:
+        frames = _frames_rgb(fig, update, artists, n_frames)
+        if ext == ".npy":
+            array = np.lib.format.open_memmap(out, mode="w+", dtype=np.uint8, shape=(n_frames, height, width, 3))
+            for i, frame in enumerate(frames):
+                array[i] = frame
+            array.flush()
+        elif ext == ".mp4":
+            proc = _ffmpeg(out, width, height, fps)
+            with proc.stdin:
+                for frame in frames:
+                    proc.stdin.write(frame.tobytes())
+            if proc.wait():
+                raise RuntimeError(f"ffmpeg exited with status {proc.returncode}")
+        else:
+            _write_gif(out, frames, fps)
+        return n_frames
+    finally:
+        plt.close(fig)
+
+
+def show(data, **figure_kwargs):
+    """Etkileşimli pencere; her kare yalnızca önceden hesaplanmış satırları okur."""
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    fig, update, artists = build_figure(data, **figure_kwargs)
+    anim = FuncAnimation(fig, update, frames=len(data["frames"]), interval=interval_ms, blit=True, repeat=False)
+    plt.show()
+    return anim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the gravity simulation interactively or to a file")
+    parser.add_argument("--out", help=f"headless output file ({', '.join(OUTPUT_FORMATS)}); omit for a window")
+    parser.add_argument("--dt", type=float, default=dt)
+    parser.add_argument("--max-steps", type=int, default=max_steps)
+    parser.add_argument("--method", choices=physics.INTEGRATORS, default="rk4")
+    parser.add_argument("--steps-per-frame", type=int, default=1, help="simulation steps advanced per frame")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--size", type=float, default=8, help="figure size (inches)")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--trail", type=int, default=trail_len, help="trail length (steps)")
+    parser.add_argument("--range", type=float, default=max_range, help="axis half-range (m)")
+    args = parser.parse_args(argv)
+
+    data = precompute(dt=args.dt, max_steps=args.max_steps, method=args.method, steps_per_frame=args.steps_per_frame)
+    info = data["info"]
+    print(f"Adımlar: {info['steps']}, Çarpıştı: {info['crashed']}, Kare: {len(data['frames'])}")
+    figure_kwargs = {"figsize": (args.size, args.size), "dpi": args.dpi, "trail": args.trail, "plot_range": args.range}
+    if args.out:
+        render(data, args.out, fps=args.fps, **figure_kwargs)
+        print(f"{args.out} yazıldı")
     else:
-        xs, ys, zs = seg[:, 0], seg[:, 1], seg[:, 2]
-
-    line.set_data(xs, ys)
-    line.set_3d_properties(zs)
-    point.set_data([state_pos[0]], [state_pos[1]])
-    point.set_3d_properties([state_pos[2]])
-
-    # Bilgi metni
-    current_energy = calculate_energy(state_pos, state_vel)
-    energy_change = abs((current_energy - initial_energy) / initial_energy) * 100
-    altitude = (r - R_EARTH) / 1000  # km
-    speed = np.linalg.norm(state_vel) / 1000  # km/s
-
-    info_str = (f'Adım: {step_count}\n'
-                f'Yükseklik: {altitude:.1f} km\n'
-                f'Hız: {speed:.3f} km/s\n'
-                f'Enerji Değişimi: {energy_change:.2e}%')
-    info_text.set_text(info_str)
-
-    # Her 100 adımda konsol çıktısı
-    if step_count % 100 == 0:
-        print(f"Adım {step_count}: Yükseklik = {altitude:.1f} km, Hız = {speed:.3f} km/s")
-
-    return line, point, info_text
-
+        show(data, **figure_kwargs)
 
-anim = FuncAnimation(fig, update, init_func=init, frames=max_steps,
-                     interval=interval_ms, blit=True, repeat=False)
 
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,73 @@
+import asyncio
+import functools
+import json
 import math
 import time
+import zlib
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import requests
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
+import httpx
 import numpy as np
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from dotenv import load_dotenv
 
+import physics
+from physics.effects import (
+    blast_radius, crater_diameter, kinetic_energy, seismic_magnitude, thermal_radius,
+)
+import deflection
+import ensemble
+import executors
+import impact_batch
+import instrumentation
+import land_mask
+import response_cache as response_cache_module
+import mitigation
+import population
+import simplify
+import trajectory_codec
+import neo_feed
+import neo_store
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
-app = FastAPI(title="Asteroid Impact Simulator API")
+NASA_API_KEY = os.getenv("NASA_API_KEY", "API_KEY")
+# Yerel bir stub sunucusuyla test için geçersiz kılınabilir
+NASA_BASE_URL = os.getenv("NASA_BASE_URL", "https://api.nasa.gov/neo/rest/v1")
+# print(NASA_API_KEY)
+# print(os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Tüm NASA çağrıları için tek, bağlantı havuzlu istemci
+nasa_client = neo_feed.NasaClient(
+    NASA_BASE_URL,
+    NASA_API_KEY,
+    max_concurrency=int(os.getenv("NASA_MAX_CONCURRENCY", "4")),
+    timeout=float(os.getenv("NASA_TIMEOUT_S", "10")),
+)
+
+# CPU ağırlıklı fizik (süreç havuzu) ve engelleyici G/Ç (iş parçacığı havuzu) olay döngüsünün dışında çalışır
+executor_pool = executors.from_env()
+
+@asynccontextmanager
+async def lifespan(app):
+    await nasa_client.start()
+    executor_pool.start()
+    await asyncio.to_thread(catalogue.open)
+    try:
+        yield
+    finally:
+        executor_pool.shutdown()
+        await nasa_client.close()
+        catalogue.close()
+
+app = FastAPI(title="Asteroid Impact Simulator API", lifespan=lifespan)
 
 # CORS ayarları
 app.add_middleware(
@@ -23,11 +77,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-NASA_API_KEY = os.getenv("NASA_API_KEY", "API_KEY")
-NASA_BASE_URL = "https://api.nasa.gov/neo/rest/v1"
-# print(NASA_API_KEY)
-# print(os.path.join(os.path.dirname(__file__), '..', '.env'))
+# Aşama süreleri (Server-Timing), /metrics sayaçları ve isteğe bağlı yavaş istek profili
+app.add_middleware(instrumentation.TimingMiddleware)
 
 # Request/Response modelleri
 class ImpactRequest(BaseModel):
@@ -38,63 +89,179 @@ class ImpactRequest(BaseModel):
     impact_longitude: float = 0
     density_kg_m3: float = 3000
 
+class InitialState(BaseModel):
+    # Başlangıç durumu frontend'deki AsteroidApproach ile aynı tanımlanır
+    latitude: float = 0
+    longitude: float = 0
+    distance_km: float
+    horizontal_velocity_km_s: float = 0
+    vertical_velocity_km_s: float = 0
+    z_velocity_km_s: float = 0
+
+# Yörünge entegrasyonlarının ufku (t_max) için üst sınır
+MAX_HORIZON_HOURS = 24 * 30
+
 class MitigationRequest(BaseModel):
     diameter_km: float
     velocity_km_s: float
     years_before_impact: float
     method: str = "kinetic_impactor"
+    # "analytic" (Δr = Δv * t) veya "trajectory" (delta_v yörüngeye uygulanıp yeniden entegre edilir)
+    mode: str = "analytic"
+    initial_state: Optional[InitialState] = None
+    direction: str = "along_track"
+    # trajectory modu: verilmezse years_before_impact kullanılır; horizon_hours'tan uzunsa 400. Yol ufuktan önce
+    # bitiyorsa (çarpma) başlangıç durumuna kırpılır ve yanıtta lead_time_clamped ile bildirilir
+    lead_time_s: Optional[float] = Field(None, ge=0)
+    horizon_hours: float = Field(48, gt=0, le=MAX_HORIZON_HOURS)
+
+class ImpactBatchRequest(BaseModel):
+    # Sütun bazlı girdiler: her liste bir parametre taraması kolonu
+    diameter_km: List[float]
+    velocity_km_s: List[float]
+    impact_angle: Optional[List[float]] = None
+    impact_latitude: Optional[List[float]] = None
+    impact_longitude: Optional[List[float]] = None
+    density_kg_m3: Optional[List[float]] = None
+
+class MitigationPlanRequest(BaseModel):
+    diameter_km: float
+    velocity_km_s: float
+    lead_times_years: List[float] = [1, 2, 3, 5, 7, 10, 15, 20, 30]
+    impactor_masses_kg: List[float] = [500]
+    betas: List[float] = [2.0]
+    methods: List[str] = ["kinetic_impactor", "gravity_tractor"]
+
+class TrajectoryRequest(InitialState):
+    dt: float = 0.5
+    max_steps: int = 100000
+    max_points: int = 500
+    downsample: str = "uniform"  # "uniform" (eşit aralıklı) veya "rdp" (sapma sınırlı, Ramer–Douglas–Peucker)
+    tolerance_km: Optional[float] = None  # rdp: izin verilen en büyük sapma; max_points yine üst sınırdır
+    method: str = "rk4"  # "rk4" (sabit dt) veya "dopri5" (uyarlamalı, dt başlangıç adımı)
+    rtol: float = 1e-10
+    atol: float = 1e-6
+
+class TrajectoryStreamRequest(InitialState):
+    dt: float = 0.5
+    max_steps: int = 100000
+    method: str = "rk4"
+    rtol: float = 1e-10
+    atol: float = 1e-6
+    chunk_size: int = 2048
+    first_chunk_size: int = 64  # ilk kare için küçük parça
+    stride: int = 1  # her parçadan her stride'ıncı satır gönderilir (son satır her zaman)
+
+class TrajectoryBatchRequest(BaseModel):
+    states: List[InitialState]
+    dt: float = 1.0
+    max_steps: int = 20000
+    method: str = "dopri5"
+    rtol: float = 1e-10
+    atol: float = 1e-6
+    horizon_hours: float = Field(24, gt=0, le=MAX_HORIZON_HOURS)
+
+ENSEMBLE_MAX_SAMPLES = 20000
+
+class EnsembleRequest(InitialState):
+    diameter_min_km: float
+    diameter_max_km: float
+    velocity_sigma_km_s: float = Field(0.1, ge=0)
+    position_sigma_km: float = Field(0, ge=0)
+    density_kg_m3: float = 3000
+    samples: int = Field(1000, ge=1, le=ENSEMBLE_MAX_SAMPLES)
+    seed: Optional[int] = None
+    confidence: float = 0.95
+    horizon_hours: float = Field(24, gt=0, le=MAX_HORIZON_HOURS)
+    workers: Optional[int] = Field(None, ge=1)
 
 @app.get("/")
 async def root():
     return {"message": "Asteroid Impact Simulator API", "version": "1.0"}
 
+def _build_asteroid_payload(data):
+    selected = [neo for neo_list in data.get("near_earth_objects", {}).values() for neo in neo_list[:3]]  # Her günden 3 tane
+    velocities = calculate_asteroid_velocity_batch(selected)
+
+    asteroids = []
+    for neo, asteroid_velocity in zip(selected, velocities.tolist()):
+        close_approach = neo["close_approach_data"][0]
+        asteroids.append({
+            "id": neo["id"],
+            "name": neo["name"].replace("(", "").replace(")", ""),
+            "diameter_km": round(neo["estimated_diameter"]["kilometers"]["estimated_diameter_max"], 3),
+            "diameter_min_km": round(neo["estimated_diameter"]["kilometers"]["estimated_diameter_min"], 3),
+            # "velocity_km_s": round(float(close_approach["relative_velocity"]["kilometers_per_second"]), 2),
+            # "velocity_km_s": calculate_asteroid_velocity(neo),
+            "horizontal_velocity_km_s": asteroid_velocity[0],
+            "vertical_velocity_km_s": asteroid_velocity[1],
+            "z_velocity_km_s": asteroid_velocity[2],
+            "miss_distance_km": round(float(close_approach["miss_distance"]["kilometers"]), 0),
+            "close_approach_date": close_approach["close_approach_date"],
+            "is_potentially_hazardous": neo.get("is_potentially_hazardous_asteroid", False)
+        })
+
+    # En büyükten küçüğe sırala
+    asteroids.sort(key=lambda x: x["diameter_km"], reverse=True)
+
+    return {
+        "count": len(asteroids),
+        "asteroids": asteroids[:15]  # İlk 15 tanesi
+    }
+
+# Yerel NEO kataloğu: günler bir kez senkronize edilir, sorgular diskteki indeksten yapılır.
+# Dosya lifespan'da (ya da ilk sorguda) açılır, içe aktarma sırasında değil
+catalogue = neo_store.NeoStore(os.getenv("NEO_DB_PATH", os.path.join(os.path.dirname(__file__), "neo_catalogue.sqlite3")))
+# Çevrimdışı test modu: NASA yerine kayıtlı bir /feed yanıtı kullanılır
+NEO_OFFLINE_FIXTURE = os.getenv("NEO_OFFLINE_FIXTURE")
+_offline_feed = neo_store.load_fixture(NEO_OFFLINE_FIXTURE) if NEO_OFFLINE_FIXTURE else None
+
+async def _fetch_feed(start_date, end_date):
+    if _offline_feed is not None:
+        return neo_store.fixture_feed(_offline_feed, start_date, end_date)
+    return await nasa_client.fetch_feed(start_date, end_date)
+
+async def _sync_range(range_start, range_end):
+    data = await _fetch_feed(range_start, range_end)
+    await asyncio.to_thread(catalogue.ingest, data, range_start, range_end)
+
+async def _sync_catalogue(start_date, end_date):
+    """Katalogda eksik olan günleri NASA feed'inden eşzamanlı olarak çek"""
+    ranges = await asyncio.to_thread(catalogue.missing_ranges, start_date, end_date)
+    await asyncio.gather(*(_sync_range(range_start, range_end) for range_start, range_end in ranges))
+
+async def _load_asteroids(start_date, end_date):
+    try:
+        with instrumentation.span("nasa_sync"):
+            await _sync_catalogue(start_date, end_date)
+        with instrumentation.span("catalogue"):
+            data = await executor_pool.run_io(catalogue.feed, start_date, end_date)
+    except (httpx.HTTPError, neo_feed.RateLimited):
+        # Upstream erişilemezse katalogdaki mevcut günlerle devam et
+        with instrumentation.span("catalogue"):
+            data = await executor_pool.run_io(catalogue.feed, start_date, end_date)
+        if not data["element_count"]:
+            raise
+    with instrumentation.span("build_payload"):
+        return _build_asteroid_payload(data)
+
+# Tarih aralığına göre önbellek: istekler bellekten döner, NASA'ya giden trafik sınırlı kalır
+asteroid_feed = neo_feed.FeedCache(
+    _load_asteroids,
+    ttl=float(os.getenv("NEO_CACHE_TTL_S", "900")),
+    stale_ttl=float(os.getenv("NEO_CACHE_STALE_S", str(6 * 3600))),
+    error_ttl=float(os.getenv("NEO_CACHE_ERROR_S", "30")),
+)
+
 @app.get("/api/asteroids")
 async def get_asteroids():
     """NASA NEO API'den yakın geçiş yapan asteroitleri getir"""
     try:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
-        
-        url = f"{NASA_BASE_URL}/feed"
-        params = {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "api_key": NASA_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        asteroids = []
-        for date_str, neo_list in data.get("near_earth_objects", {}).items():
-            for neo in neo_list[:3]:  # Her günden 3 tane
-                close_approach = neo["close_approach_data"][0]
-                asteroid_velocity = calculate_asteroid_velocity(neo)
-                asteroids.append({
-                    "id": neo["id"],
-                    "name": neo["name"].replace("(", "").replace(")", ""),
-                    "diameter_km": round(neo["estimated_diameter"]["kilometers"]["estimated_diameter_max"], 3),
-                    "diameter_min_km": round(neo["estimated_diameter"]["kilometers"]["estimated_diameter_min"], 3),
-                    # "velocity_km_s": round(float(close_approach["relative_velocity"]["kilometers_per_second"]), 2),
-                    # "velocity_km_s": calculate_asteroid_velocity(neo),
-                    "horizontal_velocity_km_s": asteroid_velocity["vx"],
-                    "vertical_velocity_km_s": asteroid_velocity["vy"],
-                    "z_velocity_km_s": asteroid_velocity["vz"],
-                    "miss_distance_km": round(float(close_approach["miss_distance"]["kilometers"]), 0),
-                    "close_approach_date": close_approach["close_approach_date"],
-                    "is_potentially_hazardous": neo.get("is_potentially_hazardous_asteroid", False)
-                })
-        
-        # En büyükten küçüğe sırala
-        asteroids.sort(key=lambda x: x["diameter_km"], reverse=True)
-        
-        return {
-            "count": len(asteroids),
-            "asteroids": asteroids[:15]  # İlk 15 tanesi
-        }
+        return await asteroid_feed.get((start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")))
     
-    except requests.RequestException as e:
+    except (httpx.HTTPError, neo_feed.RateLimited) as e:
         # API başarısız olursa fallback data
         return {
             "count": 24,
@@ -282,32 +449,68 @@ async def get_asteroids():
             ]
             }
 
-# -----------------------------
-# Helpers
-# -----------------------------
-def kinetic_energy(mass, velocity):
-    return 0.5 * mass * velocity**2
+CATALOGUE_MAX_SYNC_DAYS = 366
 
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO date (YYYY-MM-DD)")
 
-def crater_diameter(diameter_m, velocity_m_s, density, angle_deg):
-    g = 9.81
-    theta = math.radians(angle_deg)
-    mass = (4/3) * math.pi * (diameter_m/2)**3 * density
-    E = kinetic_energy(mass, velocity_m_s)
-    d_crater = 1.161 * (E**0.294) * (math.sin(theta)**(1/3)) / (g**0.22)
-    depth = d_crater * 0.2
-    return d_crater, depth
+@app.get("/api/catalogue")
+async def query_catalogue(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    min_diameter_km: Optional[float] = None,
+    max_diameter_km: Optional[float] = None,
+    hazardous: Optional[bool] = None,
+    max_miss_distance_km: Optional[float] = None,
+    sort: str = "date",
+    limit: int = 100,
+    sync: bool = False,
+):
+    """Yerel NEO kataloğunu sorgula; sync=true ise aralıktaki eksik günler önce NASA'dan çekilir"""
+    start = start_date and _parse_date(start_date, "start_date")
+    end = end_date and _parse_date(end_date, "end_date")
+    if sort not in neo_store.SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {list(neo_store.SORT_COLUMNS)}")
+    if not 1 <= limit <= 10000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 10000")
 
+    if sync:
+        if not (start and end) or not 0 <= (end - start).days < CATALOGUE_MAX_SYNC_DAYS:
+            raise HTTPException(status_code=400, detail=f"sync requires start_date <= end_date within {CATALOGUE_MAX_SYNC_DAYS} days")
+        try:
+            await _sync_catalogue(start, end)
+        except neo_feed.RateLimited as e:
+            raise HTTPException(status_code=503, detail=f"NASA feed sync failed: {e}",
+                                headers={"Retry-After": str(math.ceil(e.retry_after))})
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=f"NASA feed sync failed: {e}")
 
-def blast_radius(E):
-    return 0.28 * (E ** (1/3)) / 1000  # km
+    rows = await executor_pool.run_io(
+        catalogue.query, start, end, min_diameter_km, max_diameter_km, hazardous, max_miss_distance_km, sort, limit
+    )
+    return {"count": len(rows), "asteroids": rows}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metin biçiminde istek sayaçları ve süre histogramları"""
+    return Response(content=instrumentation.render_metrics(), media_type=instrumentation.CONTENT_TYPE)
 
-def thermal_radius(E):
-    # very rough threshold for severe burns
-    return 0.05 * (E ** (1/3)) / 1000  # km
+@app.get("/api/executors/stats")
+async def executor_stats():
+    """Havuz boyutları, kuyruktaki istek sayıları ve sınırlar"""
+    return executor_pool.stats()
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Yanıt ve NEO feed önbelleklerinin isabet/ıskalama sayaçları"""
+    return {"responses": response_cache.info(), "asteroid_feed": dict(asteroid_feed.stats)}
 
+# -----------------------------
+# Helpers
+# -----------------------------
 def tsunami_risk(height_m):
     if height_m > 20:
         return "high"
@@ -317,67 +520,80 @@ def tsunami_risk(height_m):
         return "low"
 
 
-def tsunami_height(diameter_m, velocity_m_s, angle_deg, distance_km):
-    theta = math.radians(angle_deg)
-    impact_energy = kinetic_energy((4/3)*math.pi*(diameter_m/2)**3*3000, velocity_m_s)
-    h0 = 0.1 * (impact_energy**0.25) / 1e6
-    return h0 / (1 + distance_km/50)
+def tsunami_risk_new(latitude, longitude, earthquake_magnitude):
+    # Tsunami riski (okyanusa düşerse); kara/okyanus ayrımı bit paketli maskeden
+    if land_mask.default_mask().is_ocean(latitude, longitude):
+        if earthquake_magnitude > 7.6:
+            return "high"
+        elif earthquake_magnitude > 6.8:
+            return "moderate"
+    return "low"
 
 
-def seismic_magnitude(E):
-    return (math.log10(E) - 4.8) / 1.5
 
+# Etki modelinin tanımlı olduğu girdiler; density 0 verilmişse önce varsayılanla değiştirilir
+DEFAULT_DENSITY_KG_M3 = 2500
+IMPACT_INPUT_ERROR = "diameter, velocity and density must be positive and 0 < impact_angle <= 90"
+SIMULATE_BATCH_MAX_ROWS = 50000
+
+def _valid_impact_inputs(diameter_km, velocity_km_s, density_kg_m3, impact_angle):
+    """Skaler girdide bool, kolon girdisinde satır başına bool dizisi."""
+    valid = ((np.asarray(diameter_km) > 0) & (np.asarray(velocity_km_s) > 0) & (np.asarray(density_kg_m3) > 0)
+             & (np.asarray(impact_angle) > 0) & (np.asarray(impact_angle) <= 90))
+    return valid if valid.ndim else bool(valid)
 
-def tsunami_risk_new(latitude, longitude, earthquake_magnitude):
-    # Tsunami riski (okyanusa düşerse)
-    ocean = (((60,-60),(120,-80)),((60,-90),(180,-180)),((90,60),(180,-180)),((30,-60),(20,120)),((70,-60),(20,-80)))
-    for ((low_latitude,high_latitude),(low_longitude,high_longitude)) in ocean:
-        if high_latitude < latitude < low_latitude and high_longitude < abs(longitude) < low_longitude:
-            if earthquake_magnitude > 7.6:
-                return "high"
-            elif earthquake_magnitude > 6.8:
-                return "moderate"
-            else:
-                return "low"
-        else:
-            return "low"
 
 # -----------------------------
 # API Endpoint
 # -----------------------------
+# Tekrarlanan simulate/mitigate istekleri için yanıt önbelleği (serileştirilmiş baytlar saklanır)
+response_cache = response_cache_module.ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+    quantization=response_cache_module.parse_quantization(os.getenv("RESPONSE_CACHE_QUANTIZATION")),
+)
+
 @app.post("/api/simulate")
 async def simulate_impact(request: ImpactRequest):
+    return response_cache.respond("simulate", request, _simulate_impact)
+
+def severity(megatons):
+    """Enerjiye göre şiddet sınıfı (impact_batch.severity_np ile aynı eşikler)."""
+    if megatons > 1e6:
+        return "Extinction Level Event"
+    elif megatons > 1e3:
+        return "Catastrophic Global Impact"
+    elif megatons > 100:
+        return "Severe Regional Impact"
+    else:
+        return "Localized Impact"
+
+def _simulate_impact(request):
+    """/api/simulate ve /api/simulate/fast'in ortak skaler etki modeli ve yanıtı."""
+    # Assuming an average density of an asteroid is 2500 kg/m^3, if not provided
+    density = request.density_kg_m3 or DEFAULT_DENSITY_KG_M3
+    if not _valid_impact_inputs(request.diameter_km, request.velocity_km_s, density, request.impact_angle):
+        raise HTTPException(status_code=400, detail=IMPACT_INPUT_ERROR)
     try:
         # Convert units
         diameter_m = request.diameter_km * 1000
         velocity_m_s = request.velocity_km_s * 1000
-        theta = math.radians(request.impact_angle)
-        density = request.density_kg_m3 or 2500 # Assuming an average density of an asteroid is 2500 kg/m^3, if not provided
 
         # Mass & energy
         mass = (4/3) * math.pi * (diameter_m/2)**3 * density
         E = kinetic_energy(mass, velocity_m_s)
 
         # Megaton TNT conversion (1 MT TNT = 4.184e15 J)
-        megatons = E / 4.184e15
+        megatons = E / physics.MEGATON_TNT_J
         kilotons = megatons * 1000
 
         # Calculations
         crater_diam, crater_depth = crater_diameter(diameter_m, velocity_m_s, density, request.impact_angle)
         blast = blast_radius(E)
         thermal = thermal_radius(E)
-        tsunami_h = tsunami_height(diameter_m, velocity_m_s, request.impact_angle, 100)
         magnitude = seismic_magnitude(E)
-
-        # Classification of severity
-        if megatons > 1e6:
-            severity = "Extinction Level Event"
-        elif megatons > 1e3:
-            severity = "Catastrophic Global Impact"
-        elif megatons > 100:
-            severity = "Severe Regional Impact"
-        else:
-            severity = "Localized Impact"
+        with instrumentation.span("population"):
+            blast_exposed, thermal_exposed, casualties = population.exposure(
+                request.impact_latitude, request.impact_longitude, blast, thermal)
 
         hiroshima_equiv = round(megatons * 1000 / 15, 2)  # Hiroshima ~15 kt
 
@@ -401,11 +617,15 @@ async def simulate_impact(request: ImpactRequest):
             "damage_zones": {
                 "blast_radius_km": round(blast, 1),
                 "thermal_radius_km": round(thermal, 1),
-                # "tsunami_risk": tsunami_risk(tsunami_h)
-                "tsunami_risk": tsunami_risk_new(request.impact_latitude, request.impact_longitude, magnitude)
+                "tsunami_risk": tsunami_risk_new(request.impact_latitude, request.impact_longitude, magnitude),
+                "population_exposed": {
+                    "blast": round(blast_exposed),
+                    "thermal": round(thermal_exposed)
+                },
+                "estimated_casualties": round(float(casualties))
             },
             "comparison": {
-                "severity": severity,
+                "severity": severity(megatons),
                 "hiroshima_equivalent": hiroshima_equiv
             },
             "asteroid_params": {
@@ -423,61 +643,348 @@ async def simulate_impact(request: ImpactRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/simulate/batch")
+async def simulate_impact_batch(request: ImpactBatchRequest, http_request: Request):
+    """Parametre taraması: /api/simulate hesaplarını kolon dizileri üzerinde tek seferde yapar"""
+    n = len(request.diameter_km)
+    if not 1 <= n <= SIMULATE_BATCH_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"diameter_km must contain between 1 and {SIMULATE_BATCH_MAX_ROWS} values")
+    defaults = {
+        "impact_angle": 45,
+        "impact_latitude": 0,
+        "impact_longitude": 0,
+        "density_kg_m3": 3000,
+    }
+    columns = {"diameter_km": request.diameter_km, "velocity_km_s": request.velocity_km_s}
+    for name, default in defaults.items():
+        values = getattr(request, name)
+        columns[name] = [default] * n if values is None else values
+    for name, values in columns.items():
+        if len(values) != n:
+            raise HTTPException(status_code=400, detail=f"Column '{name}' has {len(values)} values, expected {n}")
+
+    cols = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    cols["density_kg_m3"] = np.where(cols["density_kg_m3"] == 0, DEFAULT_DENSITY_KG_M3, cols["density_kg_m3"])
+    invalid = np.flatnonzero(~_valid_impact_inputs(
+        cols["diameter_km"], cols["velocity_km_s"], cols["density_kg_m3"], cols["impact_angle"]))
+    if invalid.size:
+        raise HTTPException(status_code=400, detail=f"{IMPACT_INPUT_ERROR} (invalid rows: {invalid[:10].tolist()})")
+
+    with instrumentation.span("compute"):
+        return await executor_pool.run_cpu(functools.partial(impact_batch.simulate_columns, **cols), http_request)
+
+@app.post("/api/simulate/fast")
+async def simulate_impact_fast(request: ImpactRequest):
+    """
+    /api/simulate ile aynı model ve yanıt, yanıt önbelleği olmadan (etkileşimli slider'lar için: her konum
+    yeni bir anahtar olduğundan anahtar üretimi ve saklama maliyeti ödenmez).
+    """
+    return _simulate_impact(request)
+
+TRAJECTORY_MAX_STEPS = 200000
+ESCAPE_RADIUS = physics.R_EARTH * 100
+
+def _downsample_indices(n, max_points):
+    # Eşit aralıklı örnekleme; ilk ve son nokta (çarpma noktası) her zaman korunur
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+
+@app.post("/api/trajectory")
+async def simulate_trajectory(request: TrajectoryRequest, http_request: Request, format: Optional[str] = None,
+                              delta: bool = False, fields: str = "pos"):
+    """
+    Asteroit yörüngesini sunucuda hesapla, seyreltilmiş yolu ve çarpma bilgisini döndür.
+    format=binary veya Accept: application/x-trajectory ise trajectory_codec ikili biçimi döner:
+    step, t ve fields ile seçilen gruplar (pos,vel,acc) float32; delta=true ile fark kodlu.
+    """
+    if request.dt <= 0:
+        raise HTTPException(status_code=400, detail="dt must be positive")
+    if not 1 <= request.max_steps <= TRAJECTORY_MAX_STEPS:
+        raise HTTPException(status_code=400, detail=f"max_steps must be between 1 and {TRAJECTORY_MAX_STEPS}")
+    if request.max_points < 2:
+        raise HTTPException(status_code=400, detail="max_points must be at least 2")
+    if request.downsample not in ("uniform", "rdp"):
+        raise HTTPException(status_code=400, detail="downsample must be 'uniform' or 'rdp'")
+    if request.tolerance_km is not None and request.tolerance_km <= 0:
+        raise HTTPException(status_code=400, detail="tolerance_km must be positive")
+    if request.method not in physics.INTEGRATORS:
+        raise HTTPException(status_code=400, detail=f"Unknown integrator method '{request.method}'")
+    if format not in (None, "json", "binary"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'binary'")
+    groups = tuple(group for group in fields.split(",") if group)
+    if not groups or set(groups) - set(trajectory_codec.GROUPS):
+        raise HTTPException(status_code=400, detail=f"fields must be a comma separated subset of {list(trajectory_codec.GROUPS)}")
+
+    position0, velocity0 = physics.initial_state(
+        request.latitude,
+        request.longitude,
+        request.distance_km * 1000,
+        request.horizontal_velocity_km_s * 1000,
+        request.vertical_velocity_km_s * 1000,
+        request.z_velocity_km_s * 1000,
+    )
+    with instrumentation.span("integrate"):
+        traj, info = await executor_pool.run_cpu(functools.partial(
+            physics.simulate_trajectory,
+            position0, velocity0, dt=request.dt, max_steps=request.max_steps, escape_radius=ESCAPE_RADIUS,
+            method=request.method, rtol=request.rtol, atol=request.atol
+        ), http_request)
+
+    with instrumentation.span("downsample"):
+        if request.downsample == "rdp":
+            tolerance_m = request.tolerance_km * 1000 if request.tolerance_km else None
+            indices = simplify.simplify_indices(traj["pos"], tolerance=tolerance_m, max_points=request.max_points)
+        else:
+            indices = _downsample_indices(traj.size, request.max_points)
+    if format == "binary" or trajectory_codec.MEDIA_TYPE in http_request.headers.get("accept", ""):
+        meta = {
+            "crashed": info["crashed"],
+            "escaped": info["escaped"],
+            "total_steps": info["steps"],
+            "dt": request.dt,
+            "method": request.method,
+            "force_evaluations": info["nfev"],
+            "duration_s": info["time"],
+            "earth_radius_m": physics.R_EARTH,
+            "impact": info["impact"]
+        }
+        with instrumentation.span("encode"):
+            content = trajectory_codec.encode(traj, indices, meta, delta=delta, groups=groups)
+        return Response(content=content, media_type=trajectory_codec.MEDIA_TYPE)
+
+    # Model birimleri (Dünya yarıçapı = 1)
+    positions = traj["pos"][indices] / physics.R_EARTH
+
+    return {
+        "crashed": info["crashed"],
+        "escaped": info["escaped"],
+        "total_steps": info["steps"],
+        "dt": request.dt,
+        "method": request.method,
+        "force_evaluations": info["nfev"],
+        "duration_s": info["time"],
+        "step_indices": indices.tolist(),
+        "times_s": np.round(traj["t"][indices], 3).tolist(),
+        "positions_model": np.round(positions, 5).tolist(),
+        "impact": info["impact"]
+    }
+
+# Akış modunda bellek sabit kaldığı için adım sınırı daha yüksek
+TRAJECTORY_STREAM_MAX_STEPS = 5000000
+TRAJECTORY_STREAM_MAX_CHUNK = 65536
+
+def _stream_message(event, payload, sse):
+    data = json.dumps(payload, separators=(",", ":"))
+    if sse:
+        return f"event: {event}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.post("/api/trajectory/stream")
+async def stream_trajectory(request: TrajectoryStreamRequest, http_request: Request):
+    """
+    Yörüngeyi entegre edildikçe parça parça gönderir (NDJSON; Accept: text/event-stream ise SSE).
+    Bir sonraki parça ancak önceki gönderildikten sonra hesaplanır; istemci ayrılırsa entegrasyon durur.
+    Parçalar süreç havuzunda hesaplanır; akış süresince bir CPU kuyruk yeri tutulur (kuyruk doluysa 503).
+    Yer akış bittiğinde, istemci ayrıldığında ya da gövde hiç okunmadan yanıt kapandığında bırakılır.
+    """
+    if request.dt <= 0:
+        raise HTTPException(status_code=400, detail="dt must be positive")
+    if not 1 <= request.max_steps <= TRAJECTORY_STREAM_MAX_STEPS:
+        raise HTTPException(status_code=400, detail=f"max_steps must be between 1 and {TRAJECTORY_STREAM_MAX_STEPS}")
+    if not 1 <= request.first_chunk_size <= request.chunk_size <= TRAJECTORY_STREAM_MAX_CHUNK:
+        raise HTTPException(status_code=400, detail=f"Require 1 <= first_chunk_size <= chunk_size <= {TRAJECTORY_STREAM_MAX_CHUNK}")
+    if request.stride < 1:
+        raise HTTPException(status_code=400, detail="stride must be at least 1")
+    if request.method not in physics.INTEGRATORS:
+        raise HTTPException(status_code=400, detail=f"Unknown integrator method '{request.method}'")
+
+    position0, velocity0 = physics.initial_state(
+        request.latitude,
+        request.longitude,
+        request.distance_km * 1000,
+        request.horizontal_velocity_km_s * 1000,
+        request.vertical_velocity_km_s * 1000,
+        request.z_velocity_km_s * 1000,
+    )
+    sim_kwargs = dict(dt=request.dt, max_steps=request.max_steps, escape_radius=ESCAPE_RADIUS,
+                      method=request.method, rtol=request.rtol, atol=request.atol)
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    release = executor_pool.reserve_cpu()
+
+    async def events():
+        # Entegrasyon durumu her parçada işçiye gidip güncellenmiş olarak döner
+        state = physics.chunk_state(position0, velocity0, request.dt)
+        size = request.first_chunk_size
+        row = 0
+        try:
+            while True:
+                chunk, state, info = await executor_pool.run_reserved(
+                    functools.partial(physics.simulate_chunk, state, size, **sim_kwargs))
+                size = request.chunk_size
+                if chunk.size:
+                    indices = np.unique(np.append(np.arange(0, chunk.size, request.stride), chunk.size - 1))
+                    yield _stream_message("chunk", {
+                        "type": "chunk",
+                        "step_indices": (row + indices).tolist(),
+                        "times_s": np.round(chunk["t"][indices], 3).tolist(),
+                        "positions_model": np.round(chunk["pos"][indices] / physics.R_EARTH, 5).tolist()
+                    }, sse)
+                    row += chunk.size
+                if info is not None:
+                    yield _stream_message("done", {
+                        "type": "done",
+                        "crashed": info["crashed"],
+                        "escaped": info["escaped"],
+                        "total_steps": info["steps"],
+                        "force_evaluations": info["nfev"],
+                        "duration_s": info["time"],
+                        "impact": info["impact"]
+                    }, sse)
+                    return
+                if await http_request.is_disconnected():
+                    return
+        finally:
+            release()
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    # Üreteç hiç başlatılmazsa (ör. istemci ilk parçadan önce ayrılır) finally çalışmaz; arka plan görevi
+    # yeri yine bırakır. release idempotent olduğundan iki yol birlikte güvenlidir
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"},
+                             background=BackgroundTask(release))
+
+TRAJECTORY_BATCH_MAX_STATES = 5000
+
+def _nan_to_none(values, ndigits):
+    return [None if math.isnan(v) else round(v, ndigits) for v in values.tolist()]
+
+@app.post("/api/trajectory/batch")
+async def simulate_trajectory_batch(request: TrajectoryBatchRequest, http_request: Request):
+    """Birden çok asteroidi (ör. /api/asteroids akışının tamamı) tek bir toplu yayılımla sonuçlandır"""
+    n = len(request.states)
+    if not 1 <= n <= TRAJECTORY_BATCH_MAX_STATES:
+        raise HTTPException(status_code=400, detail=f"states must contain between 1 and {TRAJECTORY_BATCH_MAX_STATES} entries")
+    if request.dt <= 0:
+        raise HTTPException(status_code=400, detail="dt must be positive")
+    if request.method not in physics.INTEGRATORS:
+        raise HTTPException(status_code=400, detail=f"Unknown integrator method '{request.method}'")
+
+    columns = np.array([
+        (s.latitude, s.longitude, s.distance_km, s.horizontal_velocity_km_s, s.vertical_velocity_km_s, s.z_velocity_km_s)
+        for s in request.states
+    ], dtype=float)
+    columns[:, 2:] *= 1000
+    positions, velocities = physics.initial_states(*columns.T)
+    with instrumentation.span("integrate"):
+        result = await executor_pool.run_cpu(functools.partial(
+            physics.simulate_batch,
+            positions, velocities, dt=request.dt, max_steps=request.max_steps, escape_radius=ESCAPE_RADIUS,
+            method=request.method, rtol=request.rtol, atol=request.atol, t_max=request.horizon_hours * 3600
+        ), http_request)
+    impact = result["impact"]
+
+    return {
+        "count": n,
+        "crashed": result["crashed"].tolist(),
+        "escaped": result["escaped"].tolist(),
+        "steps": result["steps"].tolist(),
+        "time_s": np.round(result["time"], 3).tolist(),
+        "force_evaluations": result["nfev"],
+        "impact": {
+            "latitude": _nan_to_none(impact["latitude"], 4),
+            "longitude": _nan_to_none(impact["longitude"], 4),
+            "angle": _nan_to_none(impact["angle"], 2),
+            "velocity": _nan_to_none(impact["velocity"], 3),
+            "time_s": _nan_to_none(impact["time"], 3)
+        }
+    }
+
+@app.post("/api/ensemble")
+async def simulate_ensemble(request: EnsembleRequest, http_request: Request):
+    """Bozulmuş başlangıç durumlarıyla Monte Carlo çarpma olasılığı ve çarpma noktası dağılımı"""
+    if not 0 < request.diameter_min_km <= request.diameter_max_km:
+        raise HTTPException(status_code=400, detail="diameter range must satisfy 0 < min <= max")
+    if not 0 < request.confidence < 1:
+        raise HTTPException(status_code=400, detail="confidence must be between 0 and 1")
+
+    position0, velocity0 = physics.initial_state(
+        request.latitude,
+        request.longitude,
+        request.distance_km * 1000,
+        request.horizontal_velocity_km_s * 1000,
+        request.vertical_velocity_km_s * 1000,
+        request.z_velocity_km_s * 1000,
+    )
+    # Parçalar paylaşılan süreç havuzunda çalışır; workers yalnızca parça sayısını belirler
+    chunks, diameters, sim_kwargs = ensemble.split_chunks(
+        position0,
+        velocity0,
+        request.samples,
+        request.diameter_min_km * 1000,
+        request.diameter_max_km * 1000,
+        velocity_sigma=request.velocity_sigma_km_s * 1000,
+        position_sigma=request.position_sigma_km * 1000,
+        seed=request.seed,
+        workers=request.workers or executor_pool.bulk_workers,
+        sim_kwargs={"t_max": request.horizon_hours * 3600},
+    )
+    with instrumentation.span("propagate"):
+        parts = await executor_pool.map_cpu(ensemble.propagate_chunk, chunks, http_request)
+    return ensemble.combine(parts, diameters, sim_kwargs, density=request.density_kg_m3, confidence=request.confidence)
+
 @app.post("/api/mitigate")
-async def evaluate_mitigation(request: MitigationRequest):
+async def evaluate_mitigation(request: MitigationRequest, http_request: Request):
     """Azaltma stratejilerini değerlendir"""
-    
+    return await response_cache.respond_async(
+        "mitigate", request, functools.partial(_evaluate_mitigation, http_request=http_request))
+
+async def _evaluate_mitigation(request, http_request=None):
+    if request.mode not in ("analytic", "trajectory"):
+        raise HTTPException(status_code=400, detail="mode must be 'analytic' or 'trajectory'")
+    if request.mode == "trajectory":
+        if request.method != "kinetic_impactor":
+            raise HTTPException(status_code=400, detail="trajectory mode is only available for kinetic_impactor")
+        if request.initial_state is None:
+            raise HTTPException(status_code=400, detail="trajectory mode requires initial_state")
+        if request.direction not in deflection.DIRECTIONS:
+            raise HTTPException(status_code=400, detail=f"direction must be one of {list(deflection.DIRECTIONS)}")
+
     diameter_km = request.diameter_km
     velocity_km_s = request.velocity_km_s
     years_before = request.years_before_impact
     method = request.method
     
     # Kütle hesaplama
-    radius_m = (diameter_km * 1000) / 2
-    volume_m3 = (4/3) * np.pi * (radius_m ** 3)
-    mass_kg = volume_m3 * 3000
+    mass_kg = mitigation.asteroid_mass(diameter_km)
     
     if method == "kinetic_impactor":
-        # Momentum transferi ile hız değişimi
-        # Tipik bir kinetic impactor: 500 kg, 10 km/s
-        impactor_mass = 500
-        impactor_velocity = 10000  # m/s
-        
-        # Momentum korunumu ve beta faktörü (momentum enhancement)
-        beta = 2.0  # Tipik değer
-        delta_v = beta * (impactor_mass * impactor_velocity) / mass_kg
-        
-        # Yörünge sapması (basitleştirilmiş)
-        # Δr = Δv * t
-        deflection_distance_km = (delta_v * years_before * 365 * 24 * 3600) / 1000
-        
-        # Başarı olasılığı
-        success_probability = min(95, years_before * 15 + deflection_distance_km / 1000)
+        # Momentum transferi ile hız değişimi (500 kg, 10 km/s, beta 2.0)
+        delta_v, deflection_distance_km, success_probability, cost = mitigation.kinetic_impactor(mass_kg, years_before)
         
-        return {
+        result = {
             "method": "Kinetic Impactor",
             "delta_v_m_s": round(delta_v, 4),
             "deflection_distance_km": round(deflection_distance_km, 0),
             "success_probability": round(success_probability, 1),
-            "mission_cost_billion_usd": round(0.5 + years_before * 0.1, 2),
-            "success": deflection_distance_km > 6371,  # Earth radius
+            "mission_cost_billion_usd": round(cost, 2),
+            "success": deflection_distance_km > mitigation.EARTH_RADIUS_KM,
             "time_required_years": years_before,
             "description": f"A 500 kg impactor would deflect the asteroid by {round(deflection_distance_km, 0)} km"
         }
+        if request.mode == "trajectory":
+            result["trajectory"] = await _deflect_trajectory(request, delta_v, http_request)
+        return result
     
     elif method == "gravity_tractor":
         # Yerçekimi çekici (uzun süreli)
-        required_years = max(10, diameter_km * 5)
-        
-        success = years_before >= required_years
-        success_probability = min(90, (years_before / required_years) * 100)
+        required_years, success_probability, cost = mitigation.gravity_tractor(diameter_km, years_before)
         
         return {
             "method": "Gravity Tractor",
             "required_years": round(required_years, 1),
             "success_probability": round(success_probability, 1),
-            "mission_cost_billion_usd": round(years_before * 0.2, 2),
-            "success": success,
+            "mission_cost_billion_usd": round(cost, 2),
+            "success": years_before >= required_years,
             "time_required_years": years_before,
             "description": f"Requires at least {required_years} years for this asteroid size"
         }
@@ -485,6 +992,111 @@ async def evaluate_mitigation(request: MitigationRequest):
     else:
         raise HTTPException(status_code=400, detail="Unknown mitigation method")
 
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+async def _deflect_trajectory(request, delta_v, http_request=None):
+    # Süreç havuzunda çalışır; sapmasız yörüngeler işçi başına önbellekte tutulur (deflection.default_simulator)
+    state = request.initial_state
+    position0, velocity0 = physics.initial_state(
+        state.latitude,
+        state.longitude,
+        state.distance_km * 1000,
+        state.horizontal_velocity_km_s * 1000,
+        state.vertical_velocity_km_s * 1000,
+        state.z_velocity_km_s * 1000,
+    )
+    lead_time = request.lead_time_s if request.lead_time_s is not None else request.years_before_impact * SECONDS_PER_YEAR
+    horizon_s = request.horizon_hours * 3600
+    if lead_time > horizon_s:
+        # Sessizce t=0'a kırpmak yıllık bir önceliği saatlik bir ufukta uygulamak olurdu
+        raise HTTPException(status_code=400, detail=(
+            f"Lead time {lead_time:.0f} s exceeds the {request.horizon_hours:g} h integration horizon; "
+            f"pass lead_time_s <= {horizon_s:.0f} or raise horizon_hours (max {MAX_HORIZON_HOURS} h)"))
+    with instrumentation.span("deflection"):
+        try:
+            return await executor_pool.run_cpu(functools.partial(
+                deflection.simulate_deflection, position0, velocity0, delta_v, lead_time, request.direction,
+                {"t_max": horizon_s}
+            ), http_request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+MITIGATION_PLAN_MAX_POINTS = 20000
+
+@app.post("/api/mitigate/plan")
+async def plan_mitigation(request: MitigationPlanRequest):
+    """
+    Tüm yöntemleri öncelik süresi × impactor kütlesi × beta ızgarasında tek NumPy geçişinde değerlendirir;
+    maliyet (düşük), başarı olasılığı ve sapma (yüksek) için Pareto cephesini döndürür.
+    """
+    unknown = set(request.methods) - set(mitigation.METHODS)
+    if unknown or not request.methods:
+        raise HTTPException(status_code=400, detail=f"methods must be a non-empty subset of {list(mitigation.METHODS)}")
+    columns = {"lead_times_years": request.lead_times_years, "impactor_masses_kg": request.impactor_masses_kg, "betas": request.betas}
+    for name, values in columns.items():
+        if not values or min(values) <= 0:
+            raise HTTPException(status_code=400, detail=f"{name} must be a non-empty list of positive values")
+    grid_size = len(request.lead_times_years) * len(request.impactor_masses_kg) * len(request.betas)
+    if grid_size > MITIGATION_PLAN_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"Grid has {grid_size} points, limit is {MITIGATION_PLAN_MAX_POINTS}")
+
+    lead_times = np.asarray(request.lead_times_years, dtype=float)
+    parts = []
+    if "kinetic_impactor" in request.methods:
+        years, impactor_mass, beta = (g.ravel() for g in np.meshgrid(
+            lead_times, request.impactor_masses_kg, request.betas, indexing="ij"))
+        delta_v, deflection, probability, cost = mitigation.kinetic_impactor(
+            mitigation.asteroid_mass(request.diameter_km), years, impactor_mass, mitigation.IMPACTOR_VELOCITY_M_S, beta)
+        parts.append({
+            "method": np.full(years.size, "kinetic_impactor"),
+            "years_before_impact": years,
+            "impactor_mass_kg": impactor_mass,
+            "beta": beta,
+            "delta_v_m_s": np.round(delta_v, 4),
+            "deflection_distance_km": np.round(deflection, 0),
+            "success_probability": np.round(probability, 1),
+            "mission_cost_billion_usd": np.round(cost, 2),
+            "success": deflection > mitigation.EARTH_RADIUS_KM,
+        })
+    if "gravity_tractor" in request.methods:
+        required_years, probability, cost = mitigation.gravity_tractor(request.diameter_km, lead_times)
+        nan = np.full(lead_times.size, np.nan)
+        parts.append({
+            "method": np.full(lead_times.size, "gravity_tractor"),
+            "years_before_impact": lead_times,
+            "impactor_mass_kg": nan,
+            "beta": nan,
+            "delta_v_m_s": nan,
+            "deflection_distance_km": nan,  # sapma modeli yok; cephede -inf sayılır
+            "success_probability": np.round(probability, 1),
+            "mission_cost_billion_usd": np.round(cost, 2),
+            "success": lead_times >= required_years,
+        })
+    cols = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+    # Cephe, kullanıcıya gösterilen yuvarlanmış değerler üzerinden hesaplanır
+    deflection = np.nan_to_num(cols["deflection_distance_km"], nan=-np.inf)
+    front = mitigation.pareto_front(np.column_stack((
+        -cols["mission_cost_billion_usd"], cols["success_probability"], deflection)))
+    order = np.flatnonzero(front)[np.lexsort((
+        -cols["success_probability"][front], cols["mission_cost_billion_usd"][front]))]
+
+    return {
+        "candidates": int(front.size),
+        "front_size": int(order.size),
+        "front": {
+            "method": cols["method"][order].tolist(),
+            "years_before_impact": cols["years_before_impact"][order].tolist(),
+            "impactor_mass_kg": _nan_to_none(cols["impactor_mass_kg"][order], 3),
+            "beta": _nan_to_none(cols["beta"][order], 3),
+            "delta_v_m_s": _nan_to_none(cols["delta_v_m_s"][order], 4),
+            "deflection_distance_km": _nan_to_none(cols["deflection_distance_km"][order], 0),
+            "success_probability": cols["success_probability"][order].tolist(),
+            "mission_cost_billion_usd": cols["mission_cost_billion_usd"][order].tolist(),
+            "success": cols["success"][order].tolist(),
+        }
+    }
+
 def get_severity_level(megatons):
     """Etki şiddet seviyesi"""
     if megatons < 0.01:
@@ -512,10 +1124,6 @@ def get_earthquake_description(magnitude):
         return "Major - Widespread heavy damage"
     else:
         return "Great - Catastrophic destruction"
-    
-import numpy as np
-from astropy.time import Time
-import astropy.units as u
 
 def calculate_asteroid_velocity(api_data):
     try:
@@ -555,6 +1163,69 @@ def calculate_asteroid_velocity(api_data):
         "vz": round(velocity[2], 3)
     }
 
+def _seed_ids(ids):
+    """NEO id'lerini uint64 tohuma çevirir; sayısal olmayan id'ler için crc32 kullanılır."""
+    seeds = []
+    for neo_id in ids:
+        try:
+            seeds.append(int(neo_id) & 0xFFFFFFFFFFFFFFFF)
+        except (TypeError, ValueError):
+            seeds.append(zlib.crc32(str(neo_id).encode("utf-8")))
+    return np.array(seeds, dtype=np.uint64)
+
+def _splitmix64(x):
+    """Sayaç tabanlı splitmix64 karıştırıcısı (uint64 dizileri, taşma modüler)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _uniforms(seeds, count):
+    """Her tohum için count adet [0, 1) sayısı: (n, count). Aynı id her zaman aynı sayıları üretir."""
+    counters = seeds[:, None] * np.uint64(count) + np.arange(count, dtype=np.uint64)
+    return (_splitmix64(_splitmix64(counters)) >> np.uint64(11)).astype(float) * 2.0**-53
+
+def calculate_asteroid_velocity_batch(neos):
+    """
+    calculate_asteroid_velocity'nin toplu ve deterministik sürümü: tüm NEO'lar tek geçişte hesaplanır.
+    Rastgelelik global np.random yerine id ile tohumlanır; aynı asteroit her istekte aynı vektörü alır.
+    Dönüş: (n, 3) dizi, km/s, 3 ondalığa yuvarlanmış.
+    """
+    try:
+        velocity_kms = np.array([float(neo["close_approach_data"][0]["relative_velocity"]["kilometers_per_second"]) for neo in neos])
+        miss_distance_km = np.array([float(neo["close_approach_data"][0]["miss_distance"]["kilometers"]) for neo in neos])
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError("Invalid API data format. Ensure 'close_approach_data' contains required fields.")
+    if not len(neos):
+        return np.empty((0, 3))
+
+    u = _uniforms(_seed_ids([neo.get("id") for neo in neos]), 5)
+    phi = u[:, 0] * 2 * np.pi
+    theta = u[:, 1] * np.pi
+    # Yalnızca yön kullanılır; miss_distance 0 ise konum sıfır olur ve normlar NaN üretir, bu yüzden birim yarıçap alınır
+    radius = np.where(miss_distance_km > 0, miss_distance_km, 1.0)
+    position = radius[:, None] * np.column_stack((
+        np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)
+    ))
+
+    # Reddetme döngüsü yerine: konuma paralel çıkan rastgele vektörler, konuma en dik eksenle değiştirilir
+    rand_vec = u[:, 2:5] * 2 - 1
+    cross = np.cross(rand_vec, position)
+    parallel = np.linalg.norm(cross, axis=1) <= 1e-6
+    if parallel.any():
+        axes = np.eye(3)[np.argmin(np.abs(position[parallel]), axis=1)]
+        rand_vec[parallel] = axes
+
+    vel_dir = np.cross(position, rand_vec)
+    vel_dir /= np.linalg.norm(vel_dir, axis=1, keepdims=True)
+    velocity = vel_dir * velocity_kms[:, None]
+
+    # Ensure Z-positive toward Earth (radial velocity check)
+    radial_vel = -np.einsum("ij,ij->i", velocity, position) / np.linalg.norm(position, axis=1)
+    velocity[radial_vel < 0] *= -1
+
+    return np.round(velocity, 3)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
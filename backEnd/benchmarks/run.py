@@ -0,0 +1,280 @@
+"""
+Fizik ve API sıcak yolları için kıyaslama (benchmark) koşucusu.
+
+    cd backEnd
+    python benchmarks/run.py                         # hepsi, sonuçlar stdout tablosu
+    python benchmarks/run.py -k physics --out new.json
+    python benchmarks/run.py --baseline old.json     # medyan oranı eşiği aşarsa çıkış kodu 1
+
+Sonuç JSON'u: {"meta": {...}, "results": {ad: istatistikler + sayaçlar}, "regressions": [...]}.
+Eşikler thresholds.json'dadır: mutlak medyan üst sınırı (s), iş sayaçları için üst sınır
+(ör. nfev; makineden bağımsızdır) ve --baseline ile karşılaştırmada izin verilen medyan oranı.
+"""
+import argparse
+import asyncio
+import contextlib
+import copy
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+
+import physics
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+FIXTURE_PATH = os.path.join(BACKEND_DIR, "fixtures", "neo_feed.json")
+
+# asteroidxyz örnek başlangıç durumu
+POSITION0 = np.array([0.0, 1e7, 0.0])
+VELOCITY0 = np.array([6000.0, 1000.0, 200.0])
+
+BENCHMARKS = []
+
+
+def benchmark(name, ops=1):
+    """
+    Kayıt dekoratörü. Fonksiyon bir üreteçtir: hazırlığı yapar, ölçülecek çağrıyı yield eder,
+    kapanışta temizliği yapar. Ölçülen çağrı bir sözlük döndürürse iş sayaçları olarak kaydedilir.
+    ops: bir çağrıdaki işlem sayısı (işlem/s hesabı için).
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, ops))
+        return setup
+    return register
+
+
+def measure(fn, min_time=0.5, min_rounds=5, max_rounds=1000, warmup=1):
+    for _ in range(warmup):
+        fn()
+    times, counters = [], None
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < max_rounds and (len(times) < min_rounds or sum(times) < min_time):
+            start = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - start)
+            if isinstance(out, dict):
+                counters = out
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times, counters
+
+
+def summarize(times, ops, counters):
+    median = statistics.median(times)
+    result = {
+        "rounds": len(times),
+        "min_s": min(times),
+        "median_s": median,
+        "mean_s": statistics.fmean(times),
+        "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "ops": ops,
+        "ops_per_s": ops / median if median > 0 else None,
+    }
+    if counters:
+        result["counters"] = counters
+    return result
+
+
+# -----------------------------
+# Fizik
+# -----------------------------
+def _simulate_case(method, dt, max_steps):
+    def setup():
+        def run():
+            x, _, _, _, _, info = physics.simulate(POSITION0, VELOCITY0, dt=dt, max_steps=max_steps, method=method)
+            return {"steps": int(info["steps"]), "nfev": int(info["nfev"]), "points": int(x.size)}
+        yield run
+    return setup
+
+
+for _method, _dt, _steps in (("rk4", 0.5, 2000), ("rk4", 0.5, 20000), ("rk4", 5.0, 2000), ("dopri5", 1.0, 2000)):
+    benchmark(f"physics.simulate[{_method},dt={_dt},max_steps={_steps}]")(_simulate_case(_method, _dt, _steps))
+
+
+@benchmark("physics.rk4_step", ops=10000)
+def _rk4_step():
+    def run():
+        pos, vel = POSITION0, VELOCITY0
+        for _ in range(10000):
+            pos, vel = physics.rk4_step(pos, vel, 0.5)
+    yield run
+
+
+@benchmark("physics.rk4_step_batch[n=1024]", ops=100 * 1024)
+def _rk4_step_batch():
+    rng = np.random.default_rng(0)
+    positions = POSITION0 + rng.normal(0, 1e5, (1024, 3))
+    velocities = VELOCITY0 + rng.normal(0, 10, (1024, 3))
+
+    def run():
+        pos, vel = positions, velocities
+        for _ in range(100):
+            pos, vel = physics.rk4_step_batch(pos, vel, 0.5)
+    yield run
+
+
+# -----------------------------
+# NEO feed
+# -----------------------------
+def _fixture_neos(count):
+    """Kayıtlı feed fikstürü; id'ler değiştirilerek count kayda çoğaltılır."""
+    with open(FIXTURE_PATH) as f:
+        feed = json.load(f)
+    base = [neo for day in sorted(feed["near_earth_objects"]) for neo in feed["near_earth_objects"][day]]
+    neos = []
+    for i in range(count):
+        neo = copy.deepcopy(base[i % len(base)])
+        neo["id"] = f"{neo['id']}{i // len(base):04d}"
+        neos.append(neo)
+    return neos
+
+
+@benchmark("neo.calculate_asteroid_velocity[n=1000]", ops=1000)
+def _velocity_scalar():
+    import asteroid_backend
+
+    neos = _fixture_neos(1000)
+    np.random.seed(0)
+    yield lambda: [asteroid_backend.calculate_asteroid_velocity(neo) for neo in neos]
+
+
+@benchmark("neo.calculate_asteroid_velocity_batch[n=1000]", ops=1000)
+def _velocity_batch():
+    import asteroid_backend
+
+    neos = _fixture_neos(1000)
+    yield lambda: asteroid_backend.calculate_asteroid_velocity_batch(neos)
+
+
+# -----------------------------
+# API (işlem içi ASGI istemcisi)
+# -----------------------------
+@contextlib.contextmanager
+def _api_client():
+    import httpx
+    import asteroid_backend
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=asteroid_backend.app), base_url="http://bench")
+
+    def post(path, body, cold):
+        if cold:
+            asteroid_backend.response_cache.clear()
+        response = loop.run_until_complete(client.post(path, json=body))
+        response.raise_for_status()
+
+    try:
+        yield post
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+def _api_case(path, body, cold):
+    def setup():
+        with _api_client() as post:
+            yield lambda: post(path, body, cold)
+    return setup
+
+
+_SIMULATE_BODY = {"diameter_km": 0.3, "velocity_km_s": 17, "impact_angle": 45,
+                  "impact_latitude": 35.7, "impact_longitude": -220.3}
+_MITIGATE_BODY = {"diameter_km": 0.3, "velocity_km_s": 17, "years_before_impact": 5, "method": "kinetic_impactor"}
+for _path, _body in (("/api/simulate", _SIMULATE_BODY), ("/api/mitigate", _MITIGATE_BODY)):
+    for _cold in (True, False):
+        benchmark(f"api.{_path.rsplit('/', 1)[1]}[{'cold' if _cold else 'cached'}]")(_api_case(_path, _body, _cold))
+
+
+# -----------------------------
+# Koşucu
+# -----------------------------
+def check(results, thresholds, baseline=None):
+    """Eşik ve (varsa) önceki sonuçlarla karşılaştırma; gerileme listesi döndürür."""
+    regressions = []
+    default_ratio = thresholds.get("default_max_ratio")
+    for name, result in results.items():
+        limits = thresholds.get("benchmarks", {}).get(name, {})
+        max_median = limits.get("max_median_s")
+        if max_median is not None and result["median_s"] > max_median:
+            regressions.append({"benchmark": name, "metric": "median_s", "value": result["median_s"], "limit": max_median})
+        for counter, limit in limits.get("max_counters", {}).items():
+            value = result.get("counters", {}).get(counter)
+            if value is not None and value > limit:
+                regressions.append({"benchmark": name, "metric": counter, "value": value, "limit": limit})
+        previous = (baseline or {}).get(name)
+        max_ratio = limits.get("max_ratio", default_ratio)
+        if previous and max_ratio is not None:
+            ratio = result["median_s"] / previous["median_s"]
+            if ratio > max_ratio:
+                regressions.append({"benchmark": name, "metric": "median_ratio", "value": ratio, "limit": max_ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the physics and API hot paths")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="run benchmarks whose name contains this")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="earlier results JSON to compare medians against")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimum measured time per benchmark (s)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if not args.filter or any(f in b[0] for f in args.filter)]
+    if args.list:
+        print("\n".join(name for name, _, _ in selected))
+        return 0
+
+    results = {}
+    for name, setup, ops in selected:
+        gen = setup()
+        try:
+            times, counters = measure(next(gen), min_time=args.min_time)
+        finally:
+            gen.close()
+        results[name] = summarize(times, ops, counters)
+        r = results[name]
+        print(f"{name:<52} median {r['median_s'] * 1e3:10.3f} ms  min {r['min_s'] * 1e3:10.3f} ms  "
+              f"{r['ops_per_s']:12.1f} ops/s  ({r['rounds']} rounds)")
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = check(results, thresholds, baseline)
+    for item in regressions:
+        print(f"REGRESSION {item['benchmark']}: {item['metric']} {item['value']:.6g} > {item['limit']:.6g}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
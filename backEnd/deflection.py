@@ -0,0 +1,210 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+import physics
+
+DIRECTIONS = ("along_track", "anti_track", "radial", "normal")
+SIM_DEFAULTS = {
+    "dt": 1.0,
+    "max_steps": 200000,
+    "method": "dopri5",
+    "escape_radius": physics.R_EARTH * 100,
+    "t_max": 48 * 3600.0,
+}
+CACHE_SIZE = int(os.getenv("DEFLECTION_CACHE_SIZE", "32"))
+
+
+def delta_v_vector(pos, vel, magnitude, direction="along_track"):
+    """Hız değişimini yörünge çerçevesinde yönlendirir (m/s)."""
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown deflection direction '{direction}', expected one of {DIRECTIONS}")
+    if direction in ("along_track", "anti_track"):
+        axis = vel if direction == "along_track" else -vel
+    elif direction == "radial":
+        axis = pos
+    else:
+        axis = np.cross(pos, vel)
+    norm = np.linalg.norm(axis)
+    # Sıfır hız/konum (ya da r ∥ v iken normal) yönü tanımsız bırakır; bölme NaN üretirdi
+    if norm == 0:
+        raise ValueError(f"Deflection direction '{direction}' is undefined for this state")
+    return magnitude * (axis / norm)
+
+
+def _radial_rate(p, v):
+    return float(p @ v)
+
+
+def closest_approach(traj, tol=1e-6):
+    """
+    En yakın geçiş: (merkeze uzaklık m, zaman s). En küçük örneğin yanındaki adımda
+    r·v işaret değiştiriyorsa geçiş anı, adım başından yeniden entegre edilerek
+    Illinois yöntemiyle bulunur (örnekleme aralığından bağımsız sonuç).
+    """
+    pos, vel, t = traj["pos"], traj["vel"], traj["t"]
+    r = np.linalg.norm(pos, axis=1)
+    i = int(np.argmin(r))
+    rate = _radial_rate(pos[i], vel[i])
+    if rate > 0 and i > 0:
+        lo = i - 1
+    elif rate < 0 and i < r.size - 1:
+        lo = i
+    else:
+        return float(r[i]), float(t[i])
+
+    p0, v0, a0 = pos[lo], vel[lo], traj["acc"][lo]
+    h = float(t[lo + 1] - t[lo])
+    step = lambda hh: physics.dopri5_step(p0, v0, hh, a0)[:2]
+    a, b = 0.0, h
+    f_a, f_b = _radial_rate(p0, v0), _radial_rate(pos[lo + 1], vel[lo + 1])
+    best = (float(r[i]), float(t[i]))
+    side = 0
+    for _ in range(60):
+        if b - a <= tol * max(h, 1.0) or f_b == f_a:
+            break
+        m = (a * f_b - b * f_a) / (f_b - f_a)
+        p_m, v_m = step(m)
+        f_m = _radial_rate(p_m, v_m)
+        best = min(best, (float(np.linalg.norm(p_m)), float(t[lo] + m)))
+        if f_m > 0:
+            b, f_b = m, f_m
+            if side == 1:
+                f_a /= 2
+            side = 1
+        else:
+            a, f_a = m, f_m
+            if side == -1:
+                f_b /= 2
+            side = -1
+    return best
+
+
+def perigee_radius(pos, vel):
+    """İki cisim modelinde oskülatör yörüngenin yer merkezine en yakın noktası (m)."""
+    mu = physics.MU
+    h2 = float(np.sum(np.cross(pos, vel)**2))
+    energy = 0.5 * float(vel @ vel) - mu / float(np.linalg.norm(pos))
+    e = np.sqrt(max(0.0, 1 + 2 * energy * h2 / mu**2))
+    return h2 / (mu * (1 + e))
+
+
+def _closest(traj, info):
+    # Çarpan yollar arasında karşılaştırma için yüzeyin altındaki sanal perige kullanılır; yanıtta yüzey (0 km) raporlanır
+    if info["crashed"]:
+        return perigee_radius(traj["pos"][-1], traj["vel"][-1]), float(traj["t"][-1])
+    return closest_approach(traj)
+
+
+def _altitude_km(info, distance):
+    # Çarpan yolun en yakın geçişi yüzeydir; sanal perige (negatif irtifa) dışarı verilmez
+    return 0.0 if info["crashed"] else round((distance - physics.R_EARTH) / 1000, 3)
+
+
+def _summary(info, distance, time):
+    return {
+        "crashed": info["crashed"],
+        "impacted": info["crashed"],
+        "escaped": info["escaped"],
+        "closest_approach_km": _altitude_km(info, distance),
+        "closest_approach_time_s": round(time, 3),
+        "impact": info["impact"],
+    }
+
+
+class DeflectionSimulator:
+    """
+    Kinetic impactor sapmasını yörünge üzerinde yeniden entegre eder.
+    Çarpan yollarda en yakın geçiş yüzeydir (0 km, impacted); dallar arası seçimde çarpma anındaki sanal perige kullanılır.
+    Sapmasız (baseline) yörünge başlangıç durumu ve entegrasyon ayarlarıyla anahtarlanan
+    bir LRU önbelleğinde tutulur; her sorguda yalnızca delta_v uygulandıktan sonraki dal entegre edilir.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._baselines = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def baseline(self, position0, velocity0, sim_kwargs):
+        """(yörünge, durum, r önek minimumu) döndürür. Dönen diziler paylaşılır, değiştirilmemelidir."""
+        key = (tuple(np.asarray(position0, dtype=float)), tuple(np.asarray(velocity0, dtype=float)),
+               tuple(sorted(sim_kwargs.items())))
+        entry = self._baselines.get(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            self._baselines.move_to_end(key)
+            return entry
+
+        self.stats["misses"] += 1
+        traj, info = physics.simulate_trajectory(position0, velocity0, **sim_kwargs)
+        r = np.linalg.norm(traj["pos"], axis=1)
+        # Dal noktasına kadarki en yakın geçiş için önek minimumu
+        entry = (traj, info, np.minimum.accumulate(r))
+        self._baselines[key] = entry
+        while len(self._baselines) > self.max_entries:
+            self._baselines.popitem(last=False)
+        return entry
+
+    def deflect(self, position0, velocity0, delta_v, lead_time, direction="along_track", sim_kwargs=None):
+        """
+        delta_v (m/s), baseline yolun sonundan (çarpma ya da ufuk) lead_time saniye önceki satıra uygulanır.
+        Yol lead_time'dan kısaysa (ör. yıllar mertebesinde öncelik, saatler mertebesinde t_max) başlangıç
+        durumuna uygulanır; yanıttaki lead_time_clamped bunu, lead_time_s uygulanan gerçek süreyi bildirir.
+        Dönüş: baseline ve saptırılmış yol için en yakın geçiş, çarpma ve kaçınma bilgisi.
+        """
+        sim_kwargs = dict(SIM_DEFAULTS, **(sim_kwargs or {}))
+        traj, info, prefix_min = self.baseline(position0, velocity0, sim_kwargs)
+        base_distance, base_time = _closest(traj, info)
+
+        end_time = float(traj["t"][-1])
+        apply_time = max(0.0, end_time - lead_time)
+        k = max(0, int(np.searchsorted(traj["t"], apply_time, side="right")) - 1)
+        t_apply = float(traj["t"][k])
+        pos_k, vel_k = traj["pos"][k], traj["vel"][k]
+        dv = delta_v_vector(pos_k, vel_k, delta_v, direction)
+
+        branch_kwargs = dict(sim_kwargs, max_steps=max(1, sim_kwargs["max_steps"] - k))
+        if sim_kwargs.get("t_max") is not None:
+            branch_kwargs["t_max"] = sim_kwargs["t_max"] - t_apply
+        branch, branch_info = physics.simulate_trajectory(pos_k, vel_k + dv, **branch_kwargs)
+        branch_distance, branch_time = _closest(branch, branch_info)
+        branch_time += t_apply
+        if branch_info["impact"] is not None:
+            branch_info = dict(branch_info, impact=dict(branch_info["impact"], time=branch_info["impact"]["time"] + t_apply))
+
+        # Dal noktasına kadarki kısım baseline ile aynıdır: baseline'ın en yakın geçişi o kısımdaysa aynen geçerlidir
+        if base_time <= t_apply:
+            before = (base_distance, base_time)
+        else:
+            before = (float(prefix_min[k]), float(traj["t"][int(np.argmin(prefix_min[:k + 1]))]))
+        deflected_distance, deflected_time = min(before, (branch_distance, branch_time))
+
+        return {
+            "applied_at_s": round(t_apply, 3),
+            "lead_time_s": round(end_time - t_apply, 3),
+            "lead_time_clamped": lead_time > end_time,
+            "delta_v_vector_m_s": np.round(dv, 6).tolist(),
+            "baseline": _summary(info, base_distance, base_time),
+            "deflected": _summary(branch_info, deflected_distance, deflected_time),
+            "closest_approach_change_km": round(
+                _altitude_km(branch_info, deflected_distance) - _altitude_km(info, base_distance), 3),
+            "impact_avoided": info["crashed"] and not branch_info["crashed"],
+            "force_evaluations": branch_info["nfev"],
+        }
+
+
+_default_simulator = None
+
+
+def default_simulator():
+    """Süreç başına tek simülatör; havuz işçilerinde her işçi kendi baseline önbelleğini tutar."""
+    global _default_simulator
+    if _default_simulator is None:
+        _default_simulator = DeflectionSimulator(max_entries=CACHE_SIZE)
+    return _default_simulator
+
+
+def simulate_deflection(position0, velocity0, delta_v, lead_time, direction="along_track", sim_kwargs=None):
+    """default_simulator().deflect; süreç havuzuna gönderilebilen üst düzey fonksiyon."""
+    return default_simulator().deflect(position0, velocity0, delta_v, lead_time, direction, sim_kwargs)
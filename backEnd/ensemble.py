@@ -0,0 +1,172 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+import physics
+import land_mask
+
+MEGATON_J = physics.MEGATON_TNT_J
+ESCAPE_RADIUS = physics.R_EARTH * 100
+# Yörüngede kalan (çarpmayan, kaçmayan) örnekler için varsayılan süre sınırı
+HORIZON_S = 86400.0
+
+
+def sample_initial_states(position0, velocity0, samples, diameter_min_m, diameter_max_m,
+                          velocity_sigma=0.0, position_sigma=0.0, seed=None):
+    """
+    Nominal durum etrafında bozulmuş başlangıç durumları üretir.
+    Tüm rastgele sayılar tek bir üreteçten çekilir; sonuç işçi sayısından bağımsızdır.
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.asarray(position0, dtype=float) + rng.normal(0.0, position_sigma, (samples, 3))
+    velocities = np.asarray(velocity0, dtype=float) + rng.normal(0.0, velocity_sigma, (samples, 3))
+    diameters = rng.uniform(diameter_min_m, diameter_max_m, samples)
+    return positions, velocities, diameters
+
+
+def propagate_chunk(positions, velocities, sim_kwargs):
+    """
+    Bir grup başlangıç durumunu tek bir toplu yayılımla entegre eder (işçi süreçte çalışır).
+    Dönüş: (n, 6) dizi -> crashed, zaman, enlem, boylam, hız (km/s), açı (derece); çarpmayanlarda NaN.
+    """
+    result = physics.simulate_batch(positions, velocities, **sim_kwargs)
+    impact = result['impact']
+    return np.column_stack((
+        result['crashed'].astype(float),
+        impact['time'],
+        impact['latitude'],
+        impact['longitude'],
+        impact['velocity'],
+        impact['angle'],
+    ))
+
+
+def _interval(values, confidence):
+    if values.size == 0:
+        return None
+    lo, mid, hi = np.percentile(values, [50 * (1 - confidence), 50, 50 * (1 + confidence)])
+    return {"low": float(lo), "median": float(mid), "high": float(hi), "mean": float(values.mean())}
+
+
+def wilson_interval(successes, n, confidence):
+    """Binom oranı için Wilson skor aralığı."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def summarize(results, diameters, density, confidence=0.95, bin_deg=5.0):
+    """Olasılık, çarpma noktası dağılımı ve güven aralıkları."""
+    n = len(results)
+    hit = results[:, 0] == 1.0
+    impacts = int(hit.sum())
+    low, high = wilson_interval(impacts, n, confidence)
+
+    summary = {
+        "samples": n,
+        "impacts": impacts,
+        "impact_probability": impacts / n if n else 0.0,
+        "probability_interval": {"low": low, "high": high},
+        "confidence": confidence,
+        "impact_points": None,
+        "impact_time_s": None,
+        "impact_velocity_km_s": None,
+        "impact_angle_deg": None,
+        "energy_megatons": None,
+        "ocean_impact_fraction": None,
+    }
+    if not impacts:
+        return summary
+
+    times, lats, lons, speeds, angles = results[hit, 1:].T
+    lons = (lons + 180) % 360 - 180
+
+    # Boylam için dairesel ortalama; yüzdelikler ortalamaya göre sarılmış farklarla hesaplanır
+    mean_lon = math.degrees(math.atan2(np.sin(np.radians(lons)).mean(), np.cos(np.radians(lons)).mean()))
+    lon_offsets = (lons - mean_lon + 180) % 360 - 180
+    lon_interval = _interval(lon_offsets, confidence)
+    for key in ("low", "median", "high", "mean"):
+        lon_interval[key] = (lon_interval[key] + mean_lon + 180) % 360 - 180
+
+    lat_edges = np.arange(-90, 90 + bin_deg, bin_deg)
+    lon_edges = np.arange(-180, 180 + bin_deg, bin_deg)
+    counts, _, _ = np.histogram2d(lats, lons, bins=(lat_edges, lon_edges))
+    rows, cols = np.nonzero(counts)
+    cells = [[float(lat_edges[r] + bin_deg / 2), float(lon_edges[c] + bin_deg / 2), int(counts[r, c])]
+             for r, c in zip(rows, cols)]
+
+    mass = (4/3) * math.pi * (diameters[hit] / 2)**3 * density
+    megatons = 0.5 * mass * (speeds * 1000)**2 / MEGATON_J
+
+    summary.update({
+        "impact_points": {
+            "latitude": _interval(lats, confidence),
+            "longitude": lon_interval,
+            "histogram": {"bin_deg": bin_deg, "cells": cells},
+        },
+        "impact_time_s": _interval(times, confidence),
+        "impact_velocity_km_s": _interval(speeds, confidence),
+        "impact_angle_deg": _interval(angles, confidence),
+        "energy_megatons": _interval(megatons, confidence),
+        "ocean_impact_fraction": float(land_mask.default_mask().is_ocean(lats, lons).mean()),
+    })
+    return summary
+
+
+def split_chunks(position0, velocity0, samples, diameter_min_m, diameter_max_m, velocity_sigma=0.0,
+                 position_sigma=0.0, seed=None, workers=None, sim_kwargs=None):
+    """
+    Örnekleri üretip parçalara böler. Dönüş: propagate_chunk argüman demetleri, çaplar ve
+    varsayılanlarla tamamlanmış sim_kwargs. Parçalar herhangi bir havuzda çalıştırılıp combine'a verilir.
+    """
+    sim_kwargs = dict({"method": "dopri5", "dt": 1.0, "max_steps": 20000, "escape_radius": ESCAPE_RADIUS,
+                       "t_max": HORIZON_S}, **(sim_kwargs or {}))
+    positions, velocities, diameters = sample_initial_states(
+        position0, velocity0, samples, diameter_min_m, diameter_max_m, velocity_sigma, position_sigma, seed
+    )
+
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(1, min(samples, workers * 4))
+    bounds = np.linspace(0, samples, n_chunks + 1).astype(int)
+    chunks = [(positions[a:b], velocities[a:b], sim_kwargs) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    return chunks, diameters, sim_kwargs
+
+
+def combine(parts, diameters, sim_kwargs, density=3000, confidence=0.95):
+    summary = summarize(np.concatenate(parts), diameters, density, confidence)
+    summary["horizon_s"] = sim_kwargs["t_max"]
+    return summary
+
+
+def run_ensemble(position0, velocity0, samples, diameter_min_m, diameter_max_m, velocity_sigma=0.0,
+                 position_sigma=0.0, density=3000, seed=None, confidence=0.95, workers=None, executor=None,
+                 sim_kwargs=None):
+    """
+    Monte Carlo çarpma olasılığı. Örnekler parçalara bölünüp süreç havuzunda toplu olarak entegre edilir;
+    executor verilmezse workers (varsayılan: çekirdek sayısı) kadar süreçli geçici bir havuz açılır.
+    Aynı seed her işçi sayısında aynı sonucu verir.
+    """
+    chunks, diameters, sim_kwargs = split_chunks(
+        position0, velocity0, samples, diameter_min_m, diameter_max_m, velocity_sigma, position_sigma, seed,
+        workers, sim_kwargs
+    )
+
+    if executor is None and (workers or os.cpu_count() or 1) == 1:
+        parts = [propagate_chunk(*chunk) for chunk in chunks]
+    elif executor is None:
+        # spawn: sunucu iş parçacıklarını fork etmemek için
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(propagate_chunk, *zip(*chunks)))
+    else:
+        parts = list(executor.map(propagate_chunk, *zip(*chunks)))
+
+    return combine(parts, diameters, sim_kwargs, density, confidence)
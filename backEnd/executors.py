@@ -0,0 +1,200 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+# Kuyruk dolduğunda istemciye önerilen bekleme (s)
+RETRY_AFTER_S = 1
+
+
+class Executors:
+    """
+    İşleyicilerin CPU ağırlıklı işleri (süreç havuzu) ve engelleyici G/Ç'yi (iş parçacığı havuzu)
+    olay döngüsünün dışına taşıdığı katman. Havuzlar ilk kullanımda açılır; uygulama lifespan'ında
+    start() ile önceden açılıp shutdown() ile kapatılır.
+
+    Kuyruk derinliği istek başınadır: havuzda bekleyen ya da çalışan istek sayısı sınıra ulaşmışsa yeni
+    istek beklemeye alınmaz, 503 (Retry-After) ile hemen reddedilir. Çok parçalı işlerin (ensemble)
+    parçaları, tüm istekler toplamında en fazla bulk_workers (cpu_workers - 1) işçiyi kullanır; böylece
+    birden çok ensemble aynı anda çalışırken de tekil yörünge işleri için bir işçi boş kalır
+    (cpu_workers 1 ise ayrılacak işçi yoktur). request verilirse istemci bağlantıyı kestiğinde henüz
+    başlamamış parçalar iptal edilir.
+    """
+
+    def __init__(self, cpu_workers=None, cpu_queue_depth=None, io_workers=None, io_queue_depth=None):
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.cpu_queue_depth = cpu_queue_depth or 4 * self.cpu_workers
+        self.io_workers = io_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.io_queue_depth = io_queue_depth or 4 * self.io_workers
+        self.bulk_workers = max(1, self.cpu_workers - 1)
+        self._bulk_slots = None
+        self._bulk_running = 0
+        self._cpu = None
+        self._io = None
+        self._in_flight = {"cpu": 0, "io": 0}
+
+    def _process_pool(self):
+        if self._cpu is None:
+            # spawn: sunucu iş parçacıklarını fork etmemek için
+            self._cpu = ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._cpu
+
+    def _thread_pool(self):
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+        return self._io
+
+    def start(self):
+        """Havuzları açar; iş parçacığı havuzu asyncio.to_thread çağrılarının da varsayılanı olur."""
+        self._process_pool()
+        asyncio.get_running_loop().set_default_executor(self._thread_pool())
+
+    def shutdown(self):
+        if self._cpu is not None:
+            self._cpu.shutdown(wait=True, cancel_futures=True)
+            self._cpu = None
+        if self._io is not None:
+            self._io.shutdown(wait=False, cancel_futures=True)
+            self._io = None
+        self._bulk_slots = None
+
+    def stats(self):
+        return {
+            "cpu_workers": self.cpu_workers,
+            "cpu_in_flight": self._in_flight["cpu"],
+            "cpu_queue_depth": self.cpu_queue_depth,
+            "bulk_workers": self.bulk_workers,
+            "bulk_running": self._bulk_running,
+            "io_workers": self.io_workers,
+            "io_in_flight": self._in_flight["io"],
+            "io_queue_depth": self.io_queue_depth,
+        }
+
+    def _acquire(self, kind, limit):
+        # Sayaç yalnızca olay döngüsü iş parçacığında değişir; kilit gerekmez
+        if self._in_flight[kind] >= limit:
+            raise HTTPException(status_code=503, detail=f"Server busy: {kind} queue is full",
+                                headers={"Retry-After": str(RETRY_AFTER_S)})
+        self._in_flight[kind] += 1
+
+    def _release(self, kind):
+        self._in_flight[kind] -= 1
+
+    @contextlib.contextmanager
+    def _admit(self, kind, limit):
+        self._acquire(kind, limit)
+        try:
+            yield
+        finally:
+            self._release(kind)
+
+    def reserve_cpu(self):
+        """
+        Yanıt gövdesi sürerken çalışan işler (akışlar) için CPU kuyruğunda yer ayırır: kuyruk doluysa
+        yanıt başlamadan 503 verilir. Yeri bırakan fonksiyonu döndürür; arada run_reserved ile gönderilen
+        parçalar yeniden kabulden geçmez. Dönen fonksiyon birden çok kez çağrılabilir, yer yalnızca bir kez
+        bırakılır (ör. hem akışın finally'si hem yanıtın arka plan görevi).
+        """
+        self._acquire("cpu", self.cpu_queue_depth)
+        held = [True]
+
+        def release():
+            if held:
+                held.clear()
+                self._release("cpu")
+
+        return release
+
+    async def run_reserved(self, fn):
+        """reserve_cpu ile yer ayrılmışken argümansız bir çağrıyı süreç havuzunda çalıştırır."""
+        return (await self._map(fn, [()], None))[0]
+
+    async def map_cpu(self, fn, args, request=None):
+        """fn(*a) çağrılarını args'taki her demet için süreç havuzunda çalıştırır; sonuçlar sırayla döner."""
+        with self._admit("cpu", self.cpu_queue_depth):
+            return await self._map(fn, list(args), request)
+
+    async def _run_bulk(self, pool, fn, args):
+        # Çok parçalı işlerin parçaları ortak bulk_workers sınırını bekler; iptal edilirse havuzdaki iş de iptal olur
+        if self._bulk_slots is None:
+            # Semafor ilk kullanıldığı olay döngüsüne bağlanır; shutdown() ile sıfırlanır
+            self._bulk_slots = asyncio.Semaphore(self.bulk_workers)
+        async with self._bulk_slots:
+            self._bulk_running += 1
+            try:
+                return await asyncio.wrap_future(pool.submit(fn, *args))
+            finally:
+                self._bulk_running -= 1
+
+    async def _map(self, fn, args, request):
+        results = [None] * len(args)
+        pending = {}
+        bulk = len(args) > 1
+        pool = self._process_pool()
+        disconnect = asyncio.ensure_future(_wait_for_disconnect(request)) if request is not None else None
+        submitted = 0
+        try:
+            while submitted < len(args) or pending:
+                while submitted < len(args) and len(pending) < self.bulk_workers:
+                    if bulk:
+                        future = asyncio.ensure_future(self._run_bulk(pool, fn, args[submitted]))
+                    else:
+                        future = asyncio.wrap_future(pool.submit(fn, *args[submitted]))
+                    pending[future] = submitted
+                    submitted += 1
+                waiting = set(pending) | ({disconnect} if disconnect is not None else set())
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if disconnect in done:
+                    # nginx'in 499'u: yanıtı okuyacak istemci kalmadı, ölçümlerde ayrı görünür
+                    raise HTTPException(status_code=499, detail="Client closed request")
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        except BrokenProcessPool:
+            # Bir işçi öldüyse havuz kullanılamaz: kalan işçileri ve yönetici iş parçacığını beklemeden kapat,
+            # sonraki istek yenisini açar. Eşzamanlı bir istek havuzu zaten yenilediyse yenisine dokunulmaz
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self._cpu is pool:
+                self._cpu = None
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+            if disconnect is not None:
+                disconnect.cancel()
+        return results
+
+    async def run_cpu(self, fn, request=None):
+        """Argümansız (ör. functools.partial) bir çağrıyı süreç havuzunda çalıştırır."""
+        return (await self.map_cpu(fn, [()], request))[0]
+
+    async def run_io(self, fn, *args):
+        """Engelleyici çağrıyı iş parçacığı havuzunda çalıştırır (span'ler için contextvars taşınır)."""
+        with self._admit("io", self.io_queue_depth):
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(self._thread_pool(), context.run, fn, *args)
+
+
+async def _wait_for_disconnect(request):
+    # Gövde okunduktan sonra receive() ancak istemci ayrıldığında (http.disconnect) döner
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+def _env_int(name):
+    return int(os.getenv(name, "0")) or None
+
+
+def from_env():
+    """CPU_WORKERS, CPU_QUEUE_DEPTH, IO_WORKERS, IO_QUEUE_DEPTH ortam değişkenlerinden (0/boş: varsayılan)."""
+    return Executors(
+        cpu_workers=_env_int("CPU_WORKERS"),
+        cpu_queue_depth=_env_int("CPU_QUEUE_DEPTH"),
+        io_workers=_env_int("IO_WORKERS"),
+        io_queue_depth=_env_int("IO_QUEUE_DEPTH"),
+    )
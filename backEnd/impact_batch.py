@@ -0,0 +1,85 @@
+import numpy as np
+
+import land_mask
+import physics
+import population
+from physics.effects import (
+    blast_radius_np, crater_diameter_np, kinetic_energy_np, seismic_magnitude_np, sphere_mass_np, thermal_radius_np,
+)
+
+# /api/simulate/batch hesabı: süreç havuzu işçileri yalnızca bu modülü (ve fizik/ızgara bağımlılıklarını) yükler,
+# FastAPI uygulamasını değil. Girdiler uç noktada doğrulanmış ve varsayılanlarla doldurulmuş kolonlardır.
+
+
+def tsunami_risk_np(latitude, longitude, earthquake_magnitude):
+    ocean = land_mask.default_mask().is_ocean(latitude, longitude)
+    risk = np.select([earthquake_magnitude > 7.6, earthquake_magnitude > 6.8], ["high", "moderate"], "low")
+    return np.where(ocean, risk, "low")
+
+
+def severity_np(megatons):
+    return np.select(
+        [megatons > 1e6, megatons > 1e3, megatons > 100],
+        ["Extinction Level Event", "Catastrophic Global Impact", "Severe Regional Impact"],
+        "Localized Impact",
+    )
+
+
+def _round_list(values, ndigits):
+    # Python round() ile yuvarla (np.round bazı sınır değerlerde farklı sonuç verir)
+    return [round(v, ndigits) for v in values.tolist()]
+
+
+def simulate_columns(diameter_km, velocity_km_s, impact_angle, impact_latitude, impact_longitude, density_kg_m3):
+    """/api/simulate hesaplarını kolon dizileri üzerinde tek geçişte yapar; yanıt sözlüğünü döndürür."""
+    diameter_m = np.asarray(diameter_km, dtype=float) * 1000
+    velocity_m_s = np.asarray(velocity_km_s, dtype=float) * 1000
+    angle = np.asarray(impact_angle, dtype=float)
+    latitude = np.asarray(impact_latitude, dtype=float)
+    longitude = np.asarray(impact_longitude, dtype=float)
+    density = np.asarray(density_kg_m3, dtype=float)
+
+    # Mass & energy
+    mass = sphere_mass_np(diameter_m, density)
+    E = kinetic_energy_np(mass, velocity_m_s)
+    megatons = E / physics.MEGATON_TNT_J
+    kilotons = megatons * 1000
+
+    # Calculations
+    crater_diam, crater_depth = crater_diameter_np(diameter_m, velocity_m_s, density, angle)
+    blast = blast_radius_np(E)
+    thermal = thermal_radius_np(E)
+    magnitude = seismic_magnitude_np(E)
+    tsunami = tsunami_risk_np(latitude, longitude, magnitude)
+    blast_exposed, thermal_exposed, casualties = population.exposure(latitude, longitude, blast, thermal)
+
+    return {
+        "count": int(diameter_m.size),
+        "impact_energy": {
+            "megatons": _round_list(megatons, 2),
+            "kilotons": _round_list(kilotons, 2)
+        },
+        "crater": {
+            "diameter_km": _round_list(crater_diam / 1000, 2),
+            "depth_km": _round_list(crater_depth / 10000, 2),
+            "airburst": (diameter_m <= 100).tolist()
+        },
+        "seismic": {
+            "magnitude": _round_list(magnitude, 1)
+        },
+        "damage_zones": {
+            "blast_radius_km": _round_list(blast, 1),
+            "thermal_radius_km": _round_list(thermal, 1),
+            "tsunami_risk": tsunami.tolist(),
+            "population_exposed": {
+                "blast": np.rint(blast_exposed).astype(np.int64).tolist(),
+                "thermal": np.rint(thermal_exposed).astype(np.int64).tolist()
+            },
+            "estimated_casualties": np.rint(casualties).astype(np.int64).tolist()
+        },
+        "comparison": {
+            "severity": severity_np(megatons).tolist(),
+            "hiroshima_equivalent": _round_list(megatons * 1000 / 15, 2)
+        },
+        "mass_kg": mass.tolist()
+    }
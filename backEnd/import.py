@@ -1,5 +1,6 @@
 import uvicorn
-from asteroid_backend import app
 
+# Uygulama string ile verilir: spawn işçileri bu dosyayı __mp_main__ olarak yeniden çalıştırdığında
+# asteroid_backend (FastAPI vb.) yüklenmez
 if __name__ == "__main__":
     uvicorn.run("asteroid_backend:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,269 @@
+import bisect
+import contextlib
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter as _Tally
+
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Yavaş istek profili (isteğe bağlı): PROFILE_SLOW_MS verilirse her istek örneklenir,
+# süresi eşiği aşanların yığınları PROFILE_DIR altına collapsed (flamegraph.pl / speedscope) biçiminde yazılır
+PROFILE_SLOW_MS = os.getenv("PROFILE_SLOW_MS")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    """Prometheus counter; etiket değerleri anahtar sözcük olarak verilir."""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount=1.0, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, key)} {value:g}" for key, value in items]
+        return lines
+
+
+class Histogram:
+    """Prometheus histogram; kovalar birikimsiz tutulur, çıktıda birikimli yazılır."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:.9g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time until the response completes",
+                             ("method", "route"))
+STAGE_DURATION = Histogram("request_stage_duration_seconds", "Time spent in named request stages", ("stage",))
+PROFILES_WRITTEN = Counter("slow_request_profiles_total", "Slow request profiles written to PROFILE_DIR")
+
+
+# -----------------------------
+# İstek içi aşamalar (span)
+# -----------------------------
+class RequestTiming:
+    def __init__(self):
+        self.stages = {}
+        # Profil örneklemesinde izlenecek iş parçacıkları (span açan thread'ler eklenir)
+        self.threads = {threading.get_ident()}
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def header(self, total):
+        parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current = contextvars.ContextVar("request_timing", default=None)
+
+
+@contextlib.contextmanager
+def span(name):
+    """
+    Bloğun süresini geçerli isteğin aşamalarına (Server-Timing) ve stage histogramına ekler.
+    Aynı ad birden çok kez açılırsa süreler toplanır. İstek dışında yalnızca histograma yazar.
+    """
+    timing = _current.get()
+    if timing is not None:
+        timing.threads.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timing is not None:
+            timing.add(name, elapsed)
+        STAGE_DURATION.observe(elapsed, stage=name)
+
+
+# -----------------------------
+# Örnekleyici profil
+# -----------------------------
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Sampler:
+    """
+    sys._current_frames() ile aralıklı yığın örneklemesi. İş parçacığı yalnızca profillenen
+    bir istek varken çalışır. Olay döngüsü istekler arasında paylaşıldığından eşzamanlı
+    isteklerin örnekleri birbirine karışabilir; tekil yavaş istekler için yeterince ayırt edicidir.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL_S):
+        self.interval = interval
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, threads):
+        stacks = _Tally()
+        with self._lock:
+            self._active[id(stacks)] = (threads, stacks)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+                self._thread.start()
+        return stacks
+
+    def stop(self, stacks):
+        with self._lock:
+            self._active.pop(id(stacks), None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.values())
+            frames = sys._current_frames()
+            for threads, stacks in active:
+                for ident in list(threads):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[_collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+_sampler = Sampler()
+
+
+def write_profile(stacks, method, route, seconds, directory=PROFILE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{method}-{slug}-{seconds * 1000:.0f}ms.folded")
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    PROFILES_WRITTEN.inc()
+    return path
+
+
+# -----------------------------
+# ASGI middleware
+# -----------------------------
+class TimingMiddleware:
+    """
+    Her HTTP isteği için aşama sürelerini toplar, yanıt başlığında Server-Timing olarak gönderir
+    ve istek sayaç/histogramlarını günceller. Saf ASGI: akış (streaming) yanıtları tamponlanmaz;
+    bu yanıtlarda Server-Timing ilk bayta kadar olan süreyi gösterir.
+    slow_ms verilirse istekler örneklenir ve eşiği aşanların profili diske yazılır.
+    """
+
+    def __init__(self, app, slow_ms=PROFILE_SLOW_MS, profile_dir=PROFILE_DIR):
+        self.app = app
+        self.slow_s = None if slow_ms in (None, "") else float(slow_ms) / 1000
+        self.profile_dir = profile_dir
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        stacks = _sampler.start(timing.threads) if self.slow_s is not None else None
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.header(time.perf_counter() - start))
+                # CORS tüm kökenlere açık; tarayıcının Server-Timing'i göstermesi için gerekli
+                headers.append("Timing-Allow-Origin", "*")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.inc(method=scope["method"], route=route, status=status)
+            REQUEST_DURATION.observe(elapsed, method=scope["method"], route=route)
+            if stacks is not None:
+                _sampler.stop(stacks)
+                if elapsed >= self.slow_s and stacks:
+                    path = write_profile(stacks, scope["method"], route, elapsed, self.profile_dir)
+                    logger.warning("Slow request %s %s took %.0f ms, profile written to %s",
+                                   scope["method"], route, elapsed * 1000, path)
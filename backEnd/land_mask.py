@@ -0,0 +1,106 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+# Kara/okyanus maskesi dosyası (little-endian):
+#   HEADER (16 bayt): magic, sürüm, ayrılmış, satır sayısı (enlem), sütun sayısı (boylam)
+#   veri: np.packbits ile bit paketlenmiş satırlar; satır 0 kuzey kutbu (90°), sütun 0 boylam -180°.
+#   Bit 1 = okyanus.
+HEADER = struct.Struct("<4sHHII")
+MAGIC = b"LMSK"
+VERSION = 1
+DEFAULT_PATH = os.getenv("LAND_MASK_PATH", os.path.join(os.path.dirname(__file__), "data", "land_mask.bin"))
+# Maske frontend'deki Dünya dokusunun specular haritasından üretilir (okyanuslar parlak)
+DEFAULT_TEXTURE = os.path.join(os.path.dirname(__file__), "..", "frontEnd", "src", "assets", "textures", "Earth",
+                               "8k_earth_specular_map.jpg")
+
+
+def normalize_longitude(longitude):
+    """Boylamı [-180, 180) aralığına getirir (impact_metadata boylamları (-360, 0] aralığındadır)."""
+    return (np.asarray(longitude, dtype=float) + 180.0) % 360.0 - 180.0
+
+
+class LandMask:
+    """Eşit açılı ızgarada bit paketli okyanus maskesi; sorgular O(1) indeksleme, dizi girdileri desteklenir."""
+
+    def __init__(self, bits, n_lat, n_lon):
+        if bits.size * 8 < n_lat * n_lon:
+            raise ValueError("Land mask data is shorter than its header declares")
+        self.bits = bits
+        self.n_lat = n_lat
+        self.n_lon = n_lon
+        self.resolution = 180.0 / n_lat
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Dosyayı bellek eşlemeli açar; yalnızca sorgulanan baytlar diskten okunur."""
+        with open(path, "rb") as f:
+            magic, version, _, n_lat, n_lon = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a land mask file")
+        bits = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size)
+        return cls(bits, n_lat, n_lon)
+
+    def is_ocean(self, latitude, longitude):
+        """Skaler girdide bool, dizi girdide bool dizisi döndürür."""
+        lat = np.asarray(latitude, dtype=float)
+        lon = normalize_longitude(longitude)
+        row = np.clip(((90.0 - lat) / self.resolution).astype(np.int64), 0, self.n_lat - 1)
+        col = ((lon + 180.0) / self.resolution).astype(np.int64) % self.n_lon
+        index = row * self.n_lon + col
+        ocean = (self.bits[index >> 3] >> (7 - (index & 7))) & 1
+        return ocean.astype(bool) if ocean.ndim else bool(ocean)
+
+    def is_land(self, latitude, longitude):
+        return np.logical_not(self.is_ocean(latitude, longitude))
+
+    def ocean_fraction(self):
+        ocean = np.unpackbits(np.asarray(self.bits))[:self.n_lat * self.n_lon].reshape(self.n_lat, self.n_lon)
+        # Hücre alanı enlemin kosinüsüyle orantılı
+        weights = np.cos(np.radians(90.0 - (np.arange(self.n_lat) + 0.5) * self.resolution))
+        return float((ocean * weights[:, None]).sum() / (weights.sum() * self.n_lon))
+
+
+def build_from_texture(texture_path, out_path, resolution=0.25, threshold=128):
+    """
+    Eşit açılı (equirectangular) specular dokusundan maske dosyası üretir.
+    Pillow yalnızca bu adımda gerekir; sunucu hazır dosyayı okur.
+    """
+    from PIL import Image
+
+    Image.MAX_IMAGE_PIXELS = None
+    n_lat, n_lon = int(round(180 / resolution)), int(round(360 / resolution))
+    with Image.open(texture_path) as image:
+        # BOX filtresi: her hücre kapsadığı piksellerin ortalaması
+        gray = np.asarray(image.convert("L").resize((n_lon, n_lat), Image.Resampling.BOX))
+    ocean = gray >= threshold
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, n_lat, n_lon))
+        f.write(np.packbits(ocean.ravel()).tobytes())
+    return LandMask.load(out_path)
+
+
+_default_mask = None
+
+
+def default_mask():
+    """Paketlenmiş maskeyi ilk kullanımda açar."""
+    global _default_mask
+    if _default_mask is None:
+        _default_mask = LandMask.load(DEFAULT_PATH)
+    return _default_mask
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the bit-packed land/ocean mask from an Earth specular map")
+    parser.add_argument("--texture", default=DEFAULT_TEXTURE)
+    parser.add_argument("--out", default=DEFAULT_PATH)
+    parser.add_argument("--resolution", type=float, default=0.25, help="cell size in degrees")
+    parser.add_argument("--threshold", type=int, default=128, help="specular value (0-255) treated as ocean")
+    args = parser.parse_args()
+    mask = build_from_texture(args.texture, args.out, args.resolution, args.threshold)
+    print(f"{args.out}: {mask.n_lat}x{mask.n_lon} cells, ocean fraction {mask.ocean_fraction():.3f}")
@@ -0,0 +1,88 @@
+import bisect
+
+import numpy as np
+
+from physics.constants import R_EARTH
+
+# /api/mitigate varsayılanları: tipik bir kinetic impactor 500 kg, 10 km/s, beta (momentum enhancement) 2.0
+IMPACTOR_MASS_KG = 500
+IMPACTOR_VELOCITY_M_S = 10000
+BETA = 2.0
+DENSITY_KG_M3 = 3000
+EARTH_RADIUS_KM = R_EARTH / 1000
+METHODS = ("kinetic_impactor", "gravity_tractor")
+
+# Formüller skaler ve dizi girdilerle aynı sırayla çalışır; /api/mitigate ve planlayıcı bunları paylaşır
+
+
+def _minimum(a, b):
+    # Skaler girdide Python min/max: /api/mitigate yanıtındaki tipler (ör. int 10, bool) değişmez
+    if np.ndim(a) == 0 and np.ndim(b) == 0:
+        return min(a, b)
+    return np.minimum(a, b)
+
+
+def _maximum(a, b):
+    if np.ndim(a) == 0 and np.ndim(b) == 0:
+        return max(a, b)
+    return np.maximum(a, b)
+
+
+def asteroid_mass(diameter_km):
+    radius_m = (diameter_km * 1000) / 2
+    volume_m3 = (4/3) * np.pi * (radius_m ** 3)
+    return volume_m3 * DENSITY_KG_M3
+
+
+def kinetic_impactor(mass_kg, years_before, impactor_mass=IMPACTOR_MASS_KG,
+                     impactor_velocity=IMPACTOR_VELOCITY_M_S, beta=BETA):
+    """Dönüş: (delta_v m/s, sapma km, başarı olasılığı %, maliyet milyar USD)"""
+    # Momentum korunumu ve beta faktörü
+    delta_v = beta * (impactor_mass * impactor_velocity) / mass_kg
+    # Yörünge sapması (basitleştirilmiş): Δr = Δv * t
+    deflection_distance_km = (delta_v * years_before * 365 * 24 * 3600) / 1000
+    success_probability = _minimum(95, years_before * 15 + deflection_distance_km / 1000)
+    cost = 0.5 + years_before * 0.1
+    return delta_v, deflection_distance_km, success_probability, cost
+
+
+def gravity_tractor(diameter_km, years_before):
+    """Dönüş: (gereken yıl, başarı olasılığı %, maliyet milyar USD)"""
+    required_years = _maximum(10, diameter_km * 5)
+    success_probability = _minimum(90, (years_before / required_years) * 100)
+    cost = years_before * 0.2
+    return required_years, success_probability, cost
+
+
+def pareto_front(objectives):
+    """
+    objectives: (n, 3) dizi, tüm sütunlar büyütülecek (küçültülecekler negatif verilir).
+    Hiçbir aday tarafından baskılanmayan satırların maskesi; eşit satırlardan yalnızca ilki tutulur.
+    Birinci amaca göre azalan sırada tarama: bir satırı yalnızca kendinden önce gelenler baskılayabilir;
+    önceki satırların (2., 3. amaç) merdiveni üzerinde ikili arama ile O(n log n) civarı.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim != 2 or objectives.shape[1] != 3:
+        raise ValueError("pareto_front expects an (n, 3) objective array")
+    unique, first = np.unique(objectives, axis=0, return_index=True)
+    order = np.lexsort((-unique[:, 2], -unique[:, 1], -unique[:, 0]))
+
+    # Merdiven: o2 artan, o3 azalan; o2 >= a olan ilk eleman bu aralıktaki en büyük o3'e sahiptir
+    stair_o2, stair_o3 = [], []
+    keep = np.zeros(len(unique), dtype=bool)
+    for i in order.tolist():
+        a, b = unique[i, 1], unique[i, 2]
+        pos = bisect.bisect_left(stair_o2, a)
+        if pos < len(stair_o2) and stair_o3[pos] >= b:
+            continue
+        keep[i] = True
+        # Yeni noktanın baskıladığı (o2 <= a, o3 <= b) merdiven basamaklarını çıkar
+        lo = pos
+        while lo > 0 and stair_o3[lo - 1] <= b:
+            lo -= 1
+        stair_o2[lo:pos] = [a]
+        stair_o3[lo:pos] = [b]
+
+    mask = np.zeros(len(objectives), dtype=bool)
+    mask[first[keep]] = True
+    return mask
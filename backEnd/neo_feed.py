@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import httpx
+
+# NASA feed tek çağrıda en fazla 7 gün döndürür
+FEED_MAX_DAYS = 7
+
+
+class RateLimited(Exception):
+    """NASA API 429 döndürdü; retry_after saniye boyunca yeni istek yapılmamalı."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"NASA API rate limit reached, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def _retry_after(response, default):
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except ValueError:
+        return default
+
+
+def split_range(start_date, end_date, days=FEED_MAX_DAYS):
+    """[start, end] aralığını en fazla `days` günlük parçalara böler."""
+    start, end = date.fromisoformat(str(start_date)), date.fromisoformat(str(end_date))
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=days - 1))
+        chunks.append((str(start), str(chunk_end)))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class NasaClient:
+    """
+    NASA NEO API için paylaşılan, bağlantı havuzlu async istemci.
+    start()/close() FastAPI yaşam döngüsüne bağlanır; start() çağrılmamışsa ilk istekte açılır.
+    Uzun aralıklar 7 günlük parçalar halinde, en fazla max_concurrency eşzamanlı istekle çekilir.
+    429 sonrası en fazla max_retry_wait (varsayılan: timeout) saniye beklenir; daha uzun bir
+    Retry-After istek açık tutulmadan hemen RateLimited olarak yükseltilir.
+    """
+
+    def __init__(self, base_url, api_key, max_concurrency=4, timeout=10, retries=3, backoff=1.0, transport=None,
+                 max_retry_wait=None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_wait = timeout if max_retry_wait is None else max_retry_wait
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        self._client = None
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, limits=self._limits, transport=self.transport
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_feed(self, start_date, end_date):
+        """Tek /feed çağrısı; 429 yanıtında Retry-After (yoksa üstel bekleme) kadar beklenip tekrar denenir."""
+        await self.start()
+        params = {"start_date": start_date, "end_date": end_date, "api_key": self.api_key}
+        for attempt in range(self.retries + 1):
+            async with self._semaphore:
+                response = await self._client.get("/feed", params=params)
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response.json()
+            wait = _retry_after(response, self.backoff * 2 ** attempt)
+            if attempt == self.retries or wait > self.max_retry_wait:
+                raise RateLimited(wait)
+            await asyncio.sleep(wait)
+
+    async def fetch_feed(self, start_date, end_date):
+        """[start, end] aralığını eşzamanlı 7 günlük çağrılarla çekip tek bir /feed yanıtında birleştirir."""
+        parts = await asyncio.gather(*(self._get_feed(a, b) for a, b in split_range(start_date, end_date)))
+        near_earth_objects = {}
+        for part in parts:
+            near_earth_objects.update(part.get("near_earth_objects", {}))
+        return {
+            "element_count": sum(len(neo_list) for neo_list in near_earth_objects.values()),
+            "near_earth_objects": dict(sorted(near_earth_objects.items())),
+        }
+
+
+class FeedCache:
+    """
+    Tarih aralığına göre anahtarlanan TTL önbelleği.
+    - ttl içinde: bellekten döner.
+    - ttl + stale_ttl içinde: eski değer hemen döner, yenileme arka planda yapılır.
+    - Aynı anahtar için eşzamanlı ıskalar tek bir upstream isteğinde birleştirilir.
+    - 429 sonrası bekleme süresince upstream'e gidilmez; varsa eski değer kullanılır.
+    - Başarısız yükleme error_ttl saniye boyunca anahtar için saklanır: kesinti sırasında her yeni
+      istek upstream zaman aşımını yeniden beklemez; eski değer varsa o, yoksa aynı hata hemen döner.
+    """
+
+    def __init__(self, loader, ttl=900, stale_ttl=6 * 3600, max_entries=64, error_ttl=30):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.error_ttl = error_ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._failures = {}
+        self._cooldown_until = 0.0
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "upstream_calls": 0, "errors": 0, "failed_fast": 0}
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._refresh(key)
+                return value
+
+        self.stats["misses"] += 1
+        try:
+            # shield: bekleyen istek iptal edilse de ortak yükleme devam eder
+            return await asyncio.shield(self._refresh(key))
+        except Exception:
+            if entry is not None:
+                return entry[0]
+            raise
+
+    def _refresh(self, key):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+        # Arka plan yenilemelerindeki hatalar "never retrieved" uyarısı üretmesin
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    async def _load(self, key):
+        now = time.monotonic()
+        remaining = self._cooldown_until - now
+        if remaining > 0:
+            raise RateLimited(remaining)
+        failure = self._failures.get(key)
+        if failure is not None and failure[1] > now:
+            self.stats["failed_fast"] += 1
+            raise failure[0].with_traceback(None)
+        self.stats["upstream_calls"] += 1
+        try:
+            value = await self.loader(*key)
+        except RateLimited as e:
+            self._cooldown_until = time.monotonic() + e.retry_after
+            raise
+        except Exception as e:
+            self._remember_failure(key, e)
+            raise
+
+        self._failures.pop(key, None)
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _remember_failure(self, key, error):
+        now = time.monotonic()
+        self._failures = {k: f for k, f in self._failures.items() if f[1] > now}
+        self._failures[key] = (error, now + self.error_ttl)
@@ -0,0 +1,233 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from neo_feed import FEED_MAX_DAYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS approaches (
+    neo_id TEXT NOT NULL,
+    approach_date TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    diameter_min_km REAL,
+    diameter_max_km REAL,
+    hazardous INTEGER NOT NULL,
+    velocity_km_s REAL,
+    miss_distance_km REAL,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (neo_id, approach_date)
+);
+CREATE INDEX IF NOT EXISTS idx_approaches_date ON approaches (approach_date, seq);
+CREATE INDEX IF NOT EXISTS idx_approaches_diameter ON approaches (diameter_max_km);
+CREATE INDEX IF NOT EXISTS idx_approaches_hazardous ON approaches (hazardous, approach_date);
+CREATE INDEX IF NOT EXISTS idx_approaches_miss ON approaches (miss_distance_km);
+CREATE TABLE IF NOT EXISTS synced_days (
+    day TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+SORT_COLUMNS = {
+    "date": "approach_date, seq",
+    "diameter": "diameter_max_km DESC",
+    "miss_distance": "miss_distance_km",
+    "velocity": "velocity_km_s DESC",
+}
+
+
+def _day(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _days(start, end):
+    day, end = _day(start), _day(end)
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class NeoStore:
+    """
+    NEO yakın geçiş kayıtlarının yerel SQLite kataloğu.
+    Hangi günlerin NASA feed'inden alındığı synced_days tablosunda tutulur;
+    yalnızca eksik günler yeniden çekilir. Son günler (recent_days) tahminler
+    güncellenebildiği için recent_ttl saniyeden eskiyse yeniden senkronize edilir.
+    Veritabanı dosyası nesne oluşturulurken değil, open() ile ya da ilk sorguda açılır;
+    modülü içe aktarmak (betikler, havuz işçileri) diske yazmaz.
+    """
+
+    def __init__(self, path, recent_days=2, recent_ttl=86400):
+        self.path = path
+        self.recent_days = recent_days
+        self.recent_ttl = recent_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        # Çağıran _lock'u tutar
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            with conn:
+                conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def open(self):
+        with self._lock:
+            self._db()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def missing_ranges(self, start, end, today=None):
+        """[start, end] içindeki eksik günleri en fazla FEED_MAX_DAYS günlük aralıklar olarak döndürür."""
+        today = _day(today or date.today())
+        with self._lock:
+            synced = dict(self._db().execute(
+                "SELECT day, synced_at FROM synced_days WHERE day BETWEEN ? AND ?",
+                (str(_day(start)), str(_day(end))),
+            ).fetchall())
+
+        now = time.time()
+        missing = []
+        for day in _days(start, end):
+            synced_at = synced.get(str(day))
+            recent = day >= today - timedelta(days=self.recent_days)
+            if synced_at is None or (recent and now - synced_at > self.recent_ttl):
+                missing.append(day)
+
+        ranges = []
+        for day in missing:
+            if ranges and day == ranges[-1][1] + timedelta(days=1) and (day - ranges[-1][0]).days < FEED_MAX_DAYS:
+                ranges[-1][1] = day
+            else:
+                ranges.append([day, day])
+        return [(str(a), str(b)) for a, b in ranges]
+
+    def ingest(self, feed, start, end):
+        """Bir /feed yanıtını kaydeder ve [start, end] günlerini senkronize olarak işaretler."""
+        rows = []
+        for approach_date, neo_list in feed.get("near_earth_objects", {}).items():
+            for seq, neo in enumerate(neo_list):
+                diameter = neo.get("estimated_diameter", {}).get("kilometers", {})
+                close_approach = (neo.get("close_approach_data") or [{}])[0]
+                rows.append((
+                    neo["id"],
+                    approach_date,
+                    seq,
+                    neo["name"],
+                    diameter.get("estimated_diameter_min"),
+                    diameter.get("estimated_diameter_max"),
+                    int(bool(neo.get("is_potentially_hazardous_asteroid", False))),
+                    _float(close_approach.get("relative_velocity", {}).get("kilometers_per_second")),
+                    _float(close_approach.get("miss_distance", {}).get("kilometers")),
+                    json.dumps(neo, separators=(",", ":")),
+                ))
+
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO approaches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO synced_days VALUES (?, ?)",
+                    [(str(day), now) for day in _days(start, end)],
+                )
+        return len(rows)
+
+    def sync(self, start, end, fetch, today=None):
+        """Eksik günleri fetch(start, end) ile çeker; çekilen aralık sayısını döndürür."""
+        ranges = self.missing_ranges(start, end, today)
+        for range_start, range_end in ranges:
+            self.ingest(fetch(range_start, range_end), range_start, range_end)
+        return len(ranges)
+
+    def feed(self, start, end):
+        """Kayıtları NASA /feed yanıtıyla aynı biçimde döndürür."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT approach_date, raw FROM approaches WHERE approach_date BETWEEN ? AND ? "
+                "ORDER BY approach_date, seq",
+                (str(_day(start)), str(_day(end))),
+            ).fetchall()
+        near_earth_objects = {}
+        for row in rows:
+            near_earth_objects.setdefault(row["approach_date"], []).append(json.loads(row["raw"]))
+        return {"element_count": len(rows), "near_earth_objects": near_earth_objects}
+
+    def query(self, start=None, end=None, min_diameter_km=None, max_diameter_km=None, hazardous=None,
+              max_miss_distance_km=None, sort="date", limit=100):
+        """Yerel indeksten tarih, boyut, tehlike ve ıskalama mesafesine göre filtreleme."""
+        clauses, params = [], []
+        for sql, value in (
+            ("approach_date >= ?", start and str(_day(start))),
+            ("approach_date <= ?", end and str(_day(end))),
+            ("diameter_max_km >= ?", min_diameter_km),
+            ("diameter_max_km <= ?", max_diameter_km),
+            ("hazardous = ?", None if hazardous is None else int(hazardous)),
+            ("miss_distance_km <= ?", max_miss_distance_km),
+        ):
+            if value is not None:
+                clauses.append(sql)
+                params.append(value)
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {tuple(SORT_COLUMNS)}")
+
+        sql = ("SELECT neo_id, approach_date, name, diameter_min_km, diameter_max_km, hazardous, "
+               "velocity_km_s, miss_distance_km FROM approaches")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {SORT_COLUMNS[sort]} LIMIT ?"
+        params.append(int(limit))
+
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+        return [
+            {
+                "id": row["neo_id"],
+                "name": row["name"],
+                "close_approach_date": row["approach_date"],
+                "diameter_min_km": row["diameter_min_km"],
+                "diameter_km": row["diameter_max_km"],
+                "is_potentially_hazardous": bool(row["hazardous"]),
+                "velocity_km_s": row["velocity_km_s"],
+                "miss_distance_km": row["miss_distance_km"],
+            }
+            for row in rows
+        ]
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_feed(fixture, start, end):
+    """Kayıtlı bir /feed yanıtından [start, end] aralığını döndürür (çevrimdışı test modu)."""
+    start, end = str(_day(start)), str(_day(end))
+    near_earth_objects = {
+        day: neo_list
+        for day, neo_list in fixture.get("near_earth_objects", {}).items()
+        if start <= day <= end
+    }
+    return {
+        "element_count": sum(len(neo_list) for neo_list in near_earth_objects.values()),
+        "near_earth_objects": near_earth_objects,
+    }
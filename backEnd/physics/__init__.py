@@ -0,0 +1,42 @@
+"""
+Ortak fizik çekirdeği: sabitler, kütle çekimi, koordinat dönüşümleri, entegratörler ve çarpma etkileri.
+Paket içe aktarılırken hiçbir alt modül yüklenmez; `physics.simulate_trajectory` gibi bir ada
+ilk erişimde yalnızca ilgili alt modül (ve bağımlılıkları) yüklenir. Böylece havuz işçileri ve
+betikler kullanmadıkları modüllerin açılış maliyetini ödemez.
+"""
+import importlib
+
+_SUBMODULES = ("constants", "gravity", "frames", "integrate", "effects")
+_EXPORTS = {
+    "constants": ("G", "M", "R_EARTH", "MU", "MEGATON_TNT_J"),
+    "gravity": ("gravity_acceleration", "gravity_acceleration_batch", "specific_energy"),
+    "frames": ("initial_state", "initial_states", "impact_metadata", "impact_metadata_batch"),
+    "integrate": (
+        "INTEGRATORS", "TRAJECTORY_DTYPE", "rk4_step", "dopri5_step", "rk4_step_batch", "dopri5_step_batch",
+        "simulate", "simulate_trajectory", "simulate_chunks", "chunk_state", "simulate_chunk", "simulate_batch", "propagate",
+    ),
+    "effects": (
+        "kinetic_energy", "crater_diameter", "blast_radius", "thermal_radius", "tsunami_height",
+        "seismic_magnitude", "kinetic_energy_np", "sphere_mass_np", "crater_diameter_np", "blast_radius_np",
+        "thermal_radius_np", "seismic_magnitude_np",
+    ),
+}
+_OWNER = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_OWNER)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module = _OWNER.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Sonraki erişimler __getattr__'a düşmez
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_OWNER))
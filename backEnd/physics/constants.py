@@ -0,0 +1,7 @@
+# Fiziksel sabitler (SI)
+G = 6.67430e-11       # m^3 kg^-1 s^-2
+M = 5.972e24          # Dünya kütlesi (kg)
+R_EARTH = 6.371e6     # Dünya yarıçapı (m)
+MU = G * M            # Dünya'nın kütle çekim parametresi (m^3 s^-2)
+
+MEGATON_TNT_J = 4.184e15  # 1 MT TNT (J)
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+
+# Çarpma etkileri için kaba ampirik bağıntılar; /api/simulate, /api/simulate/fast ve toplu yollar bunları paylaşır
+
+
+def kinetic_energy(mass, velocity):
+    return 0.5 * mass * velocity**2
+
+
+def crater_diameter(diameter_m, velocity_m_s, density, angle_deg):
+    g = 9.81
+    theta = math.radians(angle_deg)
+    mass = (4/3) * math.pi * (diameter_m/2)**3 * density
+    E = kinetic_energy(mass, velocity_m_s)
+    d_crater = 1.161 * (E**0.294) * (math.sin(theta)**(1/3)) / (g**0.22)
+    depth = d_crater * 0.2
+    return d_crater, depth
+
+
+def blast_radius(E):
+    return 0.28 * (E ** (1/3)) / 1000  # km
+
+
+def thermal_radius(E):
+    # very rough threshold for severe burns
+    return 0.05 * (E ** (1/3)) / 1000  # km
+
+
+def tsunami_height(diameter_m, velocity_m_s, angle_deg, distance_km):
+    theta = math.radians(angle_deg)
+    impact_energy = kinetic_energy((4/3)*math.pi*(diameter_m/2)**3*3000, velocity_m_s)
+    h0 = 0.1 * (impact_energy**0.25) / 1e6
+    return h0 / (1 + distance_km/50)
+
+
+def seismic_magnitude(E):
+    return (math.log10(E) - 4.8) / 1.5
+
+
+# Dizi girdili sürümler: skaler fonksiyonlarla aynı işlem sırası korunur; yuvarlanmış çıktılar skaler yolla aynıdır
+# (ham float değerler NumPy'nin pow/sin uygulamalarından dolayı ~1 ulp farklı olabilir).
+def kinetic_energy_np(mass, velocity):
+    return 0.5 * mass * velocity**2
+
+
+def sphere_mass_np(diameter_m, density):
+    return (4/3) * math.pi * (diameter_m/2)**3 * density
+
+
+def crater_diameter_np(diameter_m, velocity_m_s, density, angle_deg):
+    g = 9.81
+    theta = np.asarray(angle_deg, dtype=float) * (math.pi / 180)
+    mass = sphere_mass_np(diameter_m, density)
+    E = kinetic_energy_np(mass, velocity_m_s)
+    d_crater = 1.161 * (E**0.294) * (np.sin(theta)**(1/3)) / (g**0.22)
+    depth = d_crater * 0.2
+    return d_crater, depth
+
+
+def blast_radius_np(E):
+    return 0.28 * (E ** (1/3)) / 1000  # km
+
+
+def thermal_radius_np(E):
+    return 0.05 * (E ** (1/3)) / 1000  # km
+
+
+def seismic_magnitude_np(E):
+    return (np.log10(E) - 4.8) / 1.5
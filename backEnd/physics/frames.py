@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+
+from .constants import R_EARTH
+from .gravity import _row_norm
+
+# Frontend (EarthScene) koordinat sistemi: y ekseni kuzey kutbu, boylam (-360, 0] aralığında
+
+def initial_state(latitude, longitude, distance_m, horizontal_velocity, vertical_velocity, radial_velocity):
+    """
+    Frontend (EarthScene) koordinat sisteminde başlangıç durumu: y ekseni kuzey kutbu.
+    distance_m yüzeyden uzaklık; hızlar m/s (doğu, kuzey, Dünya'ya doğru).
+    """
+    phi = math.radians(90 - latitude)
+    theta = math.radians(longitude + 180)
+
+    radial_unit = np.array([-math.sin(phi) * math.cos(theta), math.cos(phi), math.sin(phi) * math.sin(theta)])
+    east_unit = np.array([math.sin(theta), 0.0, math.cos(theta)])
+    north_unit = np.array([-math.cos(phi) * math.cos(theta), -math.sin(phi), math.cos(phi) * math.sin(theta)])
+
+    position = radial_unit * (R_EARTH + distance_m)
+    velocity = east_unit * horizontal_velocity + north_unit * vertical_velocity - radial_unit * radial_velocity
+    return position, velocity
+
+def impact_metadata(pos, vel):
+    """Çarpma noktasının enlem/boylamı, giriş açısı (derece) ve hızı (km/s)."""
+    normal = pos / np.linalg.norm(pos)
+    speed = np.linalg.norm(vel)
+    latitude = math.degrees(math.asin(normal[1]))
+    longitude = math.degrees(math.atan2(normal[2], -normal[0])) - 180
+    cos_angle = -np.dot(normal, vel / speed) if speed > 0 else 1.0
+    angle = math.degrees(math.acos(max(-1.0, min(1.0, cos_angle))))
+    return {
+        "location": {"latitude": latitude, "longitude": longitude},
+        "angle": angle,
+        "velocity": speed / 1000
+    }
+
+def initial_states(latitude, longitude, distance_m, horizontal_velocity, vertical_velocity, radial_velocity):
+    """initial_state'in dizi girdili hali; (N,3) pozisyon ve hız döndürür."""
+    phi = np.radians(90 - np.asarray(latitude, dtype=float))
+    theta = np.radians(np.asarray(longitude, dtype=float) + 180)
+    zeros = np.zeros_like(phi)
+
+    radial_unit = np.column_stack((-np.sin(phi) * np.cos(theta), np.cos(phi), np.sin(phi) * np.sin(theta)))
+    east_unit = np.column_stack((np.sin(theta), zeros, np.cos(theta)))
+    north_unit = np.column_stack((-np.cos(phi) * np.cos(theta), -np.sin(phi), np.cos(phi) * np.sin(theta)))
+
+    col = lambda x: np.asarray(x, dtype=float).reshape(-1, 1)
+    positions = radial_unit * (R_EARTH + col(distance_m))
+    velocities = (east_unit * col(horizontal_velocity) + north_unit * col(vertical_velocity)
+                  - radial_unit * col(radial_velocity))
+    return positions, velocities
+
+def impact_metadata_batch(pos, vel):
+    """impact_metadata'nın toplu hali: enlem, boylam, açı (derece) ve hız (km/s) dizileri."""
+    normal = pos / _row_norm(pos)[:, None]
+    speed = _row_norm(vel)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_angle = np.where(speed > 0, -(normal * vel).sum(axis=1) / speed, 1.0)
+    return {
+        'latitude': np.degrees(np.arcsin(normal[:, 1])),
+        'longitude': np.degrees(np.arctan2(normal[:, 2], -normal[:, 0])) - 180,
+        'angle': np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))),
+        'velocity': speed / 1000,
+    }
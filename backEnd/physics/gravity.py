@@ -0,0 +1,25 @@
+import numpy as np
+
+from .constants import G, M
+
+def gravity_acceleration(pos):
+    """Posisyona bağlı ivme a = F/m (m/s^2). Dünya merkezinden gelen çekim."""
+    r = np.linalg.norm(pos)
+    if r == 0:
+        return np.zeros(3)
+    a_mag = -G * M / (r ** 2)
+    return a_mag * (pos / r)
+
+def specific_energy(pos, vel):
+    """Birim kütle başına toplam mekanik enerji (J/kg); enerji korunumu kontrolü için."""
+    return 0.5 * np.dot(vel, vel) - G * M / np.linalg.norm(pos)
+
+def _row_norm(x):
+    return np.sqrt(x[:, 0]**2 + x[:, 1]**2 + x[:, 2]**2)
+
+def gravity_acceleration_batch(pos):
+    """(N,3) pozisyonlar için gravity_acceleration."""
+    r = _row_norm(pos)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.where(r[:, None] > 0, (-G * M / r**3)[:, None] * pos, 0.0)
+    return a
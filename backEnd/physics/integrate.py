@@ -0,0 +1,540 @@
+import numpy as np
+
+from .constants import R_EARTH
+from .frames import impact_metadata, impact_metadata_batch
+from .gravity import _row_norm, gravity_acceleration, gravity_acceleration_batch
+
+def rk4_step(pos, vel, dt, a0=None):
+    """RK4 adımı: giriş pos, vel; çıkış pos_new, vel_new. a0 verilirse k1 için yeniden hesaplanmaz."""
+    def acc(p):
+        return gravity_acceleration(p)
+
+    k1_v = acc(pos) if a0 is None else a0
+    k1_p = vel
+
+    k2_v = acc(pos + 0.5 * dt * k1_p)
+    k2_p = vel + 0.5 * dt * k1_v
+
+    k3_v = acc(pos + 0.5 * dt * k2_p)
+    k3_p = vel + 0.5 * dt * k2_v
+
+    k4_v = acc(pos + dt * k3_p)
+    k4_p = vel + dt * k3_v
+
+    vel_new = vel + (dt / 6.0) * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+    pos_new = pos + (dt / 6.0) * (k1_p + 2 * k2_p + 2 * k3_p + k4_p)
+
+    return pos_new, vel_new
+
+# Dormand–Prince 5(4) katsayıları
+DP_A = (
+    None,
+    np.array([1/5]),
+    np.array([3/40, 9/40]),
+    np.array([44/45, -56/15, 32/9]),
+    np.array([19372/6561, -25360/2187, 64448/6561, -212/729]),
+    np.array([9017/3168, -355/33, 46732/5247, 49/176, -5103/18656]),
+    np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84]),
+)
+# 5. ve 4. derece çözümlerin farkı (hata tahmini)
+DP_E = np.array([71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+def dopri5_step(pos, vel, dt, a0):
+    """
+    Dormand–Prince 5(4) adımı. a0 = gravity_acceleration(pos).
+    Dönüş: pos_new, vel_new, a_new (bir sonraki adımın k1'i, FSAL), pos_err, vel_err
+    """
+    kp = np.empty((7, 3))
+    kv = np.empty((7, 3))
+    kp[0] = vel
+    kv[0] = a0
+    for i in range(1, 7):
+        p = pos + dt * (DP_A[i] @ kp[:i])
+        v = vel + dt * (DP_A[i] @ kv[:i])
+        kp[i] = v
+        kv[i] = gravity_acceleration(p)
+
+    # 7. aşama 5. derece çözümün kendisidir
+    pos_err = dt * (DP_E @ kp)
+    vel_err = dt * (DP_E @ kv)
+    return p, v, kv[6], pos_err, vel_err
+
+INTEGRATORS = ('rk4', 'dopri5')
+
+# Yörünge kaydı: her satır bir adım (zaman, pozisyon, hız, ivme), toplam 10 float64
+TRAJECTORY_DTYPE = np.dtype([
+    ('t', np.float64),
+    ('pos', np.float64, (3,)),
+    ('vel', np.float64, (3,)),
+    ('acc', np.float64, (3,)),
+])
+
+def _new_state(position0, velocity0, dt):
+    return {
+        'pos': np.asarray(position0, dtype=float).copy(),
+        'vel': np.asarray(velocity0, dtype=float).copy(),
+        'acc': None,
+        'step': 0,
+        't': 0.0,
+        'h': dt,
+        'nfev': 0,
+        'crashed': False,
+        'escaped': False,
+        'hit': False,
+        'impact': None,
+        'done': False,
+    }
+
+def _adaptive_step(pos, vel, a, state, rtol, atol, max_dt):
+    """Hata eşiği sağlanana kadar adımı küçültür; kabul edilen adımdan sonra bir sonraki dt'yi ayarlar."""
+    h = state['h']
+    while True:
+        pos_new, vel_new, a_new, pos_err, vel_err = dopri5_step(pos, vel, h, a)
+        state['nfev'] += 6
+
+        pos_scale = atol + rtol * max(np.linalg.norm(pos), np.linalg.norm(pos_new))
+        vel_scale = atol + rtol * max(np.linalg.norm(vel), np.linalg.norm(vel_new))
+        err = max(np.linalg.norm(pos_err) / pos_scale, np.linalg.norm(vel_err) / vel_scale)
+
+        # Standart adım kontrolü: güvenlik katsayısı 0.9, değişim 0.2x..5x arası
+        factor = 5.0 if err == 0 else min(5.0, max(0.2, 0.9 * err ** -0.2))
+        if err <= 1.0:
+            state['t'] += float(h)
+            h_next = h * factor
+            state['h'] = h_next if max_dt is None else min(h_next, max_dt)
+            return pos_new, vel_new, a_new
+        h *= factor
+
+def _refine_crossing(step_fn, pos, h, g_hi, event_tol):
+    """
+    [0, h] içinde |pos| = R_EARTH olan alt adımı Illinois (düzeltilmiş regula falsi)
+    yöntemiyle bulur. step_fn(hh) adım başından hh kadar entegre eder.
+    Dönüş: yüzeyin en fazla event_tol metre içindeki (pos, vel), alt adım uzunluğu ve step_fn çağrı sayısı.
+    """
+    lo, g_lo = 0.0, np.linalg.norm(pos) - R_EARTH
+    f_lo, f_hi = g_lo, g_hi
+    hi, hit = h, None
+    side = 0
+    calls = 0
+    for _ in range(60):
+        if -event_tol <= g_hi <= 0 or hi - lo <= 1e-12 * h:
+            break
+        m = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        p_m, v_m = step_fn(m)
+        g_m = np.linalg.norm(p_m) - R_EARTH
+        calls += 1
+        if g_m <= 0:
+            hi, g_hi, f_hi, hit = m, g_m, g_m, (p_m, v_m)
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, g_lo, f_lo = m, g_m, g_m
+            if side == 1:
+                f_hi /= 2
+            side = 1
+    return hit, hi, calls
+
+def _expired(state, t_max):
+    return t_max is not None and state['t'] >= t_max
+
+def _fill(buf, state, dt, max_steps, crash_on_surface, escape_radius,
+          method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+          t_max=None):
+    """
+    buf'ı baştan itibaren doldurur, yazılan satır sayısını döndürür.
+    Durum (pos, vel, step, bayraklar) state sözlüğünde tutulur, böylece
+    aynı entegrasyon parça parça devam ettirilebilir.
+    """
+    t_col, pos_col, vel_col, acc_col = buf['t'], buf['pos'], buf['vel'], buf['acc']
+    pos, vel, step = state['pos'], state['vel'], state['step']
+    adaptive = method == 'dopri5'
+    n = 0
+
+    # Yüzey geçişi bulunduysa max_steps dolmuş olsa da çarpma noktası kaydedilir
+    while n < len(buf) and ((step < max_steps and not _expired(state, t_max)) or state['hit']):
+        r = np.linalg.norm(pos)
+        a = state['acc']
+        if a is None:
+            a = gravity_acceleration(pos)
+            state['nfev'] += 1
+
+        # Kayıt
+        t_col[n] = state['t']
+        pos_col[n] = pos
+        vel_col[n] = vel
+        acc_col[n] = a
+        n += 1
+
+        # Çarpışma kontrolü
+        if crash_on_surface and r <= R_EARTH:
+            state['crashed'] = True
+            state['impact'] = dict(impact_metadata(pos, vel), time=state['t'])
+            break
+
+        # Kaçış kontrolü
+        if escape_radius is not None and r > escape_radius:
+            state['escaped'] = True
+            break
+
+        t_prev = state['t']
+        if adaptive:
+            # Dormand–Prince: son aşamanın ivmesi bir sonraki adımda yeniden kullanılır
+            pos_new, vel_new, state['acc'] = _adaptive_step(pos, vel, a, state, rtol, atol, max_dt)
+            h = state['t'] - t_prev
+        else:
+            # Entegrasyon adımı (RK4), k1 olarak kaydedilen ivme kullanılır
+            pos_new, vel_new = rk4_step(pos, vel, dt, a)
+            state['nfev'] += 3
+            h = dt
+            state['t'] = (step + 1) * dt
+
+        # Olay tespiti: adım içinde r - R_EARTH işaret değiştirdiyse geçiş anını daralt
+        g_new = np.linalg.norm(pos_new) - R_EARTH
+        if crash_on_surface and g_new <= 0:
+            if refine_impact:
+                if adaptive:
+                    step_fn = lambda hh, p=pos, v=vel, a0=a: dopri5_step(p, v, hh, a0)[:2]
+                else:
+                    step_fn = lambda hh, p=pos, v=vel, a0=a: rk4_step(p, v, hh, a0)
+                hit, h_hit, calls = _refine_crossing(step_fn, pos, h, g_new, event_tol)
+                state['nfev'] += calls * (6 if adaptive else 3)
+                if hit is not None:
+                    pos_new, vel_new = hit
+                    state['t'] = t_prev + h_hit
+                    state['acc'] = None
+            # Son izin verilen adımda olsa da geçiş satırı kaydedilir (simulate_batch gibi)
+            state['hit'] = True
+
+        pos, vel = pos_new, vel_new
+        step += 1
+
+    state['pos'], state['vel'], state['step'] = pos, vel, step
+    state['done'] = state['crashed'] or state['escaped'] or (
+        (step >= max_steps or _expired(state, t_max)) and not state['hit'])
+    return n
+
+def _terminated(state):
+    return {
+        'crashed': state['crashed'],
+        'escaped': state['escaped'],
+        'steps': state['step'],
+        'final_r': np.linalg.norm(state['pos']),
+        'time': state['t'],
+        'nfev': state['nfev'],
+        'impact': state['impact'],
+    }
+
+def _check_method(method):
+    if method not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator '{method}', expected one of {INTEGRATORS}")
+
+def simulate_trajectory(position0, velocity0, dt=0.5, max_steps=20000, crash_on_surface=True, escape_radius=None,
+                        method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+                        t_max=None):
+    """
+    simulate() ile aynı entegrasyon; sonucu tek bir TRAJECTORY_DTYPE dizisi olarak döndürür.
+    Tampon bir kez ayrılır ve sonlanınca kırpılır. max_steps + 1 satırdır: geçiş son izin verilen
+    adımda bulunursa rafine edilmiş çarpma satırı da kaydedilir (simulate_chunks ile aynı).
+    """
+    _check_method(method)
+    state = _new_state(position0, velocity0, dt)
+    buf = np.empty(max_steps + 1, dtype=TRAJECTORY_DTYPE)
+    n = _fill(buf, state, dt, max_steps, crash_on_surface, escape_radius, method, rtol, atol, max_dt,
+                  refine_impact, event_tol, t_max)
+    if n < max_steps:
+        # Kopyalayarak kırp: kullanılmayan kısım hemen serbest kalır
+        buf = buf[:n].copy()
+    else:
+        # En fazla bir satır boşta kalır; tüm tamponu kopyalamaya değmez
+        buf = buf[:n]
+    return buf, _terminated(state)
+
+def chunk_state(position0, velocity0, dt=0.5):
+    """simulate_chunk için başlangıç durumu; süreçler arasında taşınabilen (pickle) bir sözlüktür."""
+    return _new_state(position0, velocity0, dt)
+
+def simulate_chunk(state, size, dt=0.5, max_steps=20000, crash_on_surface=True, escape_radius=None,
+                   method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+                   t_max=None):
+    """
+    Durumu en fazla size satır ilerletir ve (parça, durum, sonuç) döndürür. sonuç, entegrasyon bittiyse
+    simulate() ile aynı durum sözlüğü, bitmediyse None'dır. Durum yerinde güncellenir; bir sonraki
+    çağrıya dönen durum verilir, böylece ardışık parçalar farklı süreçlerde hesaplanabilir.
+    """
+    _check_method(method)
+    buf = np.empty(size, dtype=TRAJECTORY_DTYPE)
+    n = _fill(buf, state, dt, max_steps, crash_on_surface, escape_radius, method, rtol, atol, max_dt,
+              refine_impact, event_tol, t_max)
+    return buf[:n], state, _terminated(state) if state['done'] else None
+
+def simulate_chunks(position0, velocity0, dt=0.5, max_steps=20000, crash_on_surface=True, escape_radius=None,
+                    method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+                    t_max=None, chunk_size=4096, first_chunk_size=None):
+    """
+    Yörüngeyi en fazla chunk_size satırlık TRAJECTORY_DTYPE parçaları halinde üretir.
+    Bellek kullanımı yörünge uzunluğundan bağımsızdır; üreteç bittiğinde
+    dönüş değeri (StopIteration.value) simulate() ile aynı durum sözlüğüdür.
+    first_chunk_size verilirse ilk parça daha küçük tutulur (ilk karenin hızlı gelmesi için).
+    """
+    state = chunk_state(position0, velocity0, dt)
+    size = first_chunk_size or chunk_size
+    while True:
+        chunk, state, terminated = simulate_chunk(
+            state, size, dt=dt, max_steps=max_steps, crash_on_surface=crash_on_surface, escape_radius=escape_radius,
+            method=method, rtol=rtol, atol=atol, max_dt=max_dt, refine_impact=refine_impact, event_tol=event_tol,
+            t_max=t_max
+        )
+        size = chunk_size
+        if chunk.size:
+            yield chunk
+        if terminated is not None:
+            return terminated
+
+def simulate(position0, velocity0, dt=0.5, max_steps=20000, crash_on_surface=True, escape_radius=None,
+             method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+             t_max=None):
+    """
+    Simülasyonu yürütür ve dizileri döndürür:
+    x, y, z: (N,) pozisyon bileşenleri
+    velocities: (N,3)
+    accelerations: (N,3)
+    terminated: sözlük ile durum bilgisi {'crashed': bool, 'escaped': bool, 'steps': int, 'time': float, 'nfev': int,
+                'impact': çarpma bilgisi (impact_metadata + 'time') veya None}
+    escape_radius verilirse r > escape_radius olduğunda simülasyon durur.
+    method='dopri5' uyarlamalı adım kullanır: dt başlangıç adımıdır, adım rtol/atol
+    hata sınırlarına göre büyütülüp küçültülür (max_dt ile sınırlanabilir), max_steps
+    kabul edilen adım sayısını sınırlar.
+    refine_impact=True iken yüzeyi geçen adım, geçiş anı event_tol (m) hassasiyetle
+    bulunana kadar daraltılır; son satır tam çarpma noktasıdır, dt'ye bağlı değildir.
+    t_max verilirse simülasyon zamanı t_max'a ulaşınca durur.
+    Diziler simulate_trajectory() tamponunun görünümleridir (kopya yapılmaz).
+    """
+    traj, terminated = simulate_trajectory(position0, velocity0, dt=dt, max_steps=max_steps,
+                                           crash_on_surface=crash_on_surface, escape_radius=escape_radius,
+                                           method=method, rtol=rtol, atol=atol, max_dt=max_dt,
+                                           refine_impact=refine_impact, event_tol=event_tol, t_max=t_max)
+    pos = traj['pos']
+    return pos[:, 0], pos[:, 1], pos[:, 2], traj['vel'], traj['acc'], terminated
+
+def propagate(position0, velocity0, chunk_size=256, **kwargs):
+    """
+    Yalnızca son durum sözlüğünü döndürür; yörünge satırları küçük parçalar halinde
+    üretilip atılır (Monte Carlo gibi toplu çalıştırmalar için).
+    """
+    chunks = simulate_chunks(position0, velocity0, chunk_size=chunk_size, **kwargs)
+    while True:
+        try:
+            next(chunks)
+        except StopIteration as stop:
+            return stop.value
+
+# -----------------------------
+# Toplu (N cisim) yayılım
+# -----------------------------
+# Her satır bağımsız bir cisimdir; tüm işlemler satır bazında olduğundan bir cismin
+# sonucu, aynı grupta hangi cisimlerin bulunduğundan bağımsızdır.
+
+def rk4_step_batch(pos, vel, dt, a0=None):
+    """(N,3) durumlar için RK4 adımı; dt skaler veya (N,) olabilir."""
+    dt = np.asarray(dt, dtype=float)
+    if dt.ndim:
+        dt = dt[:, None]
+    acc = gravity_acceleration_batch
+
+    k1_v = acc(pos) if a0 is None else a0
+    k1_p = vel
+
+    k2_v = acc(pos + 0.5 * dt * k1_p)
+    k2_p = vel + 0.5 * dt * k1_v
+
+    k3_v = acc(pos + 0.5 * dt * k2_p)
+    k3_p = vel + 0.5 * dt * k2_v
+
+    k4_v = acc(pos + dt * k3_p)
+    k4_p = vel + dt * k3_v
+
+    vel_new = vel + (dt / 6.0) * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+    pos_new = pos + (dt / 6.0) * (k1_p + 2 * k2_p + 2 * k3_p + k4_p)
+
+    return pos_new, vel_new
+
+def _combine(coeffs, ks):
+    # Satır bazında sabit sırayla toplam (BLAS kullanılmaz, sonuç grup boyutundan bağımsız)
+    total = None
+    for c, k in zip(coeffs, ks):
+        if c:
+            total = c * k if total is None else total + c * k
+    return total
+
+def dopri5_step_batch(pos, vel, dt, a0):
+    """(N,3) durumlar ve (N,) adımlar için dopri5_step."""
+    dt = np.asarray(dt, dtype=float)[:, None]
+    kp = [vel]
+    kv = [a0]
+    for i in range(1, 7):
+        p = pos + dt * _combine(DP_A[i], kp)
+        v = vel + dt * _combine(DP_A[i], kv)
+        kp.append(v)
+        kv.append(gravity_acceleration_batch(p))
+    pos_err = dt * _combine(DP_E, kp)
+    vel_err = dt * _combine(DP_E, kv)
+    return p, v, kv[6], pos_err, vel_err
+
+def _adaptive_step_batch(pos, vel, a, h, rtol, atol, max_dt):
+    """_adaptive_step'in toplu hali: her cisim kendi adımını kabul edene kadar küçültülür."""
+    m = len(pos)
+    h = h.copy()
+    out_p, out_v, out_a = np.empty((m, 3)), np.empty((m, 3)), np.empty((m, 3))
+    h_taken, h_next = np.empty(m), np.empty(m)
+    nfev = 0
+    todo = np.arange(m)
+    while todo.size:
+        p_new, v_new, a_new, p_err, v_err = dopri5_step_batch(pos[todo], vel[todo], h[todo], a[todo])
+        nfev += 6 * todo.size
+
+        pos_scale = atol + rtol * np.maximum(_row_norm(pos[todo]), _row_norm(p_new))
+        vel_scale = atol + rtol * np.maximum(_row_norm(vel[todo]), _row_norm(v_new))
+        err = np.maximum(_row_norm(p_err) / pos_scale, _row_norm(v_err) / vel_scale)
+        with np.errstate(divide='ignore'):
+            factor = np.where(err == 0, 5.0, np.clip(0.9 * err ** -0.2, 0.2, 5.0))
+
+        ok = err <= 1.0
+        done = todo[ok]
+        out_p[done], out_v[done], out_a[done] = p_new[ok], v_new[ok], a_new[ok]
+        h_taken[done] = h[done]
+        h_next[done] = h[done] * factor[ok]
+        h[todo[~ok]] *= factor[~ok]
+        todo = todo[~ok]
+
+    if max_dt is not None:
+        h_next = np.minimum(h_next, max_dt)
+    return out_p, out_v, out_a, h_taken, h_next, nfev
+
+def _refine_crossing_batch(step_fn, pos, h, g_hi, event_tol):
+    """
+    _refine_crossing'in toplu hali. step_fn(idx, hh) idx satırlarını adım başından hh kadar entegre eder.
+    Dönüş: yüzeydeki (pos, vel) ve alt adım uzunlukları; step_fn'in toplam satır çağrı sayısı.
+    """
+    m = len(pos)
+    lo = np.zeros(m)
+    hi = np.asarray(h, dtype=float).copy()
+    g_lo = _row_norm(pos) - R_EARTH
+    g_hi = g_hi.copy()
+    f_lo, f_hi = g_lo.copy(), g_hi.copy()
+    side = np.zeros(m, dtype=int)
+    hit_p, hit_v = np.full((m, 3), np.nan), np.full((m, 3), np.nan)
+    calls = 0
+    for _ in range(60):
+        todo = np.flatnonzero(~(((-event_tol <= g_hi) & (g_hi <= 0)) | (hi - lo <= 1e-12 * h)))
+        if not todo.size:
+            break
+        mid = (lo[todo] * f_hi[todo] - hi[todo] * f_lo[todo]) / (f_hi[todo] - f_lo[todo])
+        p_m, v_m = step_fn(todo, mid)
+        g_m = _row_norm(p_m) - R_EARTH
+        calls += todo.size
+
+        inside = g_m <= 0
+        i_in, i_out = todo[inside], todo[~inside]
+        hi[i_in], g_hi[i_in], f_hi[i_in] = mid[inside], g_m[inside], g_m[inside]
+        hit_p[i_in], hit_v[i_in] = p_m[inside], v_m[inside]
+        f_lo[i_in[side[i_in] == -1]] /= 2
+        side[i_in] = -1
+        lo[i_out], g_lo[i_out], f_lo[i_out] = mid[~inside], g_m[~inside], g_m[~inside]
+        f_hi[i_out[side[i_out] == 1]] /= 2
+        side[i_out] = 1
+    return hit_p, hit_v, hi, calls
+
+def simulate_batch(positions, velocities, dt=0.5, max_steps=20000, crash_on_surface=True, escape_radius=None,
+                   method='rk4', rtol=1e-10, atol=1e-6, max_dt=None, refine_impact=True, event_tol=1e-3,
+                   t_max=None):
+    """
+    N bağımsız cismi (N,3) dizilerle birlikte yayar; çarpan, kaçan veya süresi dolan
+    cisimler maskelenir, geri kalanlar devam eder. Parametreler simulate() ile aynıdır;
+    yörünge kaydedilmez, her cisim için son durum ve çarpma bilgisi döndürülür.
+    """
+    _check_method(method)
+    adaptive = method == 'dopri5'
+    pos = np.array(positions, dtype=float).reshape(-1, 3)
+    vel = np.array(velocities, dtype=float).reshape(-1, 3)
+    n = len(pos)
+
+    t = np.zeros(n)
+    h = np.full(n, float(dt))
+    steps = np.zeros(n, dtype=int)
+    crashed = np.zeros(n, dtype=bool)
+    escaped = np.zeros(n, dtype=bool)
+    impact_time = np.full(n, np.nan)
+
+    if crash_on_surface:
+        crashed |= _row_norm(pos) <= R_EARTH
+        impact_time[crashed] = 0.0
+    acc = gravity_acceleration_batch(pos)
+    nfev = n
+
+    while True:
+        active = ~(crashed | escaped) & (steps < max_steps)
+        if t_max is not None:
+            active &= t < t_max
+        # Kaçış, _fill'deki gibi yalnızca adım atacak cisimlerde adımdan önce denetlenir:
+        # adım ya da süre sınırına ulaşan son durum yarıçapın dışında olsa da kaçış sayılmaz
+        if escape_radius is not None:
+            leaving = active & (_row_norm(pos) > escape_radius)
+            escaped |= leaving
+            active &= ~leaving
+        idx = np.flatnonzero(active)
+        if not idx.size:
+            break
+
+        p, v, a = pos[idx], vel[idx], acc[idx]
+        if adaptive:
+            p_new, v_new, a_new, h_step, h[idx], evals = _adaptive_step_batch(p, v, a, h[idx], rtol, atol, max_dt)
+            nfev += evals
+            t_new = t[idx] + h_step
+        else:
+            p_new, v_new = rk4_step_batch(p, v, dt, a)
+            nfev += 3 * idx.size
+            h_step = np.full(idx.size, float(dt))
+            t_new = (steps[idx] + 1) * dt
+
+        g_new = _row_norm(p_new) - R_EARTH
+        if crash_on_surface:
+            cross = np.flatnonzero(g_new <= 0)
+            if refine_impact and cross.size:
+                if adaptive:
+                    step_fn = lambda j, hh: dopri5_step_batch(p[cross[j]], v[cross[j]], hh, a[cross[j]])[:2]
+                else:
+                    step_fn = lambda j, hh: rk4_step_batch(p[cross[j]], v[cross[j]], hh, a[cross[j]])
+                hit_p, hit_v, h_hit, calls = _refine_crossing_batch(step_fn, p[cross], h_step[cross],
+                                                                    g_new[cross], event_tol)
+                nfev += calls * (6 if adaptive else 3)
+                found = ~np.isnan(hit_p[:, 0])
+                p_new[cross[found]], v_new[cross[found]] = hit_p[found], hit_v[found]
+                t_new = np.asarray(t_new, dtype=float).copy()
+                t_new[cross[found]] = t[idx[cross[found]]] + h_hit[found]
+            crashed[idx[cross]] = True
+            impact_time[idx[cross]] = t_new[cross] if np.ndim(t_new) else t_new
+
+        pos[idx], vel[idx], t[idx] = p_new, v_new, t_new
+        steps[idx] += 1
+        if adaptive:
+            acc[idx] = a_new
+        else:
+            acc[idx] = gravity_acceleration_batch(p_new)
+            nfev += idx.size
+
+    impact = impact_metadata_batch(pos, vel)
+    for key in impact:
+        impact[key] = np.where(crashed, impact[key], np.nan)
+    impact['time'] = impact_time
+
+    return {
+        'crashed': crashed,
+        'escaped': escaped,
+        'steps': steps,
+        'time': t,
+        'final_pos': pos,
+        'final_vel': vel,
+        'nfev': nfev,
+        'impact': impact,
+    }
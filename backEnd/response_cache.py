@@ -0,0 +1,95 @@
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from instrumentation import span
+
+
+def parse_quantization(spec):
+    """Ortam değişkeni biçimi: diameter_km=0.001,velocity_km_s=0.01 -> {alan: adım}"""
+    steps = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, step = item.partition("=")
+        steps[name.strip()] = float(step)
+    return steps
+
+
+def render_json(content):
+    """FastAPI'nin varsayılan JSON yanıtıyla aynı baytlar."""
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+class ResponseCache:
+    """
+    Serileştirilmiş yanıtlar için boyutu sınırlı LRU önbelleği.
+    İstek alanları quantization adımlarına yuvarlanır; yanıt da yuvarlanmış istekten hesaplanır,
+    böylece aynı anahtar her zaman aynı yanıtı verir. Adımı verilmeyen alanlar olduğu gibi kullanılır.
+    """
+
+    def __init__(self, max_entries=1024, quantization=None):
+        self.max_entries = max_entries
+        self.quantization = dict(quantization or {})
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def quantize(self, name, request):
+        """(anahtar, yuvarlanmış istek) döndürür."""
+        values = request.model_dump()
+        updates = {}
+        for field, step in self.quantization.items():
+            value = values.get(field)
+            if step > 0 and isinstance(value, (int, float)) and not isinstance(value, bool):
+                updates[field] = values[field] = float(round(value / step) * Decimal(str(step)))
+        # İç içe modeller (ör. initial_state) için anahtar JSON metni olarak üretilir
+        key = (name, json.dumps(values, sort_keys=True))
+        return key, request.model_copy(update=updates)
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._entries.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def respond(self, name, request, compute):
+        """Önbellekteki baytları döndürür; yoksa compute(yuvarlanmış istek) sonucunu serileştirip saklar."""
+        key, request = self.quantize(name, request)
+        body = self.get(key)
+        if body is None:
+            with span("compute"):
+                content = compute(request)
+            with span("serialize"):
+                body = render_json(content)
+            self.put(key, body)
+        return Response(content=body, media_type="application/json")
+
+    async def respond_async(self, name, request, compute):
+        """respond ile aynı; compute bir eşyordamdır (ör. işi süreç havuzuna taşıyan hesaplamalar)."""
+        key, request = self.quantize(name, request)
+        body = self.get(key)
+        if body is None:
+            with span("compute"):
+                content = await compute(request)
+            with span("serialize"):
+                body = render_json(content)
+            self.put(key, body)
+        return Response(content=body, media_type="application/json")
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self):
+        return dict(self.stats, entries=len(self._entries), max_entries=self.max_entries,
+                    quantization=self.quantization)
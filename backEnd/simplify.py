@@ -0,0 +1,61 @@
+import heapq
+
+import numpy as np
+
+
+def _farthest(points, a, b):
+    """(a, b) arasındaki noktalardan [a]-[b] doğru parçasına en uzak olanı: (mesafe, indeks)."""
+    inner = points[a + 1:b]
+    seg = points[b] - points[a]
+    rel = inner - points[a]
+    seg_len2 = seg @ seg
+    if seg_len2 > 0:
+        # Doğru yerine doğru parçası: uçları çakışan döngülerde de anlamlı mesafe
+        s = np.clip(rel @ seg / seg_len2, 0.0, 1.0)
+        rel = rel - s[:, None] * seg
+    dist2 = np.einsum("ij,ij->i", rel, rel)
+    k = int(np.argmax(dist2))
+    return float(np.sqrt(dist2[k])), a + 1 + k
+
+
+def simplify_indices(points, tolerance=None, max_points=None):
+    """
+    3B Ramer–Douglas–Peucker: korunacak satır indekslerini artan sırada döndürür.
+    Bölümler en büyük sapmadan başlayarak bir yığında bölünür; durma koşulu
+    nokta sayısının max_points'e ulaşması veya en büyük sapmanın tolerance'ın altına düşmesidir.
+    İlk ve son nokta (çarpma noktası) her zaman korunur.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if max_points is not None and max_points < 2:
+        raise ValueError("max_points must be at least 2")
+    if n <= 2 or (max_points is not None and n <= max_points and not tolerance):
+        return np.arange(n)
+
+    keep = [0, n - 1]
+    heap = []
+
+    def push(a, b):
+        if b - a > 1:
+            dist, idx = _farthest(points, a, b)
+            heapq.heappush(heap, (-dist, a, b, idx))
+
+    push(0, n - 1)
+    while heap and (max_points is None or len(keep) < max_points):
+        neg_dist, a, b, idx = heapq.heappop(heap)
+        if tolerance is not None and -neg_dist <= tolerance:
+            break
+        keep.append(idx)
+        push(a, idx)
+        push(idx, b)
+    return np.array(sorted(keep))
+
+
+def max_deviation(points, indices):
+    """Seyreltilmiş yolun tam yoldan en büyük sapması (doğrulama için)."""
+    points = np.asarray(points, dtype=float)
+    worst = 0.0
+    for a, b in zip(indices[:-1], indices[1:]):
+        if b - a > 1:
+            worst = max(worst, _farthest(points, a, b)[0])
+    return worst
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Arka uç modülleri düz bir dizinde; testler backEnd'in içinden veya dışından çalıştırılabilsin
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
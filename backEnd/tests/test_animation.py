@@ -0,0 +1,18 @@
+import numpy as np
+from PIL import Image, ImageSequence
+
+import asteroidAnimation
+
+
+def test_gif_frames_are_streamed_to_disk(tmp_path):
+    data = asteroidAnimation.precompute(max_steps=200, steps_per_frame=20)
+    out = tmp_path / "orbit.gif"
+    n_frames = asteroidAnimation.render(data, str(out), fps=20, figsize=(2, 2), dpi=50)
+
+    with Image.open(out) as gif:
+        frames = [np.asarray(frame.convert("RGB")) for frame in ImageSequence.Iterator(gif)]
+        assert gif.info["loop"] == 0
+        assert gif.info["duration"] == 50
+    assert len(frames) == n_frames == len(data["frames"])
+    # Yörünge izi kareler arasında ilerler; kareler birbirinin kopyası değildir
+    assert not np.array_equal(frames[0], frames[-1])
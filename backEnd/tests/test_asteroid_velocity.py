@@ -0,0 +1,27 @@
+import numpy as np
+
+import asteroid_backend
+
+
+def _neo(neo_id, miss_distance_km, velocity_km_s=12.5):
+    return {
+        "id": neo_id,
+        "close_approach_data": [{
+            "relative_velocity": {"kilometers_per_second": str(velocity_km_s)},
+            "miss_distance": {"kilometers": str(miss_distance_km)},
+        }],
+    }
+
+
+def test_batch_velocity_is_deterministic_per_id():
+    neos = [_neo("3542519", 4.5e7), _neo("2000433", 1.2e7), _neo("a-b", 3.8e5)]
+    first = asteroid_backend.calculate_asteroid_velocity_batch(neos)
+    again = asteroid_backend.calculate_asteroid_velocity_batch(neos[::-1])[::-1]
+    assert np.array_equal(first, again)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 12.5, atol=2e-3)
+
+
+def test_zero_miss_distance_gives_finite_velocity():
+    velocity = asteroid_backend.calculate_asteroid_velocity_batch([_neo("3542519", 0), _neo("2000433", 1.2e7)])
+    assert np.isfinite(velocity).all()
+    np.testing.assert_allclose(np.linalg.norm(velocity, axis=1), 12.5, atol=2e-3)
@@ -0,0 +1,88 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+RUN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "run.py")
+
+
+@pytest.fixture(scope="module")
+def run():
+    spec = importlib.util.spec_from_file_location("benchmarks_run", RUN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _result(median_s, **counters):
+    result = {"median_s": median_s}
+    if counters:
+        result["counters"] = counters
+    return result
+
+
+THRESHOLDS = {
+    "default_max_ratio": 1.5,
+    "benchmarks": {
+        "a": {"max_median_s": 0.1, "max_counters": {"nfev": 100}},
+        "b": {"max_ratio": 3.0},
+    },
+}
+
+
+def test_check_passes_within_limits(run):
+    results = {"a": _result(0.05, nfev=100), "b": _result(0.2)}
+    baseline = {"a": _result(0.04), "b": _result(0.1)}
+    assert run.check(results, THRESHOLDS, baseline) == []
+
+
+def test_check_flags_absolute_and_counter_limits(run):
+    regressions = run.check({"a": _result(0.2, nfev=101)}, THRESHOLDS)
+    assert {(r["benchmark"], r["metric"]) for r in regressions} == {("a", "median_s"), ("a", "nfev")}
+
+
+def test_check_flags_baseline_ratio_with_per_benchmark_override(run):
+    results = {"a": _result(0.08), "b": _result(0.25), "new": _result(1.0)}
+    baseline = {"a": _result(0.05), "b": _result(0.1)}
+    regressions = run.check(results, THRESHOLDS, baseline)
+    # a: 1.6 > varsayılan 1.5; b: 2.5 <= kendi sınırı 3.0; new: baseline'da yok
+    assert [(r["benchmark"], r["metric"]) for r in regressions] == [("a", "median_ratio")]
+    assert regressions[0]["value"] == pytest.approx(1.6)
+
+
+def _fake_benchmarks(run, monkeypatch):
+    def setup():
+        yield lambda: {"nfev": 7}
+    monkeypatch.setattr(run, "BENCHMARKS", [("fake.case", setup, 1)])
+
+
+def test_main_exit_code_and_report_follow_regressions(run, monkeypatch, tmp_path):
+    _fake_benchmarks(run, monkeypatch)
+    thresholds = tmp_path / "thresholds.json"
+    thresholds.write_text(json.dumps({"default_max_ratio": 1.5, "benchmarks": {"fake.case": {"max_counters": {"nfev": 10}}}}))
+    out = tmp_path / "out.json"
+    args = ["--thresholds", str(thresholds), "--min-time", "0", "--out", str(out)]
+
+    assert run.main(args) == 0
+    report = json.loads(out.read_text())
+    assert report["regressions"] == []
+    assert report["results"]["fake.case"]["counters"] == {"nfev": 7}
+
+    # Aynı sonuç, çok daha hızlı bir baseline'a göre gerilemedir
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps({"results": {"fake.case": {"median_s": 1e-12}}}))
+    assert run.main(args + ["--baseline", str(fast)]) == 1
+    assert json.loads(out.read_text())["regressions"][0]["metric"] == "median_ratio"
+
+    # Sayaç sınırı makineden bağımsızdır
+    thresholds.write_text(json.dumps({"benchmarks": {"fake.case": {"max_counters": {"nfev": 6}}}}))
+    assert run.main(args) == 1
+
+
+def test_registered_benchmarks_have_thresholds(run):
+    with open(run.THRESHOLDS_PATH) as f:
+        thresholds = json.load(f)
+    names = [name for name, _, _ in run.BENCHMARKS]
+    assert len(names) == len(set(names))
+    assert set(names) <= set(thresholds["benchmarks"])
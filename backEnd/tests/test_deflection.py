@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import asteroid_backend
+import deflection
+import physics
+
+SIM_KWARGS = {"t_max": 6 * 3600.0}
+
+
+@pytest.fixture
+def state():
+    return physics.initial_state(0, 0, 2e7, 1500, -3000, 0)
+
+
+def test_repeated_deflection_returns_identical_payload(state):
+    simulator = deflection.DeflectionSimulator()
+    first = simulator.deflect(*state, 0.05, 3600, sim_kwargs=SIM_KWARGS)
+    second = simulator.deflect(*state, 0.05, 3600, sim_kwargs=SIM_KWARGS)
+    # Baseline önbelleğinin durumu yanıta sızmaz; önbelleğe alınan yanıtlar tekrar kullanılabilir
+    assert simulator.stats == {"hits": 1, "misses": 1}
+    assert first == second
+
+
+def test_lead_time_within_horizon_is_applied(state):
+    result = deflection.DeflectionSimulator().deflect(*state, 0.05, 3600, sim_kwargs=SIM_KWARGS)
+    assert not result["lead_time_clamped"]
+    assert result["applied_at_s"] > 0
+    assert 3600 <= result["lead_time_s"] < 3600 + 600
+
+
+def test_lead_time_beyond_horizon_is_clamped_to_start(state):
+    result = deflection.DeflectionSimulator().deflect(*state, 0.05, 5 * 365 * 86400, sim_kwargs=SIM_KWARGS)
+    assert result["lead_time_clamped"]
+    assert result["applied_at_s"] == 0
+    assert result["lead_time_s"] <= SIM_KWARGS["t_max"]
+
+
+@pytest.mark.parametrize("direction", deflection.DIRECTIONS)
+def test_delta_v_direction_with_zero_reference_is_rejected(direction):
+    with pytest.raises(ValueError):
+        deflection.delta_v_vector(np.zeros(3), np.zeros(3), 0.05, direction)
+
+
+def test_delta_v_vector_is_finite_and_scaled(state):
+    for direction in deflection.DIRECTIONS:
+        dv = deflection.delta_v_vector(*state, 0.05, direction)
+        assert np.isfinite(dv).all()
+        assert np.linalg.norm(dv) == pytest.approx(0.05)
+
+
+def test_crashed_path_reports_the_surface_not_a_negative_altitude():
+    # Radyal düşüş: sanal perige yerin merkezi, yanıt ise yüzeyi (0 km) ve impacted bayrağını vermeli
+    state = physics.initial_state(0, 0, 2e7, 0, 0, 3000)
+    result = deflection.DeflectionSimulator().deflect(*state, 0.001, 600, sim_kwargs=SIM_KWARGS)
+    for branch in ("baseline", "deflected"):
+        assert result[branch]["impacted"]
+        assert result[branch]["closest_approach_km"] == 0.0
+    assert result["closest_approach_change_km"] == 0.0
+    assert result["impact_avoided"] is False
+
+
+def _post_mitigate(body):
+    async def run():
+        transport = httpx.ASGITransport(app=asteroid_backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/mitigate", json=body)
+
+    return asyncio.run(run())
+
+
+def test_mitigate_rejects_a_lead_time_beyond_the_horizon():
+    body = {"diameter_km": 0.5, "velocity_km_s": 20, "years_before_impact": 5, "mode": "trajectory",
+            "initial_state": {"distance_km": 20000, "horizontal_velocity_km_s": 1.5,
+                              "vertical_velocity_km_s": -3},
+            "horizon_hours": 6}
+    response = _post_mitigate(body)
+    assert response.status_code == 400
+    assert "horizon" in response.json()["detail"]
@@ -0,0 +1,244 @@
+import asyncio
+import functools
+import os
+import time
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import asteroid_backend
+import executors
+import physics
+
+
+@pytest.fixture
+def pool():
+    pool = executors.Executors(cpu_workers=2, cpu_queue_depth=2)
+    yield pool
+    pool.shutdown()
+
+
+class _DisconnectingRequest:
+    # Gövde okunduktan sonra delay saniye içinde ayrılan istemci
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def receive(self):
+        await asyncio.sleep(self.delay)
+        return {"type": "http.disconnect"}
+
+
+def test_full_cpu_queue_is_rejected_with_503(pool):
+    async def run():
+        first = asyncio.ensure_future(pool.run_cpu(functools.partial(time.sleep, 0.5)))
+        second = asyncio.ensure_future(pool.run_cpu(functools.partial(time.sleep, 0.5)))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as info:
+            await pool.run_cpu(functools.partial(time.sleep, 0))
+        await asyncio.gather(first, second)
+        # Yer açılınca yeni istek kabul edilir
+        await pool.run_cpu(functools.partial(time.sleep, 0))
+        return info.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == str(executors.RETRY_AFTER_S)
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+def test_client_disconnect_returns_499_and_cancels_pending_parts(pool):
+    async def run():
+        with pytest.raises(HTTPException) as info:
+            await pool.map_cpu(time.sleep, [(0.3,)] * 8, _DisconnectingRequest(0.1))
+        return info.value
+
+    start = time.monotonic()
+    error = asyncio.run(run())
+    assert error.status_code == 499
+    # Çalışmakta olan parça beklenmez, başlamamış parçalar iptal edilir
+    assert time.monotonic() - start < 2.4
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+def test_reserved_slot_counts_against_the_queue(pool):
+    async def run():
+        release = [pool.reserve_cpu(), pool.reserve_cpu()]
+        with pytest.raises(HTTPException) as info:
+            pool.reserve_cpu()
+        # Ayrılmış yerle gönderilen parçalar yeniden kabulden geçmez
+        await pool.run_reserved(functools.partial(time.sleep, 0))
+        release.pop()()
+        await pool.run_cpu(functools.partial(time.sleep, 0))
+        release.pop()()
+        return info.value
+
+    assert asyncio.run(run()).status_code == 503
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+def test_bulk_parts_leave_a_worker_for_single_jobs():
+    pool = executors.Executors(cpu_workers=2, cpu_queue_depth=4)
+    running = []
+
+    async def watch():
+        while True:
+            running.append(pool.stats()["bulk_running"])
+            await asyncio.sleep(0.01)
+
+    async def run():
+        # İşçileri önceden başlat; spawn açılış süresi ölçümü bozmasın
+        await asyncio.gather(*(pool.run_cpu(functools.partial(time.sleep, 0.2)) for _ in range(2)))
+        watcher = asyncio.ensure_future(watch())
+        ensembles = [asyncio.ensure_future(pool.map_cpu(time.sleep, [(0.3,)] * 3)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        await pool.run_cpu(functools.partial(time.sleep, 0))
+        single = time.monotonic() - start
+        await asyncio.gather(*ensembles)
+        watcher.cancel()
+        return single
+
+    assert pool.bulk_workers == 1
+    try:
+        single = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert max(running) == 1
+    assert single < 0.25
+
+
+def _stream_body():
+    return {"distance_km": 20000, "horizontal_velocity_km_s": 1.5, "vertical_velocity_km_s": -3,
+            "dt": 5, "chunk_size": 256, "first_chunk_size": 16}
+
+
+def _post_stream(body, headers=None):
+    async def run():
+        transport = httpx.ASGITransport(app=asteroid_backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/trajectory/stream", json=body, headers=headers)
+
+    return asyncio.run(run())
+
+
+def test_stream_is_rejected_before_streaming_when_queue_is_full(pool, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    release = [pool.reserve_cpu(), pool.reserve_cpu()]
+    response = _post_stream(_stream_body())
+    for free in release:
+        free()
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def test_stream_chunks_match_the_full_trajectory(pool, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    body = _stream_body()
+    response = _post_stream(body)
+    assert response.status_code == 200
+    messages = [asteroid_backend.json.loads(line) for line in response.text.splitlines()]
+    assert pool.stats()["cpu_in_flight"] == 0
+
+    position0, velocity0 = physics.initial_state(0, 0, 2e7, 1500, -3000, 0)
+    traj, info = physics.simulate_trajectory(position0, velocity0, dt=body["dt"], max_steps=100000,
+                                             escape_radius=asteroid_backend.ESCAPE_RADIUS)
+    chunks = [m for m in messages if m["type"] == "chunk"]
+    assert len(chunks[0]["step_indices"]) == body["first_chunk_size"]
+    steps = np.concatenate([m["step_indices"] for m in chunks])
+    assert np.array_equal(steps, np.arange(traj.size))
+    times = np.concatenate([m["times_s"] for m in chunks])
+    np.testing.assert_allclose(times, np.round(traj["t"], 3))
+    assert messages[-1]["type"] == "done"
+    assert messages[-1]["crashed"] == info["crashed"]
+    assert messages[-1]["total_steps"] == info["steps"]
+
+
+def test_broken_pool_is_shut_down_and_replaced(pool):
+    async def run():
+        await pool.run_cpu(functools.partial(time.sleep, 0))
+        broken = pool._cpu
+        with pytest.raises(executors.BrokenProcessPool):
+            await pool.run_cpu(functools.partial(os._exit, 1))
+        assert pool._cpu is None
+        # Kırık havuz kapatılmış olmalı; süreç ve kuyruk referansları bırakılır, sızıntı kalmaz
+        assert broken._processes is None and broken._call_queue is None
+        assert await pool.run_cpu(functools.partial(abs, -3)) == 3
+        return broken
+
+    broken = asyncio.run(run())
+    assert pool._cpu is not broken
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+def test_reserved_slot_is_released_once():
+    pool = executors.Executors(cpu_workers=1, cpu_queue_depth=2)
+    release = pool.reserve_cpu()
+    other = pool.reserve_cpu()
+    release()
+    release()
+    assert pool.stats()["cpu_in_flight"] == 1
+    other()
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+class _StreamRequest:
+    headers = {}
+
+    async def is_disconnected(self):
+        return False
+
+
+def test_stream_slot_is_released_when_the_body_is_never_read(pool, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    request = asteroid_backend.TrajectoryStreamRequest(**_stream_body())
+
+    async def run():
+        response = await asteroid_backend.stream_trajectory(request, _StreamRequest())
+        assert pool.stats()["cpu_in_flight"] == 1
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            await asyncio.sleep(0)
+
+        # İstemci gövdenin ilk parçasından önce ayrılır: üreteç hiç başlamaz
+        await response({"type": "http", "asgi": {"spec_version": "2.0"}}, receive, send)
+
+    asyncio.run(run())
+    assert pool.stats()["cpu_in_flight"] == 0
+
+
+def _falling_stream_body(**overrides):
+    # Radyal düşüş: birkaç yüz adımda çarpar, akış hızlı biter
+    return dict(_stream_body(), vertical_velocity_km_s=0, z_velocity_km_s=3, **overrides)
+
+
+def test_stream_stride_keeps_chunk_boundaries(pool, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    body = _falling_stream_body(stride=10, chunk_size=64)
+    messages = [asteroid_backend.json.loads(line) for line in _post_stream(body).text.splitlines()]
+    chunks = [m["step_indices"] for m in messages if m["type"] == "chunk"]
+    assert len(chunks) > 2
+    # Her parçanın ilk ve son satırı gönderilir; aradaki satırlar stride ile seyreltilir
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk[0] == previous[-1] + 1
+    for chunk in chunks:
+        assert np.diff(chunk).max() <= body["stride"]
+    assert chunks[0][0] == 0
+    assert chunks[-1][-1] == messages[-1]["total_steps"]
+    assert messages[-1]["crashed"]
+
+
+def test_stream_uses_server_sent_events_when_requested(pool, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    response = _post_stream(_falling_stream_body(), headers={"Accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert all(event.startswith("event: ") and data.startswith("data: ") for event, data in events)
+    assert [event for event, _ in events][-1] == "event: done"
+    assert {event for event, _ in events[:-1]} == {"event: chunk"}
+    done = asteroid_backend.json.loads(events[-1][1][len("data: "):])
+    assert done["type"] == "done" and done["crashed"]
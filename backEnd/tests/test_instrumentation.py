@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import asteroid_backend
+import instrumentation
+
+
+def _get(app, path):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(run())
+
+
+def _app(**middleware):
+    app = FastAPI()
+    app.add_middleware(instrumentation.TimingMiddleware, **middleware)
+
+    @app.get("/work/{item}")
+    async def work(item: str):
+        with instrumentation.span("fetch"):
+            time.sleep(0.02)
+        with instrumentation.span("build"):
+            pass
+        with instrumentation.span("fetch"):
+            time.sleep(0.01)
+        return {"item": item}
+
+    return app
+
+
+def _server_timing(response):
+    stages = {}
+    for part in response.headers["server-timing"].split(", "):
+        name, _, duration = part.partition(";dur=")
+        stages[name] = float(duration)
+    return stages
+
+
+def test_server_timing_header_sums_repeated_stages():
+    response = _get(_app(), "/work/a")
+    assert response.status_code == 200
+    stages = _server_timing(response)
+    assert list(stages) == ["fetch", "build", "total"]
+    assert stages["fetch"] >= 30
+    assert stages["total"] >= stages["fetch"] + stages["build"]
+    assert response.headers["timing-allow-origin"] == "*"
+
+
+def test_span_outside_a_request_only_records_the_histogram():
+    with instrumentation.span("test_outside_request"):
+        pass
+    assert 'request_stage_duration_seconds_count{stage="test_outside_request"} 1' in instrumentation.render_metrics()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = instrumentation.Histogram("test_seconds", "Test", ("kind",), buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, kind="a")
+        lines = histogram.render()
+    finally:
+        instrumentation.REGISTRY.remove(histogram)
+    assert 'test_seconds_bucket{kind="a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{kind="a",le="1"} 3' in lines
+    assert 'test_seconds_bucket{kind="a",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{kind="a"} 4' in lines
+    assert 'test_seconds_sum{kind="a"} 6.05' in lines
+
+
+def test_metrics_endpoint_counts_requests_by_route_template():
+    _get(asteroid_backend.app, "/api/cache/stats")
+    response = _get(asteroid_backend.app, "/metrics")
+    assert response.headers["content-type"] == instrumentation.CONTENT_TYPE
+    body = response.text
+    assert "# TYPE http_requests_total counter" in body
+    assert 'http_requests_total{method="GET",route="/api/cache/stats",status="200"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/cache/stats"}' in body
+
+
+def test_slow_requests_write_a_folded_profile(tmp_path):
+    app = _app(slow_ms=10, profile_dir=str(tmp_path))
+    _get(app, "/work/slow")
+    profiles = list(tmp_path.iterdir())
+    assert len(profiles) == 1
+    assert profiles[0].name.endswith(".folded") and "GET-work_item" in profiles[0].name
+    stacks = profiles[0].read_text().splitlines()
+    assert stacks and all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    # Örnekler span açan iş parçacığından alınır; uyuyan endpoint yığında görünür
+    assert any("work" in line for line in stacks)
+
+
+def test_fast_requests_are_not_profiled(tmp_path):
+    _get(_app(slow_ms=10000, profile_dir=str(tmp_path)), "/work/fast")
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+import physics
+
+# asteroidAnimation'daki örnek durum: RK4 (dt=0.5) ile 8160. adımda, dopri5 ile 74. adımda çarpar
+POSITION0 = np.array([0.0, 1e7, 0.0])
+VELOCITY0 = np.array([5000.0, 2000.0, 200.0])
+IMPACT_STEP = {"rk4": 8160, "dopri5": 74}
+
+
+@pytest.mark.parametrize("method", physics.INTEGRATORS)
+def test_impact_on_last_allowed_step_is_recorded(method):
+    max_steps = IMPACT_STEP[method]
+    traj, info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=max_steps, method=method)
+    assert info["crashed"]
+    assert info["impact"] is not None
+    assert traj.size == max_steps + 1
+    assert np.linalg.norm(traj["pos"][-1]) == pytest.approx(physics.R_EARTH, abs=1e-2)
+
+    chunks = list(physics.simulate_chunks(POSITION0, VELOCITY0, max_steps=max_steps, method=method, chunk_size=1000))
+    assert sum(chunk.size for chunk in chunks) == traj.size
+    np.testing.assert_array_equal(np.concatenate(chunks)["pos"], traj["pos"])
+
+
+@pytest.mark.parametrize("method", physics.INTEGRATORS)
+def test_step_limit_before_impact(method):
+    max_steps = IMPACT_STEP[method] - 1
+    traj, info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=max_steps, method=method)
+    assert not info["crashed"]
+    assert info["impact"] is None
+    assert traj.size == max_steps
+
+
+def _mixed_bodies(n=15, seed=0):
+    # Yarısı çarpmaya, yarısı kaçışa yakın başlangıç durumları
+    rng = np.random.default_rng(seed)
+    positions = POSITION0 + rng.normal(0, 5e5, (2 * n, 3))
+    velocities = np.vstack([VELOCITY0 + rng.normal(0, 500, (n, 3)),
+                            np.array([5000.0, 9000.0, 200.0]) + rng.normal(0, 1500, (n, 3))])
+    return positions, velocities
+
+
+@pytest.mark.parametrize("method", physics.INTEGRATORS)
+@pytest.mark.parametrize("limits", [
+    # Adım/süre sınırının kaçış yarıçapıyla aynı adımda dolduğu durumlar
+    {"t_max": 1800.0, "escape_radius": 2e7, "max_steps": 100000},
+    {"dt": 20.0, "max_steps": 60, "escape_radius": 2e7},
+    {"dt": 3.0, "max_steps": 300, "t_max": 900.0, "escape_radius": 1.5e7},
+    # Çarpma ve kaçışların birlikte görüldüğü durumlar
+    {"t_max": 3000.0, "escape_radius": 2e7, "max_steps": 100000},
+    {"dt": 20.0, "max_steps": 200, "escape_radius": 2e7},
+    {"dt": 4.0, "max_steps": 1000, "t_max": 3000.0, "escape_radius": 1.5e7},
+    {"dt": 5.0, "max_steps": 1000, "escape_radius": 2e7, "refine_impact": False},
+])
+def test_batch_matches_scalar_flag_by_flag(method, limits):
+    positions, velocities = _mixed_bodies()
+    batch = physics.simulate_batch(positions, velocities, method=method, **limits)
+    assert batch["escaped"].any()
+    for i in range(len(positions)):
+        *_, info = physics.simulate(positions[i], velocities[i], method=method, **limits)
+        assert batch["crashed"][i] == info["crashed"], i
+        assert batch["escaped"][i] == info["escaped"], i
+        assert batch["steps"][i] == info["steps"], i
+        assert batch["time"][i] == pytest.approx(info["time"], rel=1e-7), i
+        if info["crashed"]:
+            # İki yol da geçişi event_tol (1 mm) içinde bulur; bulunan nokta kayan nokta düzeyinde farklı olabilir
+            assert batch["impact"]["time"][i] == pytest.approx(info["impact"]["time"], rel=1e-7), i
+            assert batch["impact"]["angle"][i] == pytest.approx(info["impact"]["angle"], abs=1e-4), i
+
+
+def test_simulate_returns_views_of_the_trajectory_buffer():
+    x, y, z, vel, acc, info = physics.simulate(POSITION0, VELOCITY0, max_steps=500)
+    assert x.shape == vel[:, 0].shape == (info["steps"],)
+    # Sütunlar aynı yapılandırılmış tamponu paylaşır, adım başına kopya yapılmaz
+    assert x.base is not None and np.may_share_memory(x, acc)
+    assert vel.dtype == np.float64 and vel.shape[1] == acc.shape[1] == 3
+
+
+@pytest.mark.parametrize("method", physics.INTEGRATORS)
+def test_propagate_matches_the_full_trajectory(method):
+    traj, info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method=method)
+    final = physics.propagate(POSITION0, VELOCITY0, chunk_size=100, max_steps=20000, method=method)
+    assert final["steps"] == info["steps"]
+    assert final["nfev"] == info["nfev"]
+    assert final["impact"] == info["impact"]
+
+
+@pytest.mark.parametrize("method", physics.INTEGRATORS)
+def test_time_span_stops_on_the_first_step_reaching_t_max(method):
+    t_max = 600.0
+    traj, info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method=method, t_max=t_max)
+    assert not info["crashed"]
+    # Kayıtlı satırlar t_max'tan öncedir; son adım t_max'a ulaşınca entegrasyon durur
+    assert info["time"] >= t_max > traj["t"][-1]
+    assert traj.size == info["steps"]
+    assert physics.propagate(POSITION0, VELOCITY0, max_steps=20000, method=method, t_max=t_max) == info
+
+
+def _relative_energy_drift(traj):
+    r = np.linalg.norm(traj["pos"], axis=1)
+    energy = 0.5 * np.einsum("ij,ij->i", traj["vel"], traj["vel"]) - physics.G * physics.M / r
+    return np.abs((energy - energy[0]) / energy[0]).max()
+
+
+def test_dopri5_matches_rk4_impact_with_far_fewer_evaluations():
+    rk4, rk4_info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method="rk4")
+    dopri5, dopri5_info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method="dopri5")
+    assert rk4_info["crashed"] and dopri5_info["crashed"]
+    # Varsayılan toleranslarla çarpma noktası metre altı, süre milisaniye altı uyuşur
+    np.testing.assert_allclose(dopri5["pos"][-1], rk4["pos"][-1], atol=1.0)
+    assert dopri5_info["impact"]["time"] == pytest.approx(rk4_info["impact"]["time"], abs=1e-3)
+    assert dopri5_info["impact"]["angle"] == pytest.approx(rk4_info["impact"]["angle"], abs=1e-6)
+    assert _relative_energy_drift(dopri5) < 1e-9
+    assert dopri5_info["nfev"] * 20 < rk4_info["nfev"]
+
+
+def test_dopri5_tolerance_controls_the_error():
+    _, reference = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method="rk4")
+    errors, nfev = [], []
+    for rtol in (1e-6, 1e-10):
+        _, info = physics.simulate_trajectory(POSITION0, VELOCITY0, max_steps=20000, method="dopri5", rtol=rtol)
+        errors.append(abs(info["impact"]["time"] - reference["impact"]["time"]))
+        nfev.append(info["nfev"])
+    assert errors[1] < errors[0]
+    assert nfev[0] < nfev[1]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import land_mask
+
+LAND = {
+    "Paris": (48.86, 2.35),
+    "Denver": (39.74, -104.99),
+    "Nairobi": (-1.29, 36.82),
+    "Ulaanbaatar": (47.89, 106.91),
+    "Brasília": (-15.79, -47.88),
+    "Alice Springs": (-23.70, 133.88),
+}
+OCEAN = {
+    "Central Pacific": (0.0, -150.0),
+    "North Atlantic": (30.0, -40.0),
+    "Indian Ocean": (-30.0, 80.0),
+    "Southern Ocean": (-55.0, -120.0),
+    "Tasman Sea": (-40.0, 160.0),
+}
+
+
+@pytest.fixture(scope="module")
+def mask():
+    return land_mask.default_mask()
+
+
+@pytest.mark.parametrize("name", sorted(LAND))
+def test_land_spot_points(mask, name):
+    assert mask.is_land(*LAND[name])
+    assert mask.is_ocean(*LAND[name]) is False
+
+
+@pytest.mark.parametrize("name", sorted(OCEAN))
+def test_ocean_spot_points(mask, name):
+    assert mask.is_ocean(*OCEAN[name]) is True
+
+
+def test_array_queries_and_wrapped_longitudes(mask):
+    lat, lon = np.array(list(LAND.values()) + list(OCEAN.values())).T
+    expected = np.array([False] * len(LAND) + [True] * len(OCEAN))
+    assert np.array_equal(mask.is_ocean(lat, lon), expected)
+    # impact_metadata boylamları (-360, 0] aralığında gelir
+    assert np.array_equal(mask.is_ocean(lat, lon - 360), expected)
+    assert np.array_equal(mask.is_ocean(lat, lon + 360), expected)
+
+
+def test_ocean_fraction_is_earth_like(mask):
+    assert 0.69 < mask.ocean_fraction() < 0.73
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    with open(land_mask.DEFAULT_PATH, "rb") as f:
+        data = f.read()
+    path = tmp_path / "short.bin"
+    path.write_bytes(data[:land_mask.HEADER.size + 16])
+    with pytest.raises(ValueError):
+        land_mask.LandMask.load(str(path))
+    path.write_bytes(b"XXXX" + data[4:land_mask.HEADER.size])
+    with pytest.raises(ValueError):
+        land_mask.LandMask.load(str(path))
@@ -0,0 +1,85 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import asteroid_backend
+import mitigation
+
+
+def _dominated(objectives, i):
+    other = np.delete(objectives, i, axis=0)
+    return bool(np.any(np.all(other >= objectives[i], axis=1) & np.any(other > objectives[i], axis=1)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pareto_front_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    # Az sayıda farklı değer: eşitlikler ve tekrar eden satırlar bol
+    objectives = rng.integers(0, 6, (300, 3)).astype(float)
+    mask = mitigation.pareto_front(objectives)
+    expected = np.array([not _dominated(objectives, i) for i in range(len(objectives))])
+    # Eşit satırlardan yalnızca ilki cephede kalır
+    _, first = np.unique(objectives, axis=0, return_index=True)
+    expected &= np.isin(np.arange(len(objectives)), first)
+    np.testing.assert_array_equal(mask, expected)
+
+
+def test_pareto_front_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        mitigation.pareto_front(np.zeros((4, 2)))
+
+
+def test_array_formulas_match_scalar_calls():
+    years = np.array([1.0, 5.0, 20.0])
+    mass = mitigation.asteroid_mass(0.3)
+    vector = mitigation.kinetic_impactor(mass, years, 800, mitigation.IMPACTOR_VELOCITY_M_S, 3.0)
+    for i, year in enumerate(years.tolist()):
+        scalar = mitigation.kinetic_impactor(mass, year, 800, mitigation.IMPACTOR_VELOCITY_M_S, 3.0)
+        np.testing.assert_allclose([np.broadcast_to(column, years.shape)[i] for column in vector], scalar)
+    required, probability, cost = mitigation.gravity_tractor(0.3, years)
+    assert probability.tolist() == [mitigation.gravity_tractor(0.3, y)[1] for y in years.tolist()]
+
+
+def _post(path, body):
+    async def run():
+        transport = httpx.ASGITransport(app=asteroid_backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=body)
+
+    return asyncio.run(run())
+
+
+def test_plan_front_is_non_dominated_and_matches_single_requests():
+    asteroid_backend.response_cache.clear()
+    body = {"diameter_km": 0.3, "velocity_km_s": 20, "lead_times_years": [1, 2, 5, 10, 20],
+            "impactor_masses_kg": [500, 1000], "betas": [1.0, 2.0]}
+    payload = _post("/api/mitigate/plan", body).json()
+    front = payload["front"]
+    assert payload["candidates"] == 5 * 2 * 2 + 5
+    assert payload["front_size"] == len(front["method"]) > 0
+
+    deflection = [-np.inf if d is None else d for d in front["deflection_distance_km"]]
+    objectives = np.column_stack((-np.array(front["mission_cost_billion_usd"]), front["success_probability"],
+                                  deflection))
+    assert not any(_dominated(objectives, i) for i in range(len(objectives)))
+    # Sıralama: maliyet artan, eşit maliyette olasılık azalan
+    assert front["mission_cost_billion_usd"] == sorted(front["mission_cost_billion_usd"])
+
+    for i, method in enumerate(front["method"]):
+        if method != "kinetic_impactor" or front["impactor_mass_kg"][i] != 500 or front["beta"][i] != 2.0:
+            continue
+        single = _post("/api/mitigate", {"diameter_km": 0.3, "velocity_km_s": 20,
+                                         "years_before_impact": front["years_before_impact"][i]}).json()
+        for key in ("delta_v_m_s", "deflection_distance_km", "success_probability", "mission_cost_billion_usd",
+                    "success"):
+            assert front[key][i] == single[key], key
+
+
+@pytest.mark.parametrize("override", [{"methods": ["laser"]}, {"methods": []}, {"betas": []},
+                                      {"lead_times_years": [0, 1]},
+                                      {"lead_times_years": list(range(1, 201)), "impactor_masses_kg": list(range(1, 201))}])
+def test_plan_rejects_invalid_grids(override):
+    body = dict({"diameter_km": 0.3, "velocity_km_s": 20}, **override)
+    assert _post("/api/mitigate/plan", body).status_code == 400
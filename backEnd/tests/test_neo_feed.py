@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import neo_feed
+
+
+def _client(handler, **kwargs):
+    return neo_feed.NasaClient("http://nasa.test", "key", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_long_retry_after_raises_without_waiting():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    async def run():
+        client = _client(handler, timeout=5)
+        try:
+            await client.fetch_feed("2025-01-01", "2025-01-03")
+        finally:
+            await client.close()
+
+    start = time.monotonic()
+    with pytest.raises(neo_feed.RateLimited) as info:
+        asyncio.run(run())
+    assert time.monotonic() - start < 1
+    assert info.value.retry_after == 3600
+    assert len(calls) == 1
+
+
+def test_short_retry_after_is_retried():
+    responses = [httpx.Response(429, headers={"Retry-After": "0.01"}),
+                 httpx.Response(200, json={"near_earth_objects": {"2025-01-01": [{"id": "1"}]}})]
+
+    async def run():
+        client = _client(lambda request: responses.pop(0))
+        try:
+            return await client.fetch_feed("2025-01-01", "2025-01-01")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run())["element_count"] == 1
+    assert not responses
+
+
+class _Loader:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self, start_date, end_date):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise httpx.ConnectTimeout("upstream down")
+        return {"range": (start_date, end_date), "call": self.calls}
+
+
+async def _wave(cache, size=10, key=("2025-01-01", "2025-01-07")):
+    return await asyncio.gather(*(cache.get(key) for _ in range(size)), return_exceptions=True)
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    loader = _Loader()
+    cache = neo_feed.FeedCache(loader)
+
+    results = asyncio.run(_wave(cache))
+    assert loader.calls == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats["misses"] == 10
+
+
+def test_stale_value_is_served_while_refreshing():
+    loader = _Loader()
+    cache = neo_feed.FeedCache(loader, ttl=0, stale_ttl=60)
+
+    async def run():
+        first = await cache.get(("a", "b"))
+        stale = await cache.get(("a", "b"))
+        await asyncio.sleep(0.05)  # arka plan yenilemesi
+        return first, stale, await cache.get(("a", "b"))
+
+    first, stale, refreshed = asyncio.run(run())
+    assert stale == first
+    assert refreshed["call"] == 2
+    assert cache.stats["stale_hits"] == 2
+
+
+def test_failures_are_cached_across_waves():
+    loader = _Loader(fail=True)
+    cache = neo_feed.FeedCache(loader, error_ttl=60)
+
+    async def run():
+        return [await _wave(cache) for _ in range(5)]
+
+    waves = asyncio.run(run())
+    assert loader.calls == 1
+    assert all(isinstance(result, httpx.ConnectTimeout) for wave in waves for result in wave)
+    assert cache.stats["failed_fast"] == 4
+
+
+def test_failure_serves_stale_value_and_retries_after_cooldown():
+    loader = _Loader()
+    cache = neo_feed.FeedCache(loader, ttl=0, stale_ttl=0, error_ttl=0.05)
+
+    async def run():
+        good = await cache.get(("a", "b"))
+        loader.fail = True
+        during_outage = [await cache.get(("a", "b")) for _ in range(3)]
+        calls_during_outage = loader.calls
+        await asyncio.sleep(0.06)
+        loader.fail = False
+        return good, during_outage, calls_during_outage, await cache.get(("a", "b"))
+
+    good, during_outage, calls_during_outage, recovered = asyncio.run(run())
+    assert during_outage == [good] * 3
+    assert calls_during_outage == 2
+    assert recovered["call"] == 3
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import neo_store
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "neo_feed.json")
+# Fikstür 2025-09-28 .. 2025-10-05 günlerini kapsar; "bugün" bunlardan uzak tutulur (son gün yenilemesi yok)
+TODAY = "2026-01-01"
+
+
+@pytest.fixture
+def fixture_feed():
+    return neo_store.load_fixture(FIXTURE)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = neo_store.NeoStore(str(tmp_path / "catalogue.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_store_is_not_created_until_first_use(tmp_path):
+    path = tmp_path / "catalogue.sqlite3"
+    store = neo_store.NeoStore(str(path))
+    assert not path.exists()
+    assert store.missing_ranges("2025-09-28", "2025-09-28", today=TODAY) == [("2025-09-28", "2025-09-28")]
+    assert path.exists()
+    store.close()
+
+
+def test_missing_ranges_are_split_into_feed_sized_chunks(store):
+    assert store.missing_ranges("2025-09-28", "2025-10-12", today=TODAY) == [
+        ("2025-09-28", "2025-10-04"), ("2025-10-05", "2025-10-11"), ("2025-10-12", "2025-10-12"),
+    ]
+
+
+def test_ingest_marks_days_synced_and_round_trips_feed(store, fixture_feed):
+    data = neo_store.fixture_feed(fixture_feed, "2025-09-30", "2025-10-02")
+    assert store.ingest(data, "2025-09-30", "2025-10-02") == data["element_count"]
+
+    assert store.missing_ranges("2025-09-28", "2025-10-05", today=TODAY) == [
+        ("2025-09-28", "2025-09-29"), ("2025-10-03", "2025-10-05"),
+    ]
+    assert store.feed("2025-09-30", "2025-10-02") == data
+
+
+def test_sync_fetches_only_missing_days(store, fixture_feed):
+    fetched = []
+
+    def fetch(start, end):
+        fetched.append((start, end))
+        return neo_store.fixture_feed(fixture_feed, start, end)
+
+    assert store.sync("2025-09-28", "2025-10-05", fetch, today=TODAY) == 2
+    assert store.sync("2025-09-28", "2025-10-05", fetch, today=TODAY) == 0
+    assert fetched == [("2025-09-28", "2025-10-04"), ("2025-10-05", "2025-10-05")]
+    assert store.feed("2025-09-28", "2025-10-05")["element_count"] == fixture_feed["element_count"]
+
+
+def test_recent_days_are_resynced_after_ttl(store, fixture_feed):
+    data = neo_store.fixture_feed(fixture_feed, "2025-10-04", "2025-10-05")
+    store.ingest(data, "2025-10-04", "2025-10-05")
+    assert store.missing_ranges("2025-10-04", "2025-10-05", today="2025-10-05") == []
+    store.recent_ttl = -1
+    assert store.missing_ranges("2025-10-04", "2025-10-05", today="2025-10-05") == [("2025-10-04", "2025-10-05")]
+
+
+def test_query_filters_and_sorts(store, fixture_feed):
+    store.ingest(fixture_feed, "2025-09-28", "2025-10-05")
+    rows = store.query(sort="diameter", limit=100)
+    assert len(rows) == fixture_feed["element_count"]
+    diameters = [row["diameter_km"] for row in rows]
+    assert diameters == sorted(diameters, reverse=True)
+    hazardous = store.query(hazardous=True)
+    assert all(row["is_potentially_hazardous"] for row in hazardous)
+    with pytest.raises(ValueError):
+        store.query(sort="name")
@@ -0,0 +1,79 @@
+import asyncio
+
+from pydantic import BaseModel
+
+import response_cache
+
+
+class Impact(BaseModel):
+    diameter_km: float
+    velocity_km_s: float
+    method: str = "kinetic_impactor"
+
+
+def _dump(request):
+    return request.model_dump()
+
+
+def _cache(**kwargs):
+    return response_cache.ResponseCache(quantization={"diameter_km": 0.01, "velocity_km_s": 0.5}, **kwargs)
+
+
+def test_parse_quantization():
+    assert response_cache.parse_quantization(" diameter_km=0.001, velocity_km_s=0.5,") == \
+        {"diameter_km": 0.001, "velocity_km_s": 0.5}
+    assert response_cache.parse_quantization(None) == {}
+
+
+def test_nearby_inputs_share_a_key_and_are_computed_from_the_rounded_request():
+    cache = _cache()
+    seen = []
+
+    def compute(request):
+        seen.append(request)
+        return request.model_dump()
+
+    first = cache.respond("simulate", Impact(diameter_km=0.1234, velocity_km_s=17.1), compute)
+    second = cache.respond("simulate", Impact(diameter_km=0.1211, velocity_km_s=16.9), compute)
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+    assert first.body == second.body
+    # Yuvarlama ondalık adımla yapılır: 0.12, 0.11999999 değil
+    assert seen == [Impact(diameter_km=0.12, velocity_km_s=17.0)]
+
+
+def test_fields_without_a_step_and_other_endpoints_are_kept_apart():
+    cache = _cache()
+    request = Impact(diameter_km=0.12, velocity_km_s=17.0)
+    keys = {cache.quantize("simulate", request)[0],
+            cache.quantize("simulate", request.model_copy(update={"method": "gravity_tractor"}))[0],
+            cache.quantize("mitigate", request)[0]}
+    assert len(keys) == 3
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = _cache(max_entries=2)
+    for diameter in (0.1, 0.2, 0.1, 0.3):
+        cache.respond("simulate", Impact(diameter_km=diameter, velocity_km_s=17), _dump)
+    assert cache.stats["evictions"] == 1
+    # 0.1 yeniden kullanıldığı için 0.2 çıkarılır
+    cache.respond("simulate", Impact(diameter_km=0.1, velocity_km_s=17), _dump)
+    cache.respond("simulate", Impact(diameter_km=0.2, velocity_km_s=17), _dump)
+    assert cache.stats["hits"] == 2
+    assert cache.info()["entries"] == 2
+
+
+def test_async_compute_is_cached():
+    cache = _cache()
+    calls = []
+
+    async def compute(request):
+        calls.append(request)
+        return {"ok": True}
+
+    async def run():
+        for velocity in (20.1, 19.9):
+            await cache.respond_async("mitigate", Impact(diameter_km=1, velocity_km_s=velocity), compute)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert cache.stats["hits"] == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import physics
+import simplify
+
+
+@pytest.fixture(scope="module")
+def path():
+    # Yüzeye inen eğri bir yol; son satır çarpma noktasıdır
+    position0, velocity0 = physics.initial_state(0, 0, 2e7, 1500, 0, 3000)
+    traj, info = physics.simulate_trajectory(position0, velocity0, dt=1.0, max_steps=100000)
+    assert info["crashed"]
+    return traj["pos"]
+
+
+@pytest.mark.parametrize("kwargs", [{"max_points": 2}, {"max_points": 40}, {"tolerance": 1e3},
+                                    {"tolerance": 1e3, "max_points": 10}])
+def test_first_and_impact_points_are_always_kept(path, kwargs):
+    indices = simplify.simplify_indices(path, **kwargs)
+    assert indices[0] == 0 and indices[-1] == len(path) - 1
+    assert np.all(np.diff(indices) > 0)
+    if "max_points" in kwargs:
+        assert len(indices) <= kwargs["max_points"]
+
+
+@pytest.mark.parametrize("tolerance", [1e5, 1e4, 1e3, 10.0])
+def test_tolerance_bounds_the_deviation(path, tolerance):
+    indices = simplify.simplify_indices(path, tolerance=tolerance)
+    assert simplify.max_deviation(path, indices) <= tolerance
+    assert len(indices) < len(path)
+
+
+def test_smaller_tolerance_keeps_more_points(path):
+    counts = [len(simplify.simplify_indices(path, tolerance=t)) for t in (1e5, 1e3, 10.0)]
+    assert counts == sorted(counts) and counts[0] < counts[-1]
+
+
+def test_max_points_caps_a_tolerance_that_is_too_tight(path):
+    indices = simplify.simplify_indices(path, tolerance=1e-6, max_points=25)
+    assert len(indices) == 25
+
+
+def test_short_inputs_and_invalid_limits():
+    assert simplify.simplify_indices(np.zeros((2, 3))).tolist() == [0, 1]
+    assert simplify.simplify_indices(np.eye(3), max_points=5).tolist() == [0, 1, 2]
+    with pytest.raises(ValueError):
+        simplify.simplify_indices(np.eye(3), max_points=1)
+
+
+def test_closed_loop_keeps_the_far_side():
+    # Uçları çakışan döngü: doğru yerine doğru parçası mesafesi kullanıldığı için karşı taraf seçilir
+    angle = np.linspace(0, 2 * np.pi, 101)
+    loop = np.column_stack([np.cos(angle), np.sin(angle), np.zeros_like(angle)])
+    indices = simplify.simplify_indices(loop, max_points=3)
+    assert indices.tolist() == [0, 50, 100]
@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import asteroid_backend
+import impact_batch
+
+BODY = {"diameter_km": 0.15, "velocity_km_s": 17.0, "impact_angle": 45, "impact_latitude": -33.87,
+        "impact_longitude": 151.21}
+
+
+def _post(path, body):
+    async def run():
+        transport = httpx.ASGITransport(app=asteroid_backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=body)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("body", [BODY, dict(BODY, density_kg_m3=0), dict(BODY, diameter_km=12, velocity_km_s=70)])
+def test_fast_returns_the_simulate_payload(body):
+    asteroid_backend.response_cache.clear()
+    fast = _post("/api/simulate/fast", body)
+    exact = _post("/api/simulate", body)
+    assert fast.status_code == exact.status_code == 200
+    assert fast.json() == exact.json()
+
+
+@pytest.mark.parametrize("path", ["/api/simulate", "/api/simulate/fast"])
+@pytest.mark.parametrize("override", [{"diameter_km": 0}, {"velocity_km_s": -1}, {"density_kg_m3": -1},
+                                      {"impact_angle": 0}, {"impact_angle": 120}])
+def test_invalid_inputs_are_rejected_with_400(path, override):
+    response = _post(path, dict(BODY, **override))
+    assert response.status_code == 400
+    assert response.json()["detail"] == asteroid_backend.IMPACT_INPUT_ERROR
+
+
+def test_scalar_and_vector_severity_agree():
+    megatons = np.array([0.5, 100, 100.01, 1e3, 1e3 + 1, 1e6, 2e6])
+    assert [asteroid_backend.severity(m) for m in megatons] == impact_batch.severity_np(megatons).tolist()
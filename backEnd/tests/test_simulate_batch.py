@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+import pytest
+
+import asteroid_backend
+import executors
+
+ROWS = {
+    "diameter_km": [0.02, 0.15, 1.0, 5.0, 12.0],
+    "velocity_km_s": [11.5, 17.0, 20.0, 30.0, 70.0],
+    "impact_angle": [90, 45, 30, 15, 60],
+    "impact_latitude": [40.71, 0.0, -33.87, 30.0, 85.0],
+    "impact_longitude": [-74.01, -150.0, 151.21, -40.0, 179.9],
+    "density_kg_m3": [3000, 0, 2600, 7800, 1500],
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    pool = executors.Executors(cpu_workers=1)
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+    asteroid_backend.response_cache.clear()
+
+    def post(path, body):
+        async def run():
+            transport = httpx.ASGITransport(app=asteroid_backend.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return [await http.post(path, json=item) for item in body] if isinstance(body, list) \
+                    else await http.post(path, json=body)
+        return asyncio.run(run())
+
+    yield post
+    pool.shutdown()
+
+
+def _column(payload, path):
+    for key in path:
+        payload = payload[key]
+    return payload
+
+
+def test_batch_matches_scalar_simulate_row_by_row(client):
+    response = client("/api/simulate/batch", ROWS)
+    assert response.status_code == 200
+    batch = response.json()
+    n = len(ROWS["diameter_km"])
+    assert batch["count"] == n
+
+    scalar = client("/api/simulate", [{name: values[i] for name, values in ROWS.items()} for i in range(n)])
+    fields = [
+        ("impact_energy", "megatons"), ("impact_energy", "kilotons"), ("crater", "diameter_km"),
+        ("crater", "depth_km"), ("crater", "airburst"), ("seismic", "magnitude"),
+        ("damage_zones", "blast_radius_km"), ("damage_zones", "thermal_radius_km"), ("damage_zones", "tsunami_risk"),
+        ("damage_zones", "population_exposed", "blast"), ("damage_zones", "population_exposed", "thermal"),
+        ("damage_zones", "estimated_casualties"), ("comparison", "severity"), ("comparison", "hiroshima_equivalent"),
+    ]
+    for i, row in enumerate(scalar):
+        assert row.status_code == 200
+        expected = row.json()
+        for path in fields:
+            assert _column(batch, path)[i] == _column(expected, path), (i, path)
+        assert batch["mass_kg"][i] == pytest.approx(expected["asteroid_params"]["mass_kg"], rel=1e-12)
+
+
+@pytest.mark.parametrize("column, value", [
+    ("diameter_km", 0.0), ("diameter_km", -1.0), ("velocity_km_s", 0.0), ("density_kg_m3", -5.0),
+    ("impact_angle", 0.0), ("impact_angle", 95.0),
+])
+def test_invalid_rows_are_rejected_with_400(client, column, value):
+    body = {name: list(values) for name, values in ROWS.items()}
+    body[column][3] = value
+    response = client("/api/simulate/batch", body)
+    assert response.status_code == 400
+    assert "invalid rows: [3]" in response.json()["detail"]
+
+
+def test_row_count_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(asteroid_backend, "SIMULATE_BATCH_MAX_ROWS", 4)
+    assert client("/api/simulate/batch", ROWS).status_code == 400
+    assert client("/api/simulate/batch", {"diameter_km": [], "velocity_km_s": []}).status_code == 400
+
+
+def test_mismatched_column_lengths_are_rejected(client):
+    body = dict(ROWS, velocity_km_s=ROWS["velocity_km_s"][:-1])
+    assert client("/api/simulate/batch", body).status_code == 400
@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import asteroid_backend
+import executors
+import physics
+
+# Yüzeyin 20000 km üstünden içeri düşen örnek durum
+BODY = {"distance_km": 20000, "horizontal_velocity_km_s": 1.5, "z_velocity_km_s": 3, "dt": 5}
+
+
+@pytest.fixture
+def post(monkeypatch):
+    pool = executors.Executors(cpu_workers=1)
+    monkeypatch.setattr(asteroid_backend, "executor_pool", pool)
+
+    def post(body, **params):
+        async def run():
+            transport = httpx.ASGITransport(app=asteroid_backend.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/api/trajectory", json=body, params=params)
+        return asyncio.run(run())
+
+    yield post
+    pool.shutdown()
+
+
+def _full_trajectory(body):
+    position0, velocity0 = physics.initial_state(0, 0, body["distance_km"] * 1000,
+                                                 body["horizontal_velocity_km_s"] * 1000,
+                                                 0, body["z_velocity_km_s"] * 1000)
+    return physics.simulate_trajectory(position0, velocity0, dt=body["dt"], max_steps=100000,
+                                       escape_radius=asteroid_backend.ESCAPE_RADIUS)
+
+
+def test_response_schema_and_metadata(post):
+    response = post(dict(BODY, max_points=50))
+    assert response.status_code == 200
+    payload = response.json()
+    assert set(payload) == {"crashed", "escaped", "total_steps", "dt", "method", "force_evaluations",
+                            "duration_s", "step_indices", "times_s", "positions_model", "impact"}
+
+    traj, info = _full_trajectory(BODY)
+    assert payload["crashed"] is info["crashed"] is True
+    assert payload["total_steps"] == info["steps"]
+    assert payload["method"] == "rk4" and payload["dt"] == BODY["dt"]
+    assert payload["impact"] == info["impact"]
+
+    n = len(payload["step_indices"])
+    assert 2 <= n <= 50
+    assert len(payload["times_s"]) == n
+    assert np.shape(payload["positions_model"]) == (n, 3)
+
+
+def test_downsampled_path_keeps_start_and_impact_point(post):
+    payload = post(dict(BODY, max_points=20)).json()
+    traj, _ = _full_trajectory(BODY)
+    steps = payload["step_indices"]
+    assert steps[0] == 0 and steps[-1] == traj.size - 1
+    assert steps == sorted(set(steps))
+    # Model birimleri: Dünya yarıçapı = 1, son nokta yüzeyde
+    np.testing.assert_allclose(payload["positions_model"], np.round(traj["pos"][steps] / physics.R_EARTH, 5))
+    assert np.linalg.norm(payload["positions_model"][-1]) == pytest.approx(1, abs=1e-5)
+
+
+@pytest.mark.parametrize("override", [{"dt": 0}, {"max_steps": 0}, {"max_points": 1}, {"downsample": "cubic"},
+                                      {"method": "euler"}, {"downsample": "rdp", "tolerance_km": -1}])
+def test_invalid_parameters_are_rejected(post, override):
+    assert post(dict(BODY, **override)).status_code == 400
+
+
+def test_unknown_field_group_is_rejected(post):
+    assert post(BODY, fields="pos,jerk").status_code == 400
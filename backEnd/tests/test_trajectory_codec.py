@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import physics
+import trajectory_codec
+
+META = {"crashed": False, "dt": 2.0}
+
+
+@pytest.fixture(scope="module")
+def traj():
+    position0, velocity0 = physics.initial_state(0, 0, 1.5e8, 400, -3000, 0)
+    traj, _ = physics.simulate_trajectory(position0, velocity0, dt=2.0, max_steps=20000)
+    return traj
+
+
+def test_round_trip_keeps_metadata_and_columns(traj):
+    indices = np.arange(0, traj.size, 7)
+    meta, values = trajectory_codec.decode(trajectory_codec.encode(traj, indices, META, groups=("pos", "vel")))
+    assert meta["crashed"] is False and meta["dt"] == 2.0
+    assert meta["fields"] == ["step", "t", "x", "y", "z", "vx", "vy", "vz"]
+    assert values.shape == (indices.size, 8)
+    assert np.array_equal(values[:, 0], indices)
+
+
+def test_plain_float32_error_is_half_an_ulp(traj):
+    indices = np.arange(traj.size)
+    _, values = trajectory_codec.decode(trajectory_codec.encode(traj, indices, META, groups=("pos",)))
+    bound = np.spacing(np.abs(traj["pos"]).astype(np.float32)) / 2
+    assert (np.abs(values[:, 2:5] - traj["pos"]) <= bound).all()
+
+
+def test_delta_error_stays_within_documented_bound(traj):
+    indices = np.arange(traj.size)
+    _, plain = trajectory_codec.decode(trajectory_codec.encode(traj, indices, META, groups=("pos",)))
+    meta, delta = trajectory_codec.decode(trajectory_codec.encode(traj, indices, META, delta=True, groups=("pos",)))
+    assert meta["origin"][2:5] == traj["pos"][0].tolist()
+    delta_error = np.abs(delta[:, 2:5] - traj["pos"]).max()
+    # Birikimli yuvarlama: 2e4 satırda 0.15 m'nin altında, mutlak float32'den (metreler) çok daha küçük
+    assert delta_error < 0.15
+    assert delta_error < np.abs(plain[:, 2:5] - traj["pos"]).max() / 10
+    np.testing.assert_allclose(delta[:, 1], traj["t"], atol=1e-3)
+
+
+def test_unknown_group_is_rejected(traj):
+    with pytest.raises(ValueError):
+        trajectory_codec.encode(traj, np.arange(3), META, groups=("pos", "jerk"))
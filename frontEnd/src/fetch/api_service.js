@@ -32,3 +32,86 @@ export const evaluateMitigation = async (params) => {
     throw error;
   }
 };
+
+export const fetchTrajectory = async (params) => {
+  try {
+    const response = await axios.post(`${API_BASE}/trajectory`, params);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching trajectory:', error);
+    throw error;
+  }
+};
+
+// Yörüngeyi NDJSON akışı olarak okur; her parça geldikçe onChunk çağrılır, son mesaj döndürülür
+export const streamTrajectory = async (params, onChunk, signal) => {
+  const response = await fetch(`${API_BASE}/trajectory/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'application/x-ndjson' },
+    body: JSON.stringify(params),
+    signal,
+  });
+  if (!response.ok) {
+    throw new Error(`Trajectory stream failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const message = JSON.parse(buffer.slice(0, newline));
+      buffer = buffer.slice(newline + 1);
+      if (message.type === 'done') return message;
+      onChunk(message);
+    }
+  }
+  throw new Error('Trajectory stream ended before completion');
+};
+
+// İkili yörünge biçimi (backEnd/trajectory_codec.py): 20 baytlık başlık, JSON metadata, float32 veri
+export const decodeTrajectory = (buffer) => {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== 'ATRJ' || view.getUint16(4, true) !== 1) {
+    throw new Error('Not a trajectory payload');
+  }
+  const flags = view.getUint16(6, true);
+  const nPoints = view.getUint32(8, true);
+  const nFields = view.getUint32(12, true);
+  const metaLength = view.getUint32(16, true);
+  const meta = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 20, metaLength)));
+  // Veri bölümü 4 bayt hizalı: kopyasız Float32Array (satır satır, meta.fields sırasıyla)
+  let values = new Float32Array(buffer, 20 + metaLength, nPoints * nFields);
+
+  if (flags & 1) {
+    // Fark kodlu: değer = origin + kümülatif toplam (float64 ile toplanır)
+    const decoded = new Float64Array(values.length);
+    const running = Float64Array.from(meta.origin);
+    for (let i = 0; i < nPoints; i += 1) {
+      for (let k = 0; k < nFields; k += 1) {
+        if (i > 0) running[k] += values[i * nFields + k];
+        decoded[i * nFields + k] = running[k];
+      }
+    }
+    values = decoded;
+  }
+  return { meta, fields: meta.fields, nPoints, nFields, values };
+};
+
+export const fetchTrajectoryBinary = async (params, { delta = false, fields = 'pos' } = {}) => {
+  try {
+    const response = await axios.post(`${API_BASE}/trajectory`, params, {
+      params: { format: 'binary', delta, fields },
+      responseType: 'arraybuffer',
+    });
+    return decodeTrajectory(response.data);
+  } catch (error) {
+    console.error('Error fetching binary trajectory:', error);
+    throw error;
+  }
+};